@@ -1876,8 +1876,16 @@ class BitcoinLoopingSystem:
                 temp_dir = Path("Test/Demo/Mining/Temporary Template")
             else:
                 temp_dir = Path("Mining/Temporary Template")
-            
-            # Distribute to each process folder (Brain creates folders, Looping uses them)
+
+            # Publish once to shared memory - every daemon maps the same copy
+            if self.publish_shared_template(temp_dir, template_data):
+                print(f"✅ Template published to shared memory for {self.daemon_count} daemons")
+                # Idle daemons sleep on their control sockets - wake them for the new generation.
+                # Miners without a socket rescan the region on their own, so no command file.
+                self.send_miner_command("new_template", {"height": template_data.get("height")}, fallback_to_file=False)
+                return True
+
+            # Fallback: distribute to each process folder (Brain creates folders, Looping uses them)
             for daemon_id in range(1, self.daemon_count + 1):
                 process_folder = temp_dir / f"process_{daemon_id}"
                 # Brain should have created this folder already
@@ -1909,6 +1917,51 @@ class BitcoinLoopingSystem:
             print(f"❌ Failed to distribute template to daemons: {e}")
             return False
 
+    def publish_shared_template(self, temp_dir, template_data):
+        """Write the template into the daemons' shared-memory region. Returns False if unavailable.
+
+        A refresh on the same tip is published as a compact delta against the last
+        template; the full template goes to shared_template_full.json for daemons
+        that missed that base. A new ``previousblockhash`` is a full swap.
+        """
+        try:
+            from dynamic_template_manager import SharedTemplateRegion, compute_template_delta, daemon_template_dir
+
+            region = getattr(self, "shared_template_region", None)
+            if region is None:
+                # Same folder the DTM and the miners name the region after, whatever our cwd
+                shared_dir = daemon_template_dir(self.demo_mode, getattr(self, "test_mode", False))
+                region = SharedTemplateRegion.create(SharedTemplateRegion.name_for(shared_dir))
+                self.shared_template_region = region
+            fields = {
+                "timestamp": time.time(),
+                "datetime_str": datetime.now().isoformat(),
+                "status": "ready_for_processing",
+                "distributed_by": "looping_system",
+            }
+            document = SharedTemplateRegion.template_document(template_data, **fields)
+            delta = compute_template_delta(getattr(self, "_last_published_template", None), template_data)
+            if delta is not None:
+                full_path = Path(temp_dir) / "shared_template_full.json"
+                staging_path = full_path.with_suffix(".json.tmp")
+                with open(staging_path, "w") as f:
+                    json.dump(document, f, separators=(",", ":"))
+                os.replace(staging_path, full_path)
+                document = SharedTemplateRegion.delta_document(delta, full_path.resolve(), **fields)
+            generation = region.publish(document)
+            self._last_published_template = copy.deepcopy(template_data)
+            if delta is not None:
+                print(
+                    f"   📤 Shared template generation {generation} ({temp_dir}): delta "
+                    f"-{len(delta['removed_txids'])} +{len(delta['added_transactions'])} txs"
+                )
+            else:
+                print(f"   📤 Shared template generation {generation} ({temp_dir})")
+            return True
+        except Exception as e:
+            print(f"⚠️ Shared-memory template publish failed, writing per-daemon files: {e}")
+            return False
+
     def create_dynamic_daemon_folders(self):
         """Create daemon folders dynamically based on hardware-detected miner count."""
         try:
@@ -2315,9 +2368,12 @@ class BitcoinLoopingSystem:
                 bitcoin_template = template_data["template"]
             
             try:
-                from dynamic_template_manager import GPSEnhancedDynamicTemplateManager
-                dtm = GPSEnhancedDynamicTemplateManager(demo_mode=False, verbose=False, auto_initialize=False, create_directories=False)
-                processed = dtm.process_mining_template(bitcoin_template)
+                # Reuse the long-lived DTM so a same-tip refresh is processed as a delta
+                dtm = getattr(self, "template_manager", None)
+                if dtm is None:
+                    from dynamic_template_manager import GPSEnhancedDynamicTemplateManager
+                    dtm = GPSEnhancedDynamicTemplateManager(demo_mode=False, verbose=False, auto_initialize=False, create_directories=False)
+                processed = dtm.process_template_refresh(bitcoin_template)
                 gps_enhancement = processed.get("gps_enhancement", {})
                 consensus = processed.get("consensus", {})
                 logger.info(f"✅ GPS enhancement added: target_nonce={gps_enhancement.get('target_nonce', 'N/A')}")
@@ -2583,13 +2639,20 @@ class BitcoinLoopingSystem:
                 print(f"\n🔄 MINING CYCLE #{mining_cycle}")
                 print("=" * 40)
 
-                # STEP 1: FIRST TEMPLATE PULL
+                # STEP 1: FIRST TEMPLATE PULL (already processed in the background when prefetched)
                 print("📡 STEP 1: Pulling initial template...")
-                initial_template = self.get_template()
+                prefetcher = self.get_template_prefetcher()
+                initial_template = prefetcher.take()
                 if not initial_template:
                     print("❌ Failed to get initial template, retrying in 5 seconds...")
                     time.sleep(5)
                     continue
+                prefetch_stats = prefetcher.status()
+                print(
+                    f"   ⚡ Template prefetch: hit rate {prefetch_stats['hit_rate']:.0%} "
+                    f"({prefetch_stats['hits']} hits, {prefetch_stats['misses']} misses), "
+                    f"processing {prefetch_stats['processing_seconds_last'] * 1000:.1f} ms"
+                )
 
                 print(
                     f"✅ Initial template obtained: Block {
@@ -2728,6 +2791,23 @@ class BitcoinLoopingSystem:
         except Exception as e:
             print(f"❌ Double template pull mining failed: {e}")
             return False
+        finally:
+            if getattr(self, "template_prefetcher", None) is not None:
+                self.template_prefetcher.stop()
+                self.template_prefetcher = None
+
+    def get_template_prefetcher(self):
+        """Prefetcher keeping the next DTM-processed template ready (started on first use)."""
+        prefetcher = getattr(self, "template_prefetcher", None)
+        if prefetcher is None:
+            from dynamic_template_manager import GPSEnhancedDynamicTemplateManager
+
+            environment = "Testing" if self.demo_mode else "Production"
+            template_manager = GPSEnhancedDynamicTemplateManager(
+                demo_mode=self.demo_mode, environment=environment, verbose=False
+            )
+            prefetcher = self.template_prefetcher = template_manager.create_template_prefetcher(self.get_template)
+        return prefetcher
 
     def start_production_miner_with_template(self, template):
         """Start Production Miner with specific template and return results."""
@@ -3431,8 +3511,12 @@ class BitcoinLoopingSystem:
             print("🔄 Restarting miner with fresh template to recover performance...")
             self.send_miner_command("restart_fresh_template")
 
-    def send_miner_command(self, command, parameters=None):
-        """Send command to production miner through control interface."""
+    def send_miner_command(self, command, parameters=None, fallback_to_file=True):
+        """Send command to production miner through control interface.
+
+        With ``fallback_to_file=False`` the command only goes to miners listening
+        on a control socket and ``miner_commands.json`` is left untouched.
+        """
         try:
             command_data = {
                 "command": command,
@@ -3444,6 +3528,22 @@ class BitcoinLoopingSystem:
             # Write command to miner command queue
             # MODE-AWARE command file path in Temporary Template
             base_temp_path = "Test/Demo/Mining/Temporary Template" if self.demo_mode else "Mining/Temporary Template"
+
+            # Push over the miners' control sockets first - lands in milliseconds with an ack
+            try:
+                from production_bitcoin_miner import send_miner_control_command
+
+                acks = send_miner_control_command(base_temp_path, command, parameters)
+            except ImportError:
+                acks = []
+            if acks:
+                accepted = sum(1 for ack in acks if ack.get("ok"))
+                print(f"📡 Command pushed to {accepted}/{len(acks)} production miner(s): {command}")
+                return
+            if not fallback_to_file:
+                return
+
+            # Fallback: no miner socket answered - use the command file
             command_file = Path(base_temp_path) / "miner_commands.json"
             command_file.parent.mkdir(parents=True, exist_ok=True)
             with open(command_file, "w") as f:
@@ -4762,12 +4862,17 @@ class BitcoinLoopingSystem:
         # Track daemon startup with failure recovery
         successfully_started = []
         failed_daemons = []
+        all_started = True
         
-        for daemon_id in range(1, actual_miner_count + 1):
-            print(f"🔄 Starting Miner {daemon_id}/{actual_miner_count}...")
+        # Daemon mode runs ONE miner process that shards every template across
+        # a worker pool of actual_miner_count processes, instead of one
+        # production_bitcoin_miner.py interpreter per core
+        launches = 1 if mode == "daemon" else actual_miner_count
+        for daemon_id in range(1, launches + 1):
+            print(f"🔄 Starting Miner {daemon_id}/{launches}...")
             
             if mode == "daemon":
-                success = self.start_production_miner_daemon(daemon_id)
+                success = self.start_production_miner_daemon(daemon_id, worker_processes=actual_miner_count)
             elif mode == "separate_terminal":
                 success = self.start_production_miner_separate_terminal(daemon_id)
             elif mode == "direct":
@@ -4839,8 +4944,12 @@ class BitcoinLoopingSystem:
         
         return all_started
 
-    def start_production_miner_daemon(self, daemon_id=1):
-        """Start production miner daemon with specified ID (1-5)."""
+    def start_production_miner_daemon(self, daemon_id=1, worker_processes=None):
+        """Start production miner daemon with specified ID (1-5).
+
+        With ``worker_processes`` the daemon mines through a worker pool of that
+        many processes (``--worker-pool``) instead of on a single core.
+        """
         try:
             # Debug: Check if daemon_unique_ids exists
             if not hasattr(self, 'daemon_unique_ids'):
@@ -4911,6 +5020,8 @@ class BitcoinLoopingSystem:
                 cmd.append("--demo")
             if hasattr(self, 'test_mode') and self.test_mode:
                 cmd.append("--test-mode")
+            if worker_processes:
+                cmd.extend(["--worker-pool", "--worker-processes", str(worker_processes), "--miner-id", str(daemon_id)])
 
             with open(log_file, "w") as log_f:
                 process = subprocess.Popen(
@@ -10102,20 +10213,55 @@ server=1
         Implements the missing half of Pipeline flow.txt communication:
         'The Dynamic template manger tells the looping we have a solution and gives the solution to the looping file'
         
-        DTM creates notification files in 'Mining/Temporary Template/looping_notifications/'
-        when valid solutions are found. This function reads those notifications.
+        DTM appends notifications to the journal in 'Mining/Temporary Template/looping_notifications/'
+        when valid solutions are found. Only records past the persisted consumer offset are read;
+        loose valid_solution_*.json files from older DTM builds are still picked up.
         """
         try:
             from pathlib import Path
             import json
             import time
+            from dynamic_template_manager import NotificationJournal
             
             # Check DTM notification directory
             notifications_dir = self.get_temporary_template_dir() / "looping_notifications"
             if not notifications_dir.exists():
                 return None
+
+            journal = NotificationJournal(notifications_dir)
+            for notification_data, next_offset in journal.read_new():
+                solution = notification_data.get("solution") or {}
+                if not (notification_data.get("notification_type") == "valid_solution_found" and
+                        notification_data.get("dtm_status") and
+                        notification_data.get("ready_for_submission") and
+                        solution.get("block_hex") and
+                        solution.get("hash") and
+                        solution.get("nonce") is not None):
+                    logger.warning(f"⚠️ Skipping incomplete DTM journal record ending at {next_offset}")
+                    journal.commit(next_offset)
+                    continue
+
+                miner_id = notification_data.get("miner_id", "unknown")
+                files_created = notification_data.get("files_created", {})
+                logger.info("🎉 DTM NOTIFICATION RECEIVED!")
+                logger.info(f"   📨 From: {notification_data.get('created_by', 'DTM')}")
+                logger.info(f"   🏭 Miner: {miner_id}")
+                logger.info(f"   ✅ DTM Status: {notification_data['dtm_status']}")
+                logger.info(f"   📁 Files Created: {len(files_created)}")
+
+                # Consumed before returning, as legacy files are archived before returning
+                journal.commit(next_offset)
+                logger.info("✅ DTM→Looping communication successful!")
+                return {
+                    "solution": solution,
+                    "miner_id": miner_id,
+                    "dtm_validation_complete": True,
+                    "files_created": files_created,
+                    "notification_source": f"{journal.path}@{next_offset}",
+                    "pipeline_compliant": True
+                }
                 
-            # Look for valid solution notification files
+            # Look for legacy per-event notification files
             notification_files = list(notifications_dir.glob("valid_solution_*.json"))
             if not notification_files:
                 return None
@@ -0,0 +1,240 @@
+"""Hash-rate micro-benchmarks for the miner hot path.
+
+    python Test/hash_rate_benchmark.py                                        # write Test/hash_rate_baseline.json
+    python Test/hash_rate_benchmark.py --compare Test/hash_rate_baseline.json  # exit 1 on regressions
+
+Templates come from System_File_Examples/Templates and every nonce set is drawn
+from a fixed seed, so runs on the same machine are comparable. The galaxy nonce
+strategies are not timed: one galaxy nonce executes its full per-nonce category
+loops, which do not finish in benchmark time.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import platform
+import random
+import string
+import sys
+import time
+from datetime import datetime
+from itertools import chain, islice
+from pathlib import Path
+
+# Ensure repo root is importable
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from production_bitcoin_miner import ProductionBitcoinMiner, iter_nonce_chunks
+
+EXAMPLES_DIR = REPO_ROOT / "System_File_Examples" / "Templates"
+DEFAULT_BASELINE = REPO_ROOT / "Test" / "hash_rate_baseline.json"
+SEED = 1337
+DEFAULT_THRESHOLD = 0.10
+
+# Operations per benchmark at --scale 1.0
+SIZES = {
+    "construct_block_header": 20000,
+    "calculate_hash": 50000,
+    "midstate_kernel_hash": 50000,
+    "mathematically_enhanced_hash_calculation": 20000,
+    "universe_scale_nonce_generation": 100000,
+    "universe_scale_nonce_generation_enhanced": 100000,
+    "mine_block": 20000,
+}
+
+
+def load_example_templates():
+    """Example templates keyed by file stem, with placeholder hashes made header-safe."""
+    templates = {}
+    for path in sorted(EXAMPLES_DIR.glob("*.json")):
+        template = json.loads(path.read_text())
+        prev_hash = str(template.get("previousblockhash", ""))
+        if len(prev_hash) != 64 or not all(c in string.hexdigits for c in prev_hash):
+            # Example files carry illustrative hashes; derive a stable 32-byte one
+            template["previousblockhash"] = hashlib.sha256(prev_hash.encode()).hexdigest()
+        templates[path.stem] = template
+    if not templates:
+        raise FileNotFoundError(f"No example templates found in {EXAMPLES_DIR}")
+    return templates
+
+
+def measure(fn, ops, repeat):
+    """Best-of-``repeat`` wall time for ``fn()``, which performs ``ops`` operations."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        done = fn()
+        elapsed = time.perf_counter() - start
+        if done is not None:
+            ops = done
+        best = min(best, elapsed)
+    return {
+        "ops": ops,
+        "seconds": best,
+        "ns_per_op": best * 1e9 / ops if ops else None,
+        "ops_per_sec": ops / best if best > 0 else None,
+    }
+
+
+def run_benchmarks(scale=1.0, repeat=3, only=None):
+    """Run every benchmark (or those in ``only``) and return the result document."""
+    random.seed(SEED)
+    sizes = {name: max(1, int(size * scale)) for name, size in SIZES.items()}
+    rng = random.Random(SEED)
+    nonces = [rng.getrandbits(32) for _ in range(max(sizes.values()))]
+
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+        miner = ProductionBitcoinMiner(daemon_mode=True, demo_mode=True, max_attempts=1)
+    miner.show_solutions_only = True
+
+    templates = load_example_templates()
+    template_name, template = next(iter(templates.items()))
+    miner.current_template = template
+
+    headers = [miner.construct_block_header(template, nonce) for nonce in nonces[: sizes["calculate_hash"]]]
+    kernel = miner.get_header_kernel(template)
+    digests = [kernel.hash_nonce(nonce) for nonce in nonces[: sizes["mathematically_enhanced_hash_calculation"]]]
+
+    def bench_construct_block_header():
+        for nonce in nonces[: sizes["construct_block_header"]]:
+            miner.construct_block_header(template, nonce)
+
+    def bench_calculate_hash():
+        for header in headers:
+            miner.calculate_hash(header)
+
+    def bench_midstate_kernel_hash():
+        for nonce in nonces[: sizes["midstate_kernel_hash"]]:
+            kernel.hash_nonce(nonce)
+
+    def bench_enhanced_hash():
+        for nonce, digest in zip(nonces, digests):
+            miner.mathematically_enhanced_hash_calculation(None, nonce, base_hash=digest)
+
+    def bench_universe_generation():
+        stream = chain.from_iterable(miner.universe_scale_nonce_generation(0, 4294967295))
+        return sum(1 for _ in islice(stream, sizes["universe_scale_nonce_generation"]))
+
+    def bench_universe_generation_enhanced():
+        brain_qtl_data = {"mathematical_enhancement": "galaxy", "attempt": 1}
+        stream = chain.from_iterable(miner.universe_scale_nonce_generation_enhanced(0, 4294967295, brain_qtl_data))
+        return sum(1 for _ in islice(stream, sizes["universe_scale_nonce_generation_enhanced"]))
+
+    def bench_mine_block():
+        # One bounded round: max_attempts=1 and a capped universe-scale nonce stream
+        def bounded_strategy(start_nonce, max_nonces):
+            stream = chain.from_iterable(miner.universe_scale_nonce_generation(start_nonce, max_nonces))
+            return iter_nonce_chunks(islice(stream, sizes["mine_block"]))
+
+        miner.global_attempt_counter = 0
+        miner.current_template = template
+        if hasattr(miner, "first_valid_solution"):
+            del miner.first_valid_solution
+        hashes_before = miner.hash_count
+        miner.mine_block(max_time_seconds=600, nonce_strategy=bounded_strategy)
+        return miner.hash_count - hashes_before
+
+    benchmarks = {
+        "construct_block_header": bench_construct_block_header,
+        "calculate_hash": bench_calculate_hash,
+        "midstate_kernel_hash": bench_midstate_kernel_hash,
+        "mathematically_enhanced_hash_calculation": bench_enhanced_hash,
+        "universe_scale_nonce_generation": bench_universe_generation,
+        "universe_scale_nonce_generation_enhanced": bench_universe_generation_enhanced,
+        "mine_block": bench_mine_block,
+    }
+
+    results = {}
+    for name, fn in benchmarks.items():
+        if only and name not in only:
+            continue
+        with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+            results[name] = measure(fn, sizes[name], 1 if name == "mine_block" else repeat)
+
+    if getattr(miner, "achievement_sink", None) is not None:
+        miner.achievement_sink.close()
+    miner.state_store.close()
+
+    return {
+        "metadata": {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "scale": scale,
+            "repeat": repeat,
+            "template": template_name,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Benchmarks whose ops/sec dropped more than ``threshold`` (fraction) below the baseline."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("ops_per_sec") or not result.get("ops_per_sec"):
+            continue
+        change = (result["ops_per_sec"] - previous["ops_per_sec"]) / previous["ops_per_sec"]
+        result["change_vs_baseline"] = change
+        if change < -threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def print_results(document):
+    print(f"{'benchmark':<44}{'ops':>9}{'ns/op':>12}{'H/s':>14}{'vs base':>10}")
+    for name, result in document["results"].items():
+        change = result.get("change_vs_baseline")
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(
+            f"{name:<44}{result['ops']:>9,}{result['ns_per_op']:>12,.0f}"
+            f"{result['ops_per_sec']:>14,.0f}{change_text:>10}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Miner hot-path hash-rate benchmarks")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help=f"where to write the JSON results (default {DEFAULT_BASELINE.name}; compare mode writes only if given)",
+    )
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (0.10 = 10%%)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every benchmark size")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of repeats per benchmark")
+    parser.add_argument("--only", nargs="*", choices=sorted(SIZES), help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    print("⏱️ Running miner hash-rate benchmarks...")
+    document = run_benchmarks(scale=args.scale, repeat=args.repeat, only=args.only)
+
+    regressions = []
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_results(document, baseline, args.threshold)
+
+    print_results(document)
+    output = args.output or (None if args.compare else DEFAULT_BASELINE)
+    if output is not None:
+        output.write_text(json.dumps(document, indent=2))
+        print(f"📁 Results written to {output}")
+
+    if regressions:
+        for name, change in regressions:
+            print(f"❌ REGRESSION: {name} {change:+.1%} (threshold -{args.threshold:.0%})")
+        return 1
+    if args.compare:
+        print(f"✅ No regressions beyond {args.threshold:.0%} vs {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
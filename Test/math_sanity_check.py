@@ -1,5 +1,13 @@
 import hashlib
+import json
+import queue
+import struct
 import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
 from pathlib import Path
 
 # Ensure repo root is importable
@@ -7,7 +15,35 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from production_bitcoin_miner import ProductionBitcoinMiner
+from dynamic_template_manager import (
+    DTMValidationClient,
+    GPSEnhancedDynamicTemplateManager,
+    LedgerSegmentStore,
+    NonceLeaseScheduler,
+    NotificationJournal,
+    ProcessedFileLedger,
+    SharedTemplateRegion,
+    SolutionFileWriter,
+    SolutionIntake,
+    SolutionRecord,
+    TemplatePrefetcher,
+    compute_template_delta,
+    get_dtm_validation_client,
+    get_solution_file_writer,
+    send_solution_notice,
+)
+from production_bitcoin_miner import (
+    UNIVERSE_GALAXY_BASE,
+    AchievementSink,
+    HashVerdict,
+    MinerControlChannel,
+    MinerStateStore,
+    MiningWorkerPool,
+    NonceCoverageIndex,
+    ProductionBitcoinMiner,
+    _mining_worker_main,
+    send_miner_control_command,
+)
 
 
 def test_double_sha256_matches_hashlib():
@@ -35,6 +71,792 @@ def test_hash_function_matches_double_sha(miner: ProductionBitcoinMiner):
     assert got == expected, "calculate_hash should match double SHA256"
 
 
+def test_midstate_kernel_matches_construct_block_header(miner: ProductionBitcoinMiner):
+    template = {
+        "version": 0x20000000,
+        "previousblockhash": "00000000000000000002a7c4c1e48d76c5a37902165a270156b7a8d72728a054",
+        "bits": "17034219",
+        "curtime": 1700000000,
+        "transactions": [],
+    }
+    kernel = miner.get_header_kernel(template)
+    for nonce in (0, 1, 0x12345678, 0xFFFFFFFF):
+        header = miner.construct_block_header(template, nonce)
+        assert kernel.header(nonce) == header, f"kernel header mismatch at nonce {nonce}"
+        expected = hashlib.sha256(hashlib.sha256(header).digest()).digest()
+        assert kernel.hash_nonce(nonce) == expected, f"midstate hash mismatch at nonce {nonce}"
+    assert miner.get_header_kernel(template) is kernel, "kernel should be reused for the same template"
+
+
+def test_worker_pool_shards_cover_nonce_space():
+    shards = MiningWorkerPool.shard_nonce_space(7)
+    assert shards[0][0] == 0 and shards[-1][1] == 2**32, "shards must cover the full 32-bit nonce space"
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start, "shards must be disjoint and contiguous"
+    assert MiningWorkerPool.resolve_process_count({"miner_processes": 3}) == 3
+    assert MiningWorkerPool.resolve_process_count({"miner_processes": "auto", "cpu_cores_reserved": 10**6}) == 1
+
+    # Every hash under the target is a solution, whether or not it is also a new best
+    events = queue.Queue()
+    _mining_worker_main(0, bytes(76), 2**256 - 1, 0, 64, events, threading.Event(), batch_size=16)
+    kinds = [event[0] for event in iter(events.get_nowait, ("done", 0, 64))]
+    assert kinds.count("solution") == 64 and 0 < kinds.count("best") < 64
+
+
+def test_extranonce_roll_matches_full_merkle_rebuild(miner: ProductionBitcoinMiner):
+    template = {
+        "version": 0x20000000,
+        "previousblockhash": "00" * 32,
+        "bits": "17034219",
+        "curtime": 1700000000,
+        "transactions": [{"txid": hashlib.sha256(bytes([i])).hexdigest()} for i in range(11)],
+        # Block 1 coinbase
+        "coinbasetxn": {
+            "data": "01000000010000000000000000000000000000000000000000000000000000000000000000ffffffff"
+            "0704ffff001d0104ffffffff0100f2052a0100000043410496b538e853519c726a2c91e61ec11600ae1390813a627c"
+            "66fb8be7947be63c52da7589379515d4e0a604f8141781e62294721166bf621e73a82cbf2342c858eeac00000000"
+        },
+    }
+    cache = miner._get_template_cache(template)
+    assert cache["merkle_root_bytes_be"] == miner._calculate_merkle_root_from_leaves(cache["merkle_leaves_le"])
+
+    header_before = miner.construct_block_header(template, 0)
+    for expected in (1, 2, 3):
+        assert miner.roll_extranonce(template) == expected
+        rebuilt = miner._calculate_merkle_root_from_leaves(
+            [miner._leaf_from_raw_transaction(cache["coinbase_hex"])] + cache["merkle_leaves_le"][1:]
+        )
+        assert cache["merkle_root_bytes_be"] == rebuilt, "branch re-root must match a full merkle rebuild"
+    assert miner.construct_block_header(template, 0) != header_before, "rolled extranonce must change the header"
+
+
+def test_version_rolling_stays_in_bip320_bits(miner: ProductionBitcoinMiner):
+    template = {
+        "version": 0x20000000,
+        "previousblockhash": "00" * 32,
+        "bits": "17034219",
+        "curtime": 1700000000,
+        "transactions": [],
+    }
+    assert miner.rolled_block_version(template, 5) == 0x20000000, "rolling is off unless the DTM enables it"
+
+    # The DTM's default comes from config.json dtm.version_rolling
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.json"
+        config_path.write_text(json.dumps({"dtm": {"version_rolling": True}}))
+        assert GPSEnhancedDynamicTemplateManager.configured_version_rolling(config_path)
+        config_path.write_text(json.dumps({"hardware": {}}))
+        assert not GPSEnhancedDynamicTemplateManager.configured_version_rolling(config_path)
+
+    template["version_rolling"] = {"enabled": True, "mask": "ffffffff"}
+    assert miner.version_rolling_mask(template) == ProductionBitcoinMiner.BIP320_VERSION_MASK
+    seen = set()
+    for roll in (0, 1, 2, 0xFFFF):
+        version = miner.rolled_block_version(template, roll)
+        assert version & ~ProductionBitcoinMiner.BIP320_VERSION_MASK == 0x20000000, "only BIP320 bits may change"
+        seen.add(version)
+        header = miner.construct_block_header(template, 7, version=version)
+        kernel = miner.get_header_kernel(template, version)
+        assert kernel.hash_nonce(7) == miner.calculate_hash(header), "rolled kernel must hash the rolled header"
+        assert miner._parse_header_fields(header)["version"] == version
+    assert len(seen) == 4, "distinct rolls must give distinct versions"
+
+
+def test_nonce_stream_yields_uint32_chunks(miner: ProductionBitcoinMiner):
+    chunks = list(miner.universe_scale_nonce_generation(0, 4294967295, chunk_size=4096))
+    assert all(isinstance(chunk, array) and chunk.typecode == "I" for chunk in chunks)
+    assert all(len(chunk) == 4096 for chunk in chunks[:-1]), "only the last chunk may be short"
+    streamed = [nonce for chunk in chunks for nonce in chunk]
+    assert len(streamed) == 75000 + 50000 + 75000 + 150000
+    expected_head = [
+        ((miner.bitload * (i + 1) * miner.knuth_sorrellian_class_levels) % 4294967296
+         ^ (miner.knuth_sorrellian_class_iterations >> (i % 32))) % 4294967296
+        for i in range(100)
+    ]
+    assert streamed[:100] == expected_head, "streaming must not change the nonce sequence"
+
+
+def test_nonce_coverage_index_dedupes_across_containers():
+    index = NonceCoverageIndex()
+    nonces = [(7 << 16) | low for low in range(0, 3 * NonceCoverageIndex.ARRAY_LIMIT + 3, 3)] + [0, 0xFFFFFFFF]
+    assert all(index.add(nonce) for nonce in nonces), "first sighting must be hashed"
+    assert not any(index.add(nonce) for nonce in nonces), "repeats must be skipped"
+    assert isinstance(index.containers[7], bytearray), "dense container should switch to a bitmap"
+    assert len(index) == len(nonces) and (7 << 16) + 3 in index and 0xFFFFFFFF in index
+    assert (7 << 16) + 1 not in index and 1 not in index
+    assert abs(index.coverage_percent - len(nonces) * 100.0 / 2**32) < 1e-12
+
+
+def test_knuth_plan_matches_reference_formulas(miner: ProductionBitcoinMiner):
+    plan = miner.get_knuth_plan()
+    assert miner.get_knuth_plan() is plan, "plan must be built once"
+    levels, iterations = miner.collective_collective_levels, miner.collective_collective_iterations
+    knuth_power = (UNIVERSE_GALAXY_BASE * levels * iterations) % (2**256)
+    for nonce in (0, 1, 12345, 0xDEADBEEF, 0xFFFFFFFF):
+        reference = (
+            miner._apply_dual_knuth_entropy(nonce)
+            ^ miner._apply_dual_knuth_decryption(nonce)
+            ^ miner._apply_dual_knuth_near_solution(nonce)
+            ^ miner._apply_dual_knuth_math_problems(nonce)
+            ^ miner._apply_dual_knuth_math_paradoxes(nonce)
+        )
+        assert miner._apply_all_dual_knuth_categories(nonce) == reference
+        assert plan.mathematical_bias(nonce) == (knuth_power ^ (nonce * levels)) % (2**64)
+        assert plan.knuth_amplifier(nonce) == (
+            plan.galaxy_pattern * (levels * iterations // 10**9) * nonce
+        ) % (2**64)
+        assert plan.collective_pattern(nonce) == (nonce * 185 * 12 * 10 * 34 * 21 * 10) % (2**32)
+
+
+def test_hash_verdict_matches_hex_counters(miner: ProductionBitcoinMiner):
+    target = int("00000000ffff" + "0" * 52, 16)
+    for digest in (b"\x00" * 32, b"\x00\x00\x00\x00\x0f" + b"\xff" * 27, hashlib.sha256(b"verdict").digest()):
+        verdict = HashVerdict(digest, target)
+        assert verdict._hex is None, "hex must stay lazy until read"
+        assert verdict.bits == miner.count_leading_zeros(digest.hex())
+        assert verdict.hex_zeros == len(digest.hex()) - len(digest.hex().lstrip("0"))
+        assert verdict.meets_target == (int.from_bytes(digest, "big") < target)
+        assert miner.get_dual_leading_zeros(verdict) == miner.get_dual_leading_zeros(digest)
+        ultra = miner.get_ultra_hex_leading_zeros(digest)
+        assert verdict.ultra_hex_bucket == ultra["ultra_hex_digit"]
+        assert miner.get_ultra_hex_leading_zeros(verdict) == ultra
+    assert HashVerdict("00ff" + "f" * 62, target).bits == miner.count_leading_zeros("00ff" + "f" * 62)
+
+
+def test_achievement_sink_batches_and_dedupes():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = AchievementSink(lambda: tmp, max_queue=4, flush_interval=0.05)
+        accepted = [sink.submit({"nonce": n % 3, "hash": f"{n % 3:064x}", "leading_zeros": 6}) for n in range(6)]
+        sink.close()
+        segments = list(Path(tmp).glob("achievements_*.jsonl"))
+        lines = [json.loads(line) for segment in segments for line in segment.read_text().splitlines()]
+        assert sorted(entry["nonce"] for entry in lines) == [0, 1, 2], "repeats must be written once"
+        assert sink.dropped == accepted.count(False)
+        assert sink.written + sink.duplicates == accepted.count(True)
+        assert not sink.submit({"nonce": 9}), "closed sink must refuse new work"
+
+
+def test_state_store_is_write_behind():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MinerStateStore(flush_interval=3600)
+        path = Path(tmp) / "daily_registry.json"
+        path.write_text(json.dumps({"best_leading_zeros": 3, "note": "kept"}))
+        for zeros in (5, 9, 7):
+            store.update(path, lambda doc, z=zeros: doc.update(best_leading_zeros=max(doc["best_leading_zeros"], z)))
+        assert json.loads(path.read_text())["best_leading_zeros"] == 3, "updates must not hit disk before a flush"
+        assert store.get(path)["best_leading_zeros"] == 9
+        missing = Path(tmp) / "not_created_by_brainstem" / "x.json"
+        store.update(missing, lambda doc: doc.update(a=1))
+        store.close()
+        assert json.loads(path.read_text()) == {"best_leading_zeros": 9, "note": "kept"}
+        assert not missing.parent.exists(), "the store must not create Brain.QTL folders"
+        assert not list(Path(tmp).glob(".*.tmp")), "atomic writes must not leave temp files"
+
+
+def test_template_swap_is_two_phase(miner: ProductionBitcoinMiner):
+    def template(height):
+        return {
+            "version": 0x20000000,
+            "previousblockhash": f"{height:064x}",
+            "bits": "17034219",
+            "curtime": 1700000000 + height,
+            "height": height,
+            "transactions": [],
+        }
+
+    old, stale, fresh = template(1), template(2), template(3)
+    miner.stage_template_swap(old)
+    assert miner.current_template is old, "swaps outside the hash loop apply immediately"
+
+    miner._hash_loop_active = True
+    try:
+        superseded = miner.stage_template_swap(stale)
+        latest = miner.stage_template_swap(fresh, target=12345)
+        superseded.join()
+        latest.join()
+        assert miner.current_template is old, "the mining thread keeps its template until it adopts the swap"
+        assert "_resolved_cache" in fresh, "the cache must be built off the mining thread"
+        assert miner.adopt_staged_template() is fresh, "only the newest requested template is adopted"
+    finally:
+        miner._hash_loop_active = False
+    assert miner.current_template is fresh and miner.current_target == 12345
+    assert miner.get_header_kernel(fresh).header(7) == miner.construct_block_header(fresh, 7)
+    assert miner.adopt_staged_template() is None
+    assert miner.last_template_swap_latency is not None and miner.template_swap_count >= 2
+
+
+def test_control_channel_round_trip(miner: ProductionBitcoinMiner):
+    with tempfile.TemporaryDirectory() as tmp:
+        channel = MinerControlChannel(MinerControlChannel.address_for(tmp, "process_t"), status_provider=lambda: {"hash_count": 42})
+        assert channel.start(), "Unix control socket should be available on this platform"
+        try:
+            [ack] = send_miner_control_command(tmp, "pause", {"reason": "test"})
+            assert ack["ok"] and ack["queued"]
+            assert channel.wait(1.0), "pushed command must wake the waiting miner"
+            message = channel.poll()
+            assert message["command"] == "pause" and message["parameters"] == {"reason": "test"}
+            assert channel.poll() is None and not channel.wait(0.01)
+            [status] = send_miner_control_command(tmp, "status_request")
+            assert status["status"] == {"hash_count": 42} and channel.poll() is None
+            [rejected] = send_miner_control_command(tmp, "format_disk")
+            assert not rejected["ok"] and channel.commands_rejected == 1
+        finally:
+            channel.close()
+        assert send_miner_control_command(tmp, "pause") == [], "closed channels must fall back to the command file"
+
+    assert miner.start_control_channel() is not None
+    try:
+        [ack] = send_miner_control_command(miner.temporary_template_root, "shutdown")
+        assert ack["ok"] and miner.shutdown_requested, "shutdown must land before the ack returns"
+        assert miner.check_looping_commands() == "shutdown"
+        assert miner.check_looping_commands() is None
+    finally:
+        miner.stop_control_channel()
+        miner.shutdown_requested = False
+
+
+def test_published_template_wakes_waiting_daemon(miner: ProductionBitcoinMiner):
+    from Singularity_Dave_Looping import BitcoinLoopingSystem
+
+    looping = BitcoinLoopingSystem.__new__(BitcoinLoopingSystem)
+    looping.demo_mode, looping.test_mode, looping.daemon_count = True, False, 1
+    looping.shared_template_region = None
+    template = {"height": 900003, "previousblockhash": "cd" * 32, "transactions": []}
+    assert miner.start_control_channel() is not None
+    woke = []
+    # An idle daemon sleeps on its control socket for the whole rescan interval
+    waiter = threading.Thread(target=lambda: woke.append(miner.control_channel.wait(miner.control_rescan_interval)))
+    waiter.start()
+    try:
+        started = time.monotonic()
+        assert looping.distribute_template_to_daemons(template)
+        waiter.join(5.0)
+        assert woke == [True] and time.monotonic() - started < 5.0, "a publish must wake the daemon right away"
+        assert miner.check_looping_commands() == "new_template"
+        miner._shared_template_attach_after = 0  # the region was just created: map it now
+        assert miner.poll_shared_template() == template
+    finally:
+        miner.stop_control_channel()
+        waiter.join(1.0)
+        if miner.shared_template_region is not None:
+            miner.shared_template_region.close()
+            miner.shared_template_region = None
+        if looping.shared_template_region is not None:
+            looping.shared_template_region.close()
+
+
+def test_shared_template_region_seqlock(miner: ProductionBitcoinMiner):
+    template = {"height": 900001, "previousblockhash": "ab" * 32, "transactions": [{"data": "00" * 64}]}
+    saved_root = miner.temporary_template_root
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = SharedTemplateRegion.create(SharedTemplateRegion.name_for(tmp), capacity=1 << 16)
+        reader = SharedTemplateRegion.attach(writer.name)
+        try:
+            assert reader.generation == 0 and reader.read() is None
+            assert writer.publish(template) == 1 and reader.has_new_template()
+            assert reader.read_if_new() == template and reader.read_if_new() is None
+
+            # Writer mid-copy (odd sequence): readers must not return a torn template
+            sequence = int.from_bytes(bytes(writer._shm.buf[:8]), "little")
+            writer._shm.buf[:8] = (sequence | 1).to_bytes(8, "little")
+            assert reader.read(retries=3) is None
+            writer._shm.buf[:8] = sequence.to_bytes(8, "little")
+
+            miner.temporary_template_root = Path(tmp)
+            assert writer.publish({"template": template, "distributed_by": "looping_system"}) == 2
+            assert miner.poll_shared_template() == template, "miners unwrap the looping distribution wrapper"
+            assert miner.poll_shared_template() is None, "an unchanged generation is not re-read"
+            assert miner.poll_shared_template(latest=True) == template, "commands still get the current template"
+            writer.publish(template)
+            assert miner.poll_shared_template() is None, "a bare template is not a shared template document"
+
+            # Refresh on the same tip: a delta document whose full copy is itself a template document
+            base = dict(template, transactions=[{"txid": "aa" * 32, "data": "00" * 64}])
+            refreshed = dict(base, transactions=base["transactions"] + [{"txid": "bb" * 32, "data": "11" * 64}])
+            full_path = Path(tmp) / "shared_template_full.json"
+            full_path.write_text(json.dumps(SharedTemplateRegion.template_document(refreshed)))
+            delta = compute_template_delta(base, refreshed)
+            writer.publish(SharedTemplateRegion.delta_document(delta, full_path))
+            assert reader.read_template(base) == refreshed, "delta applies to its base"
+            assert reader.read_template() == refreshed, "readers without the base load the full copy"
+            assert miner.poll_shared_template() == refreshed
+            try:
+                writer.publish({"blob": "x" * (1 << 17)})
+                raise AssertionError("oversized templates must be rejected")
+            except ValueError:
+                pass
+        finally:
+            miner.temporary_template_root = saved_root
+            if miner.shared_template_region is not None:
+                miner.shared_template_region.close()
+                miner.shared_template_region = None
+            reader.close()
+            writer.close()
+        assert SharedTemplateRegion.attach(writer.name) is None, "the owner removes the region on close"
+
+
+def test_solution_intake_events_and_ledger():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "process_1").mkdir()
+        intake = SolutionIntake(root, SolutionIntake.address_for(root))
+        try:
+            sources = intake.start()
+            assert "socket" in sources, "Unix socket intake should be available on this platform"
+
+            result = root / "process_1" / "mining_result.json"
+            result.write_text(json.dumps({"nonce": 7}))
+            assert send_solution_notice(root, "process_1", result, {"nonce": 7})
+            events = intake.wait(2.0)
+            pushed = [event for event in events if event["source"] == "socket"]
+            assert pushed and pushed[0]["solution"] == {"nonce": 7} and pushed[0]["miner_id"] == "process_1"
+
+            if "inotify" in sources:
+                if not any(event["source"] == "inotify" for event in events):
+                    events = intake.wait(2.0)
+                assert any(event["source"] == "inotify" and event["path"] == str(result) for event in events)
+                (root / "process_2").mkdir()
+                late = root / "process_2" / "solution_1.json"
+                late.write_text("{}")
+                (root / "process_2" / "working_template.json").write_text("{}")
+                paths = set()
+                for _ in range(3):
+                    paths |= {event["path"] for event in intake.wait(2.0)}
+                    if str(late) in paths:
+                        break
+                assert str(late) in paths and not any(p.endswith("working_template.json") for p in paths)
+        finally:
+            intake.close()
+        assert intake.wait(0.01) == [] and not send_solution_notice(root, "process_1", result)
+
+        ledger = ProcessedFileLedger(root / ".dtm_processed_files.json")
+        assert not ledger.is_processed(result)
+        ledger.mark(result)
+        assert ledger.is_processed(result) and ProcessedFileLedger(ledger.path).is_processed(result)
+        result.write_text(json.dumps({"nonce": 8, "round": 2}))
+        assert not ledger.is_processed(result), "a rewritten result must be parsed again"
+
+
+def test_miner_notices_reach_dtm_intake(miner: ProductionBitcoinMiner):
+    # The DTM watches one folder object and the miner addresses another: they must still meet
+    dtm = GPSEnhancedDynamicTemplateManager.__new__(GPSEnhancedDynamicTemplateManager)
+    dtm.verbose = False
+    dtm.demo_mode = True
+    dtm.solution_intake = None
+    intake = dtm._start_solution_intake()
+    assert intake is not None and intake.address == SolutionIntake.address_for(miner.temporary_template_root)
+    region_name = SharedTemplateRegion.name_for(dtm._solution_intake_dir())
+    assert region_name == SharedTemplateRegion.name_for(miner.temporary_template_root), "one region for DTM and miners"
+    try:
+        result_path = miner.temporary_template_root / miner.process_id / "mining_result.json"
+        assert miner.push_solution_notice(result_path, {"nonce": 11}), "miner notice must reach the DTM socket"
+        pushed = [event for event in intake.wait(2.0) if event["source"] == "socket"]
+        assert pushed and pushed[0]["solution"] == {"nonce": 11} and pushed[0]["miner_id"] == miner.process_id
+
+        # Nonce ranges: the miner sweeps leases the DTM hands out over the same socket
+        dtm.current_template, dtm.nonce_lease_scheduler, dtm.nonce_lease_lock = None, None, threading.Lock()
+        saved_template, miner.current_template = miner.current_template, {
+            "height": 900001, "previousblockhash": "ab" * 32, "bits": "1d00ffff"
+        }
+        miner.nonce_lease = None
+        chunks = miner.leased_nonce_strategy(0, 2**32)
+        lease = miner.nonce_lease
+        first = next(chunks)
+        assert lease["start"] == first[0] and len(first) == 16384, "the first lease is the GPS window"
+        next(chunks)
+        assert miner.report_nonce_lease(lease["cursor"]) and not intake.wait(0.1), "lease traffic is not a notice"
+        scheduler = dtm.nonce_lease_scheduler
+        assert scheduler.coverage() == [(lease["start"], lease["start"] + 16384)]
+        assert scheduler.leases[lease["lease_id"]]["miner_id"] == miner.process_id
+
+        # Leased space exhausted: the miner rolls its extranonce and the DTM opens a map for it
+        scheduler.free.clear()
+        scheduler.leases.clear()
+        assert miner.acquire_nonce_lease() is not None and miner._current_extranonce() == 1
+        assert dtm.nonce_lease_scheduler.extranonce == 1 and dtm.nonce_lease_scheduler is not scheduler
+        miner.roll_extranonce(extranonce=0)  # a straggler on the old extranonce joins the new map
+        assert miner.acquire_nonce_lease()["lease_id"] == 2 and miner._current_extranonce() == 1
+
+        miner.current_template = dict(miner.current_template, height=900002)
+        miner.leased_nonce_strategy(0, 2**32)
+        assert miner.nonce_lease["lease_id"] == 1 and dtm.nonce_lease_scheduler is not scheduler, "new template, new map"
+        miner.current_template = saved_template
+    finally:
+        intake.close()
+    miner.nonce_lease = None
+    assert miner.leased_nonce_strategy(0, 2**32) is None, "without a DTM the miner keeps its galaxy nonces"
+
+
+def test_validation_client_reuses_dtm_and_template_targets(miner):
+    assert get_dtm_validation_client(demo_mode=True) is get_dtm_validation_client(demo_mode=True)
+    # A bare DTM is enough for the validation checks and keeps the test off the filesystem
+    dtm = GPSEnhancedDynamicTemplateManager.__new__(GPSEnhancedDynamicTemplateManager)
+    dtm.verbose = False
+    miner.dtm_instance, miner.dtm_validation_client = dtm, None
+    client = miner.get_dtm_validation_client()
+    assert client.dtm is dtm and miner.get_dtm_validation_client() is client
+
+    template = {"previousblockhash": "00" * 32, "height": 1, "target": "0" * 8 + "f" * 56, "merkleroot": "ab" * 32}
+    good = {"nonce": 5, "hash": "0" * 9 + "1" * 55, "merkle_root": template["merkleroot"]}
+    assert client.validate(good, template)["valid"]
+    assert not client.validate(dict(good, hash="f" * 64), template)["valid"]
+    assert client.target_cache_hits == 1 and client.validations == 2
+    for height in range(DTMValidationClient.TEMPLATE_CACHE_SIZE + 2):
+        client.warm(dict(template, height=height))
+    assert len(client._template_targets) == DTMValidationClient.TEMPLATE_CACHE_SIZE
+    miner.dtm_instance, miner.dtm_validation_client = None, None
+
+
+def test_notification_journal_offsets_and_torn_tail():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = NotificationJournal(tmp)
+        assert journal.read_new() == []
+        journal.append({"n": 1})
+        end = journal.append({"n": 2})
+        records = journal.read_new()
+        assert [record["n"] for record, _ in records] == [1, 2] and records[-1][1] == end
+
+        journal.commit(records[0][1])
+        assert [record["n"] for record, _ in NotificationJournal(tmp).read_new()] == [2]
+
+        # A crashed writer's partial frame is invisible to readers and cut off by the next writer
+        with open(journal.path, "ab") as f:
+            f.write(NotificationJournal.HEADER.pack(100, 0) + b"{")
+        assert [record["n"] for record, _ in journal.read_new()] == [2]
+        NotificationJournal(tmp).append({"n": 3})
+        records = journal.read_new()
+        assert [record["n"] for record, _ in records] == [2, 3]
+
+        # A corrupt record in the middle is skipped, not a wall in front of every later one
+        corrupt_at = journal.path.stat().st_size
+        journal.append({"n": 99})
+        journal.append({"n": 5})
+        with open(journal.path, "r+b") as f:
+            f.seek(corrupt_at + NotificationJournal.HEADER.size + 2)
+            f.write(b"X")
+        records = journal.read_new()
+        assert [record["n"] for record, _ in records] == [2, 3, 5]
+
+        journal.COMPACT_BYTES = 1
+        journal.commit(records[-1][1])
+        assert journal.path.stat().st_size == 0 and journal.committed_offset() == 0
+        journal.append({"n": 4})
+        assert [record["n"] for record, _ in journal.read_new()] == [4]
+
+
+def test_solution_record_codec_and_binary_notice():
+    nonce = 0x12345678
+    header = bytes(range(76)) + struct.pack("<I", nonce)
+    digest = hashlib.sha256(hashlib.sha256(header).digest()).digest()
+    record = SolutionRecord(header, digest, generation=3, miner_id="process_7")
+    assert record.nonce == nonce and record.header_hash() == digest
+
+    buffer = bytearray(8 + 2 * SolutionRecord.SIZE)
+    end = record.pack_into(memoryview(buffer), 8)
+    assert end == 8 + SolutionRecord.SIZE and SolutionRecord.unpack_from(memoryview(buffer), 8) == record
+    assert SolutionRecord.from_solution(record.to_solution()) == record
+    assert SolutionRecord.from_solution(json.loads(json.dumps(record.to_solution()))).generation == 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        intake = SolutionIntake(tmp, SolutionIntake.address_for(tmp))
+        try:
+            intake.start()
+            assert send_solution_notice(tmp, "process_7", Path(tmp) / "solution_1.json", record)
+            events = [event for event in intake.wait(2.0) if event["source"] == "socket"]
+            assert events[0]["record"] == record and events[0]["path"].endswith("solution_1.json")
+            assert events[0]["miner_id"] == "process_7"
+        finally:
+            intake.close()
+
+
+def test_ledger_segment_store_appends_rotates_and_compacts():
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Path(tmp) / "ledger.json"
+        ledger.write_text(json.dumps({"entries": [{"n": 0}], "created": "then"}))
+        store = LedgerSegmentStore(ledger, segment_max_bytes=64)
+        for n in range(1, 8):
+            store.append({"n": n, "timestamp": f"t{n}"})
+        assert store.total_entries == 8 and len(store.index["segments"]) > 1
+        assert [entry["n"] for entry in store.iter_entries(5)] == [5, 6, 7]
+
+        # Crash between segment write and index save: the reopened store recounts the tail
+        with open(store._segment_path(store.index["segments"][-1]), "ab") as f:
+            f.write(b'{"n":8}\n{"n":')
+        reopened = LedgerSegmentStore(ledger, segment_max_bytes=64)
+        assert reopened.total_entries == 9 and reopened.index["last_timestamp"] == "t7"
+        reopened.append({"n": 9})
+
+        data = json.loads(reopened.compact().read_text())
+        assert [entry["n"] for entry in data["entries"]] == list(range(10)) and data["total_entries"] == 10
+
+
+def test_ledger_writers_append_through_segment_store():
+    dtm = GPSEnhancedDynamicTemplateManager.__new__(GPSEnhancedDynamicTemplateManager)
+    dtm.verbose = False
+    dtm.ledger_segment_stores = {}
+
+    def refresh_header(header, totals):
+        header["total_attempts"] = totals["entries"]
+        header["total_hashes"] = totals["hashes_tried"]
+        header["total_blocks_found"] = totals["meets_difficulty"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Path(tmp) / "global_ledger.json"
+        ledger.write_text(json.dumps({"entries": [{"hashes_tried": 5}], "total_hashes": 5, "metadata": {"v": 1}}))
+        assert dtm._append_to_ledger_file(ledger, {"hashes_tried": 7, "meets_difficulty": False}, refresh_header)
+        # An ordinary entry is not re-rendered into the legacy file yet
+        assert len(json.loads(ledger.read_text())["entries"]) == 1
+        assert dtm._get_ledger_segment_store(ledger).header["total_hashes"] == 12
+
+        # Looping edits the rendered file in place; re-rendering keeps that edit
+        data = json.loads(ledger.read_text())
+        data["entries"][0]["submitted_to_network"] = True
+        ledger.write_text(json.dumps(data))
+
+        hour = Path(tmp) / "hourly_ledger.json"
+        dtm._append_to_ledger_file(hour, {"n": 1})  # missing file: rendered at once
+        dtm._append_to_ledger_file(hour, {"n": 2})
+        dtm._get_ledger_segment_store(hour).COMPACT_INTERVAL = 0
+
+        assert dtm._append_to_ledger_file(ledger, {"hashes_tried": 1, "meets_difficulty": True}, refresh_header, render_now=True)
+        data = json.loads(ledger.read_text())
+        assert [entry.get("hashes_tried") for entry in data["entries"]] == [5, 7, 1]
+        assert data["entries"][0]["submitted_to_network"] is True
+        assert data["total_hashes"] == 13 and data["total_attempts"] == 3 and data["total_blocks_found"] == 1
+        assert data["metadata"] == {"v": 1}
+        # A ledger nobody appends to any more (last hour's) is still rendered once it is due
+        assert [entry["n"] for entry in json.loads(hour.read_text())["entries"]] == [1, 2]
+
+
+def test_batch_validation_matches_single_header_hashing():
+    dtm = GPSEnhancedDynamicTemplateManager.__new__(GPSEnhancedDynamicTemplateManager)
+    dtm.verbose = False
+    dtm.batch_template_contexts = OrderedDict()
+    template = {"previousblockhash": "00" * 32, "merkleroot": "11" * 32, "bits": "207fffff", "curtime": 1, "version": 2}
+    header = dtm._reconstruct_header_with_nonce(template, 9)
+    real = hashlib.sha256(hashlib.sha256(header).digest()).digest()
+    candidates = [
+        {"nonce": 9, "hash": real.hex()},
+        SolutionRecord(header, real),
+        {"nonce": 9, "hash": "f" * 64},
+        {"nonce": -1},
+        {"block_header": "zz"},
+    ]
+    verdicts = dtm.validate_solutions_batch(candidates, template)
+    assert [verdict["index"] for verdict in verdicts] == list(range(len(candidates)))
+    assert [verdict["valid"] for verdict in verdicts] == [True, True, False, False, False]
+    assert verdicts[0]["hash"] == real.hex() and "mismatch" in verdicts[2]["reason"]
+
+    template["bits"] = "1d00ffff"  # a different template context: 8 zeros required
+    weak = dtm.validate_solutions_batch([{"nonce": n} for n in range(64)], template)
+    pooled = dtm.validate_solutions_batch([{"nonce": n} for n in range(64)], template, processes=2, pool_threshold=1)
+    assert pooled == weak and not any(verdict["valid"] for verdict in weak)
+    assert len(dtm.batch_template_contexts) == 2
+
+
+def test_nonce_lease_scheduler_sizes_steals_and_reclaims():
+    scheduler = NonceLeaseScheduler("t", priority_range=(1000, 1000 + (1 << 20)), nonce_space=(0, 1 << 22))
+    size = 1 << 16
+    scheduler.MIN_LEASE = 1024
+    scheduler.DEFAULT_RATE = size / scheduler.LEASE_SECONDS
+
+    first = scheduler.acquire("fast", now=0.0)
+    assert (first["start"], first["end"]) == (1000, 1000 + size), "GPS window is leased first"
+    # Measured at 10x the default rate: the next lease is 10x larger
+    assert scheduler.report(first["lease_id"], first["end"], now=3.0) is None
+    second = scheduler.acquire("fast", now=3.0)
+    assert second["start"] == first["end"] and second["end"] - second["start"] == 10 * size
+
+    slow = scheduler.acquire("slow", now=3.0)
+    assert scheduler.report(slow["lease_id"], slow["start"] + 1, now=13.0) == slow["end"]
+    while scheduler.free:
+        bulk = scheduler.acquire("bulk", now=13.0)
+        scheduler.complete(bulk["lease_id"], now=13.0)
+
+    # Nothing free: an idle miner takes the upper half of the slow miner's lease
+    stolen = scheduler.acquire("idle", now=14.0)
+    assert stolen["end"] == slow["end"] and scheduler.stolen_leases == 1
+    assert scheduler.report(slow["lease_id"], slow["start"] + 2, now=14.0) == stolen["start"]
+
+    # Leases without reports for LEASE_TIMEOUT go back to the free ranges
+    reissued = scheduler.acquire("fresh", now=14.0 + scheduler.LEASE_TIMEOUT)
+    assert scheduler.reclaimed_leases == 3 and reissued["start"] in (second["start"], slow["start"] + 2, stolen["start"])
+
+    assert scheduler.is_covered(999) and scheduler.is_covered(first["end"] - 1)
+    assert scheduler.coverage()[0] == (0, first["end"]), "bulk leases merged with the first one"
+    assert not scheduler.is_covered(second["start"])
+
+
+def test_template_delta_updates_merkle_incrementally(miner: ProductionBitcoinMiner):
+    txids = [hashlib.sha256(bytes([i])).hexdigest() for i in range(40)]
+    raw = {
+        "previousblockhash": "00" * 32,
+        "height": 1,
+        "bits": "207fffff",
+        "coinbasevalue": 100,
+        "transactions": [{"txid": txid} for txid in txids[:13]],
+        # Block 1 coinbase
+        "coinbasetxn": {
+            "data": "01000000010000000000000000000000000000000000000000000000000000000000000000ffffffff"
+            "0704ffff001d0104ffffffff0100f2052a0100000043410496b538e853519c726a2c91e61ec11600ae1390813a627c"
+            "66fb8be7947be63c52da7589379515d4e0a604f8141781e62294721166bf621e73a82cbf2342c858eeac00000000"
+        },
+    }
+    lower_value_coinbase = {"data": raw["coinbasetxn"]["data"].replace("00f2052a01", "00e1f50501")}
+    base = dict(raw)
+    miner._get_template_cache(base)
+    miner.roll_extranonce(base)
+
+    refreshes = [
+        dict(raw, transactions=raw["transactions"] + [{"txid": txid} for txid in txids[13:20]], curtime=5),
+        dict(raw, transactions=[{"txid": txid} for txid in txids[:20] if txid not in (txids[3], txids[17])] + [{"txid": txids[30]}]),
+        dict(raw, transactions=[{"txid": txids[0]}], coinbasevalue=90, coinbasetxn=lower_value_coinbase),
+    ]
+    for current in refreshes:
+        delta = compute_template_delta(base, current)
+        assert delta is not None, "same-tip refresh must produce a delta"
+        updated = miner.apply_template_delta(delta, base=base)
+        expected = miner._build_template_cache(current)
+        cache = updated["_resolved_cache"]
+        for key in ("merkle_leaves_le", "merkle_levels_le", "merkle_branch_le", "merkle_root_bytes_be", "transaction_txids"):
+            assert cache[key] == expected[key], f"incremental {key} must match a full rebuild"
+        assert {k: v for k, v in updated.items() if k != "_resolved_cache"} == current
+        base = updated
+
+    assert len(json.dumps(compute_template_delta(raw, refreshes[0]))) < len(json.dumps(refreshes[0])) / 2
+    assert miner.apply_template_delta(delta, base=refreshes[0]) is None, "delta only applies to its base"
+    assert compute_template_delta(raw, dict(raw, previousblockhash="11" * 32)) is None, "new tip is a full swap"
+    reordered = dict(raw, transactions=raw["transactions"][::-1])
+    assert compute_template_delta(raw, reordered) is None, "reordered transactions are a full swap"
+
+
+def test_dtm_processes_same_tip_refresh_as_delta():
+    dtm = GPSEnhancedDynamicTemplateManager(verbose=False, demo_mode=True, auto_initialize=False, create_directories=False)
+    raw = {
+        "previousblockhash": "aa" * 32, "height": 10, "bits": "207fffff", "curtime": 1, "version": 0x20000000,
+        "transactions": [{"txid": f"{n:064x}", "data": "00"} for n in range(3)], "coinbasevalue": 50,
+    }
+    dtm.receive_template_from_looping_file(raw)
+    gps = dtm.template_cache["last_result"]["gps_enhancement"]
+    refreshed = dict(raw, curtime=2, transactions=raw["transactions"] + [{"txid": "ff" * 32, "data": "00"}])
+    dtm.receive_template_from_looping_file(refreshed)
+    assert dtm.performance_stats.get("template_deltas_applied") == 1, "a mempool-only refresh skips full processing"
+    assert len(dtm.current_template["transactions"]) == 4 and dtm.current_template["curtime"] == 2
+    assert dtm.template_cache["last_result"]["gps_enhancement"] is gps
+    assert dtm.process_template_refresh(dict(raw, previousblockhash="bb" * 32))["mode"] == "full", "a new tip is reprocessed"
+
+
+def test_template_prefetcher_double_buffers():
+    tips = iter(["aa" * 32, "aa" * 32, "bb" * 32, "cc" * 32, "dd" * 32])
+    prefetcher = TemplatePrefetcher(
+        lambda: {"previousblockhash": next(tips), "transactions": []}, lambda raw: dict(raw, processed=True)
+    )
+
+    first = prefetcher.take()
+    assert first["processed"] and prefetcher.misses == 1, "empty back buffer: processed inline"
+    assert not prefetcher.prefetch_once(), "the active template is not processed twice"
+    assert prefetcher.prefetch_once() and prefetcher.prefetch_once() and prefetcher.discarded == 1
+    staged = prefetcher.ready[1]
+    assert prefetcher.take() is staged and staged["previousblockhash"] == "cc" * 32, "a hit is a pointer flip"
+
+    status = prefetcher.status()
+    assert (status["hits"], status["misses"], status["hit_rate"], status["ready"]) == (1, 1, 0.5, False)
+    assert status["processing_seconds_total"] >= status["processing_seconds_last"] > 0
+
+    # Polls that differ only in curtime are the same template: nothing is reprocessed
+    ticks = iter(range(100, 110))
+    polled = TemplatePrefetcher(
+        lambda: {"previousblockhash": "aa" * 32, "height": 7, "bits": "207fffff", "curtime": next(ticks), "transactions": []},
+        lambda raw: dict(raw, processed=True),
+    )
+    first = polled.take()
+    assert first["curtime"] == 100 and not polled.prefetch_once() and polled.prefetched == 0
+    assert polled.take() is first and (polled.hits, polled.misses) == (1, 1)
+
+
+def test_late_solution_resolves_cached_template():
+    dtm = GPSEnhancedDynamicTemplateManager.__new__(GPSEnhancedDynamicTemplateManager)
+    dtm.verbose = False
+    dtm.performance_stats = {}
+    dtm.validation_templates = OrderedDict()
+    dtm.validation_template_index = {}
+    old = {"previousblockhash": "aa" * 32, "merkleroot": "11" * 32, "bits": "207fffff", "curtime": 1, "version": 2}
+    dtm.remember_validation_template(old, generation=7)
+    dtm.current_template = dict(old, previousblockhash="bb" * 32)
+    dtm.remember_validation_template(dtm.current_template, generation=8)
+
+    # A solution mined on the old tip, arriving after the swap
+    nonce = next(n for n in range(64) if hashlib.sha256(hashlib.sha256(
+        dtm._reconstruct_header_with_nonce(old, n)).digest()).digest()[0] < 0x7F)
+    header = dtm._reconstruct_header_with_nonce(old, nonce)
+    digest = hashlib.sha256(hashlib.sha256(header).digest()).hexdigest()
+    solution = {"block_header": header.hex(), "nonce": nonce, "hash": digest, "target": ""}
+    verdict = dtm._validate_solution_against_template(solution, dtm.current_template)
+    assert verdict["success"] and verdict["stale_template"], "late work is judged against its own template"
+    assert dtm.resolve_validation_template({"template_generation": 7})["template"] is old
+    assert dtm.performance_stats["validation_template_hits"] == 2
+
+    for height in range(len(dtm.validation_templates) + 8):
+        dtm.remember_validation_template(dict(old, previousblockhash=f"{height:064x}"))
+    assert len(dtm.validation_templates) == 8 and ("generation", 7) not in dtm.validation_template_index
+    assert not dtm._validate_solution_against_template(solution, dtm.current_template)["success"]
+
+
+def test_solution_file_writer_records_first_and_writes_behind():
+    with tempfile.TemporaryDirectory() as tmp:
+        written = []
+
+        def materialise(solution, miner_id):
+            path = Path(tmp) / f"{miner_id}_ledger.json"
+            path.write_text(json.dumps(solution))
+            written.append(miner_id)
+            return {"global_ledger": str(path), "hourly_ledger": str(path)}
+
+        writer = SolutionFileWriter(tmp, materialise, batch_seconds=60)
+        writer.submit({"nonce": 1}, "process_1")
+        writer.submit({"nonce": 2}, "process_2")
+        assert written == [] and len(writer.journal.read_new()) == 2, "submit only appends the durable record"
+
+        # A restarted DTM replays what a crash left unwritten, one fsync per touched file
+        replay = SolutionFileWriter(tmp, materialise)
+        assert replay.flush() == 2 and written == ["process_1", "process_2"]
+        assert (replay.batches, replay.fsyncs) == (1, 2) and writer.journal.read_new() == []
+        assert replay.flush() == 0
+        writer.closed = True
+
+        # A record whose files were not written blocks the offset until it succeeds
+        failing = {"process_4"}
+
+        def flaky(solution, miner_id):
+            return None if miner_id in failing else materialise(solution, miner_id)
+
+        retry = SolutionFileWriter(tmp, flaky)
+        for number in (3, 4, 5):
+            retry.journal.append({"miner_id": f"process_{number}", "solution": {"nonce": number}})
+        assert retry.flush() == 1 and retry.failures == 1 and written[-1] == "process_3"
+        assert [record["miner_id"] for record, _ in retry.journal.read_new()] == ["process_4", "process_5"]
+        failing.clear()
+        assert retry.flush() == 2 and written[-2:] == ["process_4", "process_5"]
+
+        # A record that keeps failing is dead-lettered after MAX_ATTEMPTS and stops blocking the rest
+        failing.add("process_6")
+        for number in (6, 7):
+            retry.journal.append({"miner_id": f"process_{number}", "solution": {"nonce": number}})
+        for _ in range(SolutionFileWriter.MAX_ATTEMPTS - 1):
+            assert retry.flush() == 0
+        assert retry.flush() == 2 and written[-1] == "process_7" and retry.dead_lettered == 1
+        dead = [json.loads(line) for line in retry.dead_letter_path.read_text().splitlines()]
+        assert [(entry["record"]["miner_id"], entry["attempts"]) for entry in dead] == [("process_6", SolutionFileWriter.MAX_ATTEMPTS)]
+        assert retry.journal.read_new() == [] and retry.records_written == 4
+
+        # Every DTM in the process shares one writer per journal
+        shared = get_solution_file_writer(tmp, materialise)
+        try:
+            assert get_solution_file_writer(Path(tmp) / ".", flaky) is shared and shared.materialise is materialise
+        finally:
+            shared.close()
+
+
 def run_all():
     # Keep demo/daemon small to avoid long-running loops; we test math helpers only.
     miner = ProductionBitcoinMiner(daemon_mode=True, demo_mode=True, max_attempts=1)
@@ -42,6 +864,34 @@ def run_all():
     test_double_sha256_matches_hashlib()
     test_leading_zero_counters(miner)
     test_hash_function_matches_double_sha(miner)
+    test_midstate_kernel_matches_construct_block_header(miner)
+    test_worker_pool_shards_cover_nonce_space()
+    test_extranonce_roll_matches_full_merkle_rebuild(miner)
+    test_version_rolling_stays_in_bip320_bits(miner)
+    test_nonce_stream_yields_uint32_chunks(miner)
+    test_nonce_coverage_index_dedupes_across_containers()
+    test_knuth_plan_matches_reference_formulas(miner)
+    test_hash_verdict_matches_hex_counters(miner)
+    test_achievement_sink_batches_and_dedupes()
+    test_state_store_is_write_behind()
+    test_template_swap_is_two_phase(miner)
+    test_control_channel_round_trip(miner)
+    test_shared_template_region_seqlock(miner)
+    test_published_template_wakes_waiting_daemon(miner)
+    test_solution_intake_events_and_ledger()
+    test_miner_notices_reach_dtm_intake(miner)
+    test_validation_client_reuses_dtm_and_template_targets(miner)
+    test_notification_journal_offsets_and_torn_tail()
+    test_solution_record_codec_and_binary_notice()
+    test_ledger_segment_store_appends_rotates_and_compacts()
+    test_ledger_writers_append_through_segment_store()
+    test_batch_validation_matches_single_header_hashing()
+    test_nonce_lease_scheduler_sizes_steals_and_reclaims()
+    test_template_delta_updates_merkle_incrementally(miner)
+    test_dtm_processes_same_tip_refresh_as_delta()
+    test_template_prefetcher_double_buffers()
+    test_late_solution_resolves_cached_template()
+    test_solution_file_writer_records_first_and_writes_behind()
 
     # Ultra Hex sanity: Ultra 1 below 64 zeros, Ultra 2 at >=64
     uh1 = miner.get_ultra_hex_leading_zeros("00ff" + "f" * 62)
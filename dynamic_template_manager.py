@@ -6,7 +6,10 @@ Handles template coordination and GPS-enhanced mining capabilities
 
 from __future__ import annotations
 
+import atexit
+import contextlib
 import copy
+import hashlib
 import json
 import logging
 import multiprocessing
@@ -14,16 +17,28 @@ import os
 import queue
 import random
 import string
+import struct
 import sys
+import tempfile
 import threading
 import time
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from itertools import islice
 from datetime import datetime
+from multiprocessing import shared_memory
 from zoneinfo import ZoneInfo
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends run unlocked
+    fcntl = None
+
 # Brain file system - ALL file operations
 try:
     from Singularity_Dave_Brainstem_UNIVERSE_POWERED import (
@@ -67,6 +82,9 @@ except Exception:
 
 CENTRAL_TZ = ZoneInfo("America/Chicago")
 
+# BIP320 general-purpose version bits miners may roll (bits 13-28)
+BIP320_VERSION_MASK = 0x1FFFE000
+
 
 # ═══════════════════════════════════════════════════════════════════
 # DEFENSIVE WRITE SYSTEM - NEVER FAIL, ALWAYS LOG
@@ -657,6 +675,16 @@ def to_absolute_path(path_obj: Path) -> Path:
     return root / path_obj
 
 
+def daemon_template_dir(demo_mode: bool = False, test_mode: bool = False) -> Path:
+    """Absolute daemon template folder shared by Looping, the DTM and the miners.
+
+    The intake socket and the shared template region are named after this folder,
+    so every side must resolve it here (or to the same path) to find each other.
+    """
+    base = "Test/Demo/Mining" if demo_mode else "Test/Test mode/Mining" if test_mode else "Mining"
+    return to_absolute_path(Path(base) / "Temporary Template").resolve()
+
+
 def to_absolute_from_string(path_str: str) -> Path:
     """Convert a string path to an absolute Path relative to the repository root."""
     candidate = Path(path_str)
@@ -1039,7 +1067,1608 @@ except (ImportError, SyntaxError, Exception) as e:
     print(f"⚠️ Global brain not available - using fallback: {e}")
 
 
+class SharedTemplateRegion:
+    """Versioned block template in ``multiprocessing.shared_memory``, guarded by a seqlock.
+
+    Layout: a 64-byte header ``<QQQ`` (sequence, generation, payload length)
+    followed by the template as compact JSON. The single writer (DTM/Looping)
+    bumps ``sequence`` to odd, copies the payload, publishes ``generation`` and
+    bumps ``sequence`` back to even. Readers map the region once, detect a new
+    template with one integer read (``generation``) and retry a copy that
+    overlapped a write.
+    """
+
+    HEADER = struct.Struct("<QQQ")
+    HEADER_SIZE = 64
+    SEQUENCE_OFFSET = 0
+    GENERATION_OFFSET = 8
+    DEFAULT_CAPACITY = 32 * 1024 * 1024  # tmpfs pages are only allocated when touched
+    _write_lock = threading.Lock()
+    _owned_names = set()  # regions created by this process
+
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self.capacity = shm.size - self.HEADER_SIZE
+        self.last_generation = 0
+
+    @staticmethod
+    def name_for(template_dir) -> str:
+        """Region name shared by the DTM and every miner of ``template_dir``."""
+        digest = hashlib.sha1(str(Path(template_dir).resolve()).encode()).hexdigest()[:16]
+        return f"dtm_template_{digest}"
+
+    @classmethod
+    def create(cls, name: str, capacity: int = DEFAULT_CAPACITY) -> "SharedTemplateRegion":
+        """Writer side: create the region (or adopt one left by a previous run)."""
+        size = cls.HEADER_SIZE + capacity
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name=name)
+            if shm.size < size:
+                shm.close()
+                shm.unlink()
+                shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        cls._owned_names.add(shm.name)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> Optional["SharedTemplateRegion"]:
+        """Reader side: map an existing region, or None if the DTM has not created it."""
+        try:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Python < 3.13: stop the resource tracker unlinking the DTM's region when this reader exits
+                shm = shared_memory.SharedMemory(name=name)
+                if shm.name not in cls._owned_names:
+                    try:
+                        from multiprocessing import resource_tracker
+
+                        resource_tracker.unregister(shm._name, "shared_memory")
+                    except Exception:
+                        pass
+        except FileNotFoundError:
+            return None
+        return cls(shm)
+
+    @property
+    def generation(self) -> int:
+        """Generation of the published template (0 = nothing published yet)."""
+        return struct.unpack_from("<Q", self._shm.buf, self.GENERATION_OFFSET)[0]
+
+    def has_new_template(self) -> bool:
+        return self.generation != self.last_generation
+
+    def publish(self, template: Dict) -> int:
+        """Write ``template`` once for all readers and return its generation."""
+        payload = json.dumps(template, separators=(",", ":"), default=str).encode()
+        if len(payload) > self.capacity:
+            raise ValueError(f"Template is {len(payload):,} bytes, shared region holds {self.capacity:,}")
+
+        buf = self._shm.buf
+        with self._write_lock:
+            sequence, generation, _ = self.HEADER.unpack_from(buf, 0)
+            sequence |= 1  # odd: write in progress
+            struct.pack_into("<Q", buf, self.SEQUENCE_OFFSET, sequence)
+            buf[self.HEADER_SIZE:self.HEADER_SIZE + len(payload)] = payload
+            self.HEADER.pack_into(buf, 0, sequence, generation + 1, len(payload))
+            struct.pack_into("<Q", buf, self.SEQUENCE_OFFSET, sequence + 1)
+        self.last_generation = generation + 1
+        return generation + 1
+
+    def read(self, retries: int = 1000) -> Optional[Tuple[int, Dict]]:
+        """Consistent ``(generation, template)`` snapshot, or None if nothing is published."""
+        buf = self._shm.buf
+        for _ in range(retries):
+            sequence, generation, length = self.HEADER.unpack_from(buf, 0)
+            if sequence & 1:
+                time.sleep(0)  # writer mid-copy
+                continue
+            if generation == 0:
+                return None
+            payload = bytes(buf[self.HEADER_SIZE:self.HEADER_SIZE + length])
+            if struct.unpack_from("<Q", buf, self.SEQUENCE_OFFSET)[0] != sequence:
+                continue  # overlapped a write - retry
+            self.last_generation = generation
+            return generation, json.loads(payload)
+        return None
+
+    def read_if_new(self) -> Optional[Dict]:
+        """Document published since the last read, else None (one integer read when unchanged)."""
+        if not self.has_new_template():
+            return None
+        snapshot = self.read()
+        return snapshot[1] if snapshot else None
+
+    # Every writer publishes one of two documents, built by these helpers:
+    #   {"template": {...}, ...}                                  full template
+    #   {"template_delta": {...}, "template_file": path, ...}     refresh on the same tip
+    # ``template_file`` holds a full-template document for readers that missed the base.
+
+    @staticmethod
+    def template_document(template: Dict, **fields) -> Dict:
+        """Full-template document."""
+        return dict(fields, template=template)
+
+    @staticmethod
+    def delta_document(delta: Dict, template_file, **fields) -> Dict:
+        """Delta document; ``template_file`` holds the full-template document it produces."""
+        return dict(fields, template_delta=delta, template_file=str(template_file))
+
+    @staticmethod
+    def parse_document(document) -> Tuple[str, Dict]:
+        """``("template", template)`` or ``("template_delta", document)``; ValueError for any other shape."""
+        if isinstance(document, dict):
+            if isinstance(document.get("template"), dict):
+                return "template", document["template"]
+            if isinstance(document.get("template_delta"), dict) and document.get("template_file"):
+                return "template_delta", document
+        raise ValueError("Shared template document is neither a template nor a template delta")
+
+    @classmethod
+    def load_template_file(cls, template_file) -> Dict:
+        """Template from the full-template document a delta points at."""
+        with open(template_file, "r") as f:
+            kind, template = cls.parse_document(json.load(f))
+        if kind != "template":
+            raise ValueError(f"{template_file} does not hold a full template")
+        return template
+
+    def read_template(self, base: Optional[Dict] = None) -> Optional[Dict]:
+        """Current template: unwrapped, ``base`` patched by the delta, or the delta's full copy."""
+        snapshot = self.read()
+        if snapshot is None:
+            return None
+        kind, body = self.parse_document(snapshot[1])
+        if kind == "template":
+            return body
+        template = apply_template_delta(base, body["template_delta"])
+        return template if template is not None else self.load_template_file(body["template_file"])
+
+    def close(self):
+        """Unmap the region; the owner also removes it."""
+        try:
+            self._shm.close()
+            if self.owner:
+                self._owned_names.discard(self.name)
+                self._shm.unlink()
+        except (FileNotFoundError, BufferError):
+            pass
+
+
+
+class ProcessedFileLedger:
+    """Solution files the DTM has already parsed, keyed by path -> (mtime_ns, size).
+
+    A file is parsed again only when it is rewritten (miners overwrite
+    ``mining_result.json`` every round). Persisted as JSON so a DTM restart
+    does not re-parse old results.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            try:
+                entries = json.loads(self.path.read_text())
+                self._entries = {key: value for key, value in entries.items() if os.path.exists(key)}
+            except (OSError, ValueError, AttributeError):
+                self._entries = {}
+
+    @staticmethod
+    def signature(file_path) -> Optional[List[int]]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def is_processed(self, file_path, signature=None) -> bool:
+        signature = signature or self.signature(file_path)
+        return signature is not None and self._entries.get(os.path.abspath(file_path)) == signature
+
+    def mark(self, file_path, signature=None):
+        signature = signature or self.signature(file_path)
+        if signature is None:
+            return
+        with self._lock:
+            self._entries[os.path.abspath(file_path)] = signature
+            if self.path:
+                tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+                try:
+                    tmp_path.write_text(json.dumps(self._entries))
+                    os.replace(tmp_path, self.path)
+                except OSError:
+                    with contextlib.suppress(OSError):
+                        tmp_path.unlink()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SolutionIntake:
+    """Event-driven solution intake for the DTM.
+
+    Miners push a notice ``{"miner_id", "path", "solution"}`` over a Unix socket
+    as soon as they write a result; Linux inotify on the Temporary Template tree
+    catches files written without a notice. The monitoring thread sleeps in
+    ``wait()`` until something arrives - no directory scans while idle.
+
+    The same socket answers nonce lease requests (``{"lease": "acquire" | "report", ...}``)
+    through ``lease_handler``, which returns the reply fields.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_ISDIR = 0x40000000
+    _INOTIFY_EVENT = struct.Struct("iIII")
+    MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, watch_dir, address):
+        self.watch_dir = Path(watch_dir)
+        self.address = str(address)
+        self.sources: List[str] = []
+        self.notices_received = 0
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._listener = None
+        self._serve_thread = None
+        self._inotify_fd = None
+        self._wake_pipe = None
+        self._watches: Dict[int, Path] = {}
+        self._closed = False
+        self.lease_handler = None
+
+    @staticmethod
+    def address_for(template_dir) -> str:
+        digest = hashlib.sha1(str(Path(template_dir).resolve()).encode()).hexdigest()[:16]
+        return str(Path(tempfile.gettempdir()) / f"dtm_intake_{digest}.sock")
+
+    @staticmethod
+    def is_solution_file(name: str) -> bool:
+        return name == "mining_result.json" or (name.startswith("solution_") and name.endswith(".json"))
+
+    @staticmethod
+    def is_process_folder(name: str) -> bool:
+        return name.startswith("Process_") or name.startswith("process_")
+
+    def start(self) -> List[str]:
+        """Start every available source; returns their names (empty = fall back to scans)."""
+        if self._start_socket():
+            self.sources.append("socket")
+        if self._start_inotify():
+            self.sources.append("inotify")
+        return self.sources
+
+    def push(self, event: Dict):
+        with self._condition:
+            self._events.append(event)
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> List[Dict]:
+        """Block until events arrive (or ``timeout``) and return all of them."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._events or self._closed, timeout)
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    # --- Unix socket: miners push notices -------------------------------------------------
+
+    def _start_socket(self) -> bool:
+        try:
+            from multiprocessing.connection import Client, Listener
+
+            if os.path.exists(self.address):
+                try:
+                    Client(self.address, family="AF_UNIX").close()
+                    return False  # another DTM in this environment already owns the intake
+                except OSError:
+                    os.unlink(self.address)  # stale socket from a DTM that did not exit cleanly
+            self._listener = Listener(self.address, family="AF_UNIX")
+            os.chmod(self.address, 0o600)
+        except (OSError, ValueError, AttributeError, ImportError):
+            self._listener = None
+            return False
+        self._serve_thread = threading.Thread(target=self._serve, name="DTM-SolutionIntake", daemon=True)
+        self._serve_thread.start()
+        return True
+
+    def _serve(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                conn.close()
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while not self._closed:
+                try:
+                    message = conn.recv_bytes(self.MAX_MESSAGE_BYTES)
+                except (EOFError, OSError):
+                    return
+                try:
+                    if SolutionRecord.is_record(message):
+                        # Binary notice: solution record followed by the result file path
+                        record = SolutionRecord.unpack_from(message)
+                        notice = {
+                            "miner_id": record.miner_id,
+                            "path": message[SolutionRecord.SIZE:].decode("utf-8") or None,
+                            "record": record,
+                        }
+                    else:
+                        notice = json.loads(message)
+                except ValueError:
+                    notice = None
+                reply = {}
+                if isinstance(notice, dict) and "lease" in notice:
+                    try:
+                        reply = self.lease_handler(notice) if self.lease_handler else None
+                    except (KeyError, TypeError, ValueError):
+                        reply = None
+                    ok = reply is not None
+                else:
+                    ok = isinstance(notice, dict) and bool(
+                        notice.get("path") or notice.get("solution") or notice.get("record")
+                    )
+                    if ok:
+                        self.notices_received += 1
+                        self.push({**notice, "source": "socket", "received_at": time.time()})
+                try:
+                    conn.send_bytes(json.dumps({**(reply or {}), "ok": ok}).encode())
+                except OSError:
+                    return
+
+    # --- inotify: files written without a notice -------------------------------------------
+
+    def _start_inotify(self) -> bool:
+        if not sys.platform.startswith("linux") or not self.watch_dir.is_dir():
+            return False
+        try:
+            import ctypes
+            import ctypes.util
+
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            fd = self._libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                return False
+        except (OSError, AttributeError):
+            return False
+
+        self._inotify_fd = fd
+        self._wake_pipe = os.pipe()
+        self._add_watch(self.watch_dir, self.IN_CREATE | self.IN_MOVED_TO)
+        for subfolder in self.watch_dir.iterdir():
+            if subfolder.is_dir() and self.is_process_folder(subfolder.name):
+                self._add_watch(subfolder, self.IN_CLOSE_WRITE | self.IN_MOVED_TO)
+        threading.Thread(target=self._inotify_loop, name="DTM-Inotify", daemon=True).start()
+        return True
+
+    def _add_watch(self, path: Path, mask: int):
+        wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(str(path)), mask)
+        if wd >= 0:
+            self._watches[wd] = path
+
+    def _inotify_loop(self):
+        try:
+            self._read_inotify_events()
+        finally:
+            for fd in (self._inotify_fd, *self._wake_pipe):
+                with contextlib.suppress(OSError):
+                    os.close(fd)
+
+    def _read_inotify_events(self):
+        import select
+
+        while not self._closed:
+            try:
+                readable, _, _ = select.select([self._inotify_fd, self._wake_pipe[0]], [], [])
+                if self._closed or self._inotify_fd not in readable:
+                    return
+                data = os.read(self._inotify_fd, 64 * 1024)
+            except OSError:
+                return
+
+            offset = 0
+            while offset + self._INOTIFY_EVENT.size <= len(data):
+                wd, mask, _, length = self._INOTIFY_EVENT.unpack_from(data, offset)
+                offset += self._INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                parent = self._watches.get(wd)
+                if parent is None or not name:
+                    continue
+                path = parent / name
+                if parent == self.watch_dir:
+                    if mask & self.IN_ISDIR and self.is_process_folder(name):
+                        self._add_watch(path, self.IN_CLOSE_WRITE | self.IN_MOVED_TO)
+                        # Files may have landed before the watch existed
+                        for existing in path.glob("*.json"):
+                            if self.is_solution_file(existing.name):
+                                self.push({"miner_id": name, "path": str(existing), "source": "inotify"})
+                elif self.is_solution_file(name):
+                    self.push({"miner_id": parent.name, "path": str(path), "source": "inotify"})
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        with self._condition:
+            self._condition.notify_all()
+        if self._listener is not None:
+            # Wake the accept loop and let it exit first: once the listener is closed its fd
+            # number is reused, and a late accept() would take the next intake's connections
+            with contextlib.suppress(OSError, ImportError):
+                from multiprocessing.connection import Client
+
+                Client(self.address, family="AF_UNIX").close()
+            if self._serve_thread is not None and self._serve_thread is not threading.current_thread():
+                self._serve_thread.join(1.0)
+            with contextlib.suppress(OSError):
+                self._listener.close()
+            with contextlib.suppress(OSError):
+                os.unlink(self.address)
+        if self._wake_pipe is not None:
+            with contextlib.suppress(OSError):
+                os.write(self._wake_pipe[1], b"x")
+
+
+def send_solution_notice(template_dir, miner_id: str, path, solution=None, timeout: float = 1.0) -> bool:
+    """Tell the DTM's solution intake that ``miner_id`` wrote ``path``. False = no DTM listening.
+
+    ``solution`` may be a SolutionRecord, which travels as its binary layout.
+    """
+    if isinstance(solution, SolutionRecord):
+        message = solution.encode() + str(path or "").encode("utf-8")
+    else:
+        message = json.dumps({"miner_id": miner_id, "path": str(path), "solution": solution}, default=str).encode()
+    reply = _intake_request(template_dir, message, timeout)
+    return bool(reply and reply.get("ok"))
+
+
+def send_nonce_lease_request(template_dir, request: Dict, timeout: float = 1.0) -> Optional[Dict]:
+    """Send a nonce lease ``acquire``/``report`` request to the DTM; its reply, or None if no DTM answered."""
+    reply = _intake_request(template_dir, json.dumps(request, default=str).encode(), timeout)
+    return reply if reply and reply.get("ok") else None
+
+
+def _intake_request(template_dir, message: bytes, timeout: float) -> Optional[Dict]:
+    address = SolutionIntake.address_for(template_dir)
+    if not os.path.exists(address):
+        return None
+    try:
+        from multiprocessing.connection import Client
+
+        with Client(address, family="AF_UNIX") as conn:
+            conn.send_bytes(message)
+            return json.loads(conn.recv_bytes()) if conn.poll(timeout) else None
+    except (OSError, EOFError, ValueError, AttributeError):
+        return None
+
+
+
+class SolutionRecord:
+    """
+    Canonical fixed-layout binary solution record for miner → DTM → Looping.
+
+    160 bytes: magic, 80-byte block header, 32-byte hash, nonce, template
+    generation and a NUL-padded 32-byte miner id. pack_into/unpack_from work on
+    any buffer (bytes, bytearray, memoryview, shared memory); hex strings are
+    produced only by to_solution() where a JSON document is written.
+    """
+
+    MAGIC = b"SLR1"
+    LAYOUT = struct.Struct("<4s80s32sIQ32s")
+    SIZE = LAYOUT.size
+    __slots__ = ("header", "digest", "nonce", "generation", "miner_id")
+
+    def __init__(self, header, digest, nonce: Optional[int] = None, generation: int = 0, miner_id: str = ""):
+        if len(header) != 80 or len(digest) != 32:
+            raise ValueError(f"Expected 80-byte header and 32-byte hash, got {len(header)} and {len(digest)}")
+        self.header = bytes(header)
+        self.digest = bytes(digest)
+        self.nonce = struct.unpack_from("<I", self.header, 76)[0] if nonce is None else int(nonce)
+        self.generation = int(generation)
+        self.miner_id = miner_id
+
+    def __eq__(self, other):
+        return isinstance(other, SolutionRecord) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        """Write the record into ``buffer`` at ``offset``; returns the offset after it."""
+        self.LAYOUT.pack_into(
+            buffer, offset, self.MAGIC, self.header, self.digest, self.nonce, self.generation,
+            self.miner_id.encode("utf-8")[:32],
+        )
+        return offset + self.SIZE
+
+    def encode(self) -> bytes:
+        buffer = bytearray(self.SIZE)
+        self.pack_into(buffer)
+        return bytes(buffer)
+
+    @classmethod
+    def is_record(cls, buffer) -> bool:
+        return len(buffer) >= cls.SIZE and bytes(buffer[:4]) == cls.MAGIC
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> "SolutionRecord":
+        magic, header, digest, nonce, generation, miner_id = cls.LAYOUT.unpack_from(buffer, offset)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a solution record")
+        return cls(header, digest, nonce, generation, miner_id.rstrip(b"\0").decode("utf-8", "replace"))
+
+    @classmethod
+    def from_solution(cls, solution: Dict, generation: int = 0) -> "SolutionRecord":
+        """Parse a JSON-style solution (``block_header``/``hash`` hex); raises ValueError if incomplete."""
+        header, digest = solution.get("block_header"), solution.get("hash")
+        if not header or not digest:
+            raise ValueError("Solution has no block_header/hash")
+        return cls(
+            bytes.fromhex(header) if isinstance(header, str) else header,
+            bytes.fromhex(digest) if isinstance(digest, str) else digest,
+            solution.get("nonce"),
+            solution.get("template_generation", generation),
+            str(solution.get("process_id") or solution.get("miner_id") or ""),
+        )
+
+    def header_hash(self) -> bytes:
+        """Double SHA-256 of the header, in the same byte order the miner reports."""
+        return hashlib.sha256(hashlib.sha256(self.header).digest()).digest()
+
+    def to_solution(self) -> Dict:
+        return {
+            "block_header": self.header.hex(),
+            "hash": self.digest.hex(),
+            "nonce": self.nonce,
+            "template_generation": self.generation,
+            "miner_id": self.miner_id,
+        }
+
+
+class NotificationJournal:
+    """
+    Append-only DTM → Looping notification journal.
+
+    Records are ``<II`` (payload length, crc32) followed by compact JSON. Appends
+    are flock-serialised and fsynced before returning, and the first append of a
+    process cuts off any torn tail a crashed writer left behind; readers skip a
+    corrupt record in the middle and resume at the next intact one. The consumer
+    offset lives in a sidecar file that is replaced atomically after each record
+    is handled, so delivery is at-least-once. Once the consumer has caught up
+    with a journal of COMPACT_BYTES or more, the journal is truncated to zero.
+    """
+
+    HEADER = struct.Struct("<II")
+    COMPACT_BYTES = 1 << 20
+
+    def __init__(self, directory, name: str = "valid_solutions"):
+        self.directory = Path(directory)
+        self.path = self.directory / f"{name}.journal"
+        self.offset_path = self.directory / f"{name}.offset"
+        self._repaired = False
+
+    @contextlib.contextmanager
+    def _locked(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            os.close(fd)  # also releases the flock
+
+    @classmethod
+    def _frame_at(cls, data: bytes, pos: int) -> Optional[Tuple[Dict, int]]:
+        """``(record, end)`` for an intact frame at ``pos``, else None."""
+        length, crc = cls.HEADER.unpack_from(data, pos)
+        end = pos + cls.HEADER.size + length
+        if end > len(data):
+            return None  # record still being written (or torn)
+        payload = data[pos + cls.HEADER.size:end]
+        if zlib.crc32(payload) != crc:
+            return None
+        try:
+            return json.loads(payload), end
+        except ValueError:
+            return None
+
+    @classmethod
+    def _scan(cls, data: bytes, label: str = "journal") -> Tuple[List[Tuple[Dict, int]], int]:
+        """Complete records in ``data`` with their end offsets, plus the end of the last one.
+
+        A bad frame followed by an intact one is skipped (and logged); bad bytes with
+        nothing intact after them are a torn or in-flight tail and end the scan.
+        """
+        records, pos = [], 0
+        while pos + cls.HEADER.size <= len(data):
+            frame = cls._frame_at(data, pos)
+            if frame is None:
+                resync = next(
+                    (
+                        candidate
+                        for candidate in range(pos + 1, len(data) - cls.HEADER.size + 1)
+                        if cls._frame_at(data, candidate) is not None
+                    ),
+                    None,
+                )
+                if resync is None:
+                    break
+                print(f"⚠️ {label}: skipped {resync - pos} corrupt bytes at offset {pos}")
+                pos = resync
+                continue
+            records.append(frame)
+            pos = frame[1]
+        return records, pos
+
+    def append(self, record: Dict) -> int:
+        """Durably append ``record``; returns the journal size afterwards."""
+        payload = json.dumps(record, separators=(",", ":"), default=str).encode()
+        frame = self.HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._locked() as fd:
+            if not self._repaired:
+                size = os.fstat(fd).st_size
+                _, valid_end = self._scan(os.pread(fd, size, 0), self.path.name)
+                if valid_end < size:
+                    os.ftruncate(fd, valid_end)
+                self._repaired = True
+            os.write(fd, frame)
+            os.fsync(fd)
+            return os.fstat(fd).st_size
+
+    def committed_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def read_new(self, offset: Optional[int] = None) -> List[Tuple[Dict, int]]:
+        """Records after ``offset`` (default: the committed one) as (record, next_offset) pairs."""
+        offset = self.committed_offset() if offset is None else offset
+        try:
+            with open(self.path, "rb") as f:
+                if offset > os.fstat(f.fileno()).st_size:
+                    offset = 0  # journal was compacted under a stale offset
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        records, _ = self._scan(data, self.path.name)
+        return [(record, offset + end) for record, end in records]
+
+    def _write_offset(self, offset: int) -> None:
+        tmp = self.offset_path.with_name(self.offset_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.offset_path)
+
+    def commit(self, offset: int) -> None:
+        """Persist the consumer offset (and compact once everything up to it is consumed)."""
+        self._write_offset(offset)
+        if offset >= self.COMPACT_BYTES:
+            with self._locked() as fd:
+                if os.fstat(fd).st_size != offset:
+                    return  # a writer appended meanwhile; compact on a later commit
+                # Offset first: a crash in between re-delivers instead of skipping records
+                self._write_offset(0)
+                os.ftruncate(fd, 0)
+                os.fsync(fd)
+
+
+class SolutionFileWriter:
+    """
+    Write-behind fan-out of the DTM files derived from a validated solution.
+
+    ``submit`` durably appends one record to the ``solution_files`` journal and
+    returns, so Looping can be told at once. A daemon thread materialises the
+    recorded solutions in batches through ``materialise(solution, miner_id)``,
+    which returns the paths it wrote. It fsyncs every touched file once per
+    batch, then commits the journal offset up to the first record that failed
+    (raised or wrote nothing), which is retried on the next flush. A record that
+    fails MAX_ATTEMPTS times in a row is moved to ``solution_files.deadletter.jsonl``
+    and the offset moves past it, so one bad solution cannot hold back the rest.
+    Records a crash left unwritten are replayed on the next start, so delivery is
+    at-least-once. A flock on ``solution_files.lock`` keeps two consumers of
+    one journal from materialising the same records; within a process, use
+    ``get_solution_file_writer`` so there is only one writer per journal.
+    """
+
+    BATCH_SECONDS = 0.2  # lets a burst of solutions share one batch of fsyncs
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, directory, materialise, batch_seconds: Optional[float] = None):
+        self.journal = NotificationJournal(directory, "solution_files")
+        self.lock_path = self.journal.directory / "solution_files.lock"
+        self.dead_letter_path = self.journal.directory / "solution_files.deadletter.jsonl"
+        self.materialise = materialise
+        self.batch_seconds = self.BATCH_SECONDS if batch_seconds is None else batch_seconds
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.closed = False
+        self.batches = 0
+        self.records_written = 0
+        self.fsyncs = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.last_batch_seconds = 0.0
+        self._failing: Optional[Tuple[int, int]] = None  # (record end offset, failed attempts)
+
+    def submit(self, solution: Dict, miner_id: str) -> int:
+        """Durably record a solution whose files are still to be written; returns the journal size."""
+        offset = self.journal.append({"miner_id": miner_id, "solution": solution})
+        if self.closed:
+            self.flush()
+        else:
+            self.start()
+            self.wake.set()
+        return offset
+
+    def start(self) -> "SolutionFileWriter":
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="dtm-solution-files", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+            self.wake.set()  # replay whatever a previous run left unwritten
+        return self
+
+    def _run(self) -> None:
+        while not self.closed:
+            self.wake.wait()
+            self.wake.clear()
+            time.sleep(self.batch_seconds)
+            self.flush()
+
+    @contextlib.contextmanager
+    def _consumer_locked(self):
+        # Held across read, materialise and commit; appends use the journal's own lock
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # also releases the flock
+
+    def flush(self) -> int:
+        """Materialise recorded solutions now; returns how many records were handled.
+
+        Stops at the first record whose files could not be written and leaves it
+        (and everything after it) in the journal for the next flush, unless that
+        was its MAX_ATTEMPTS-th failure: then it is dead-lettered and skipped.
+        """
+        with self.lock, self._consumer_locked():
+            records = self.journal.read_new()
+            if not records:
+                return 0
+            start = time.perf_counter()
+            touched = set()
+            handled_offset, handled, materialised = None, 0, 0
+            for record, end in records:
+                error = None
+                try:
+                    written = self.materialise(record.get("solution") or {}, record.get("miner_id"))
+                except Exception as e:
+                    written, error = None, str(e)
+                    print(f"❌ DTM file fan-out failed for {record.get('miner_id')}: {e}")
+                if not written:
+                    self.failures += 1
+                    attempts = self._failing[1] + 1 if self._failing and self._failing[0] == end else 1
+                    self._failing = (end, attempts)
+                    if attempts < self.MAX_ATTEMPTS or not self._dead_letter(record, attempts, error):
+                        print(f"⚠️ DTM files for {record.get('miner_id')} not written "
+                              f"(attempt {attempts}/{self.MAX_ATTEMPTS}); retrying on the next flush")
+                        break
+                    print(f"❌ DTM files for {record.get('miner_id')} failed {attempts} times; "
+                          f"moved to {self.dead_letter_path.name}")
+                else:
+                    touched.update(path for path in written.values() if isinstance(path, str))
+                    materialised += 1
+                self._failing = None
+                handled_offset, handled = end, handled + 1
+            for path in touched:
+                self.fsyncs += self._fsync(path)
+            if handled_offset is not None:
+                self.journal.commit(handled_offset)
+            self.batches += 1
+            self.records_written += materialised
+            self.last_batch_seconds = time.perf_counter() - start
+            return handled
+
+    def _dead_letter(self, record: Dict, attempts: int, error: Optional[str]) -> bool:
+        """Durably park a record that keeps failing; False leaves it in the journal."""
+        line = json.dumps({"dead_lettered_at": current_timestamp(), "attempts": attempts,
+                           "error": error, "record": record}, separators=(",", ":"), default=str)
+        try:
+            with open(self.dead_letter_path, "a") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"⚠️ Could not dead-letter DTM solution record: {e}")
+            return False
+        self.dead_lettered += 1
+        return True
+
+    @staticmethod
+    def _fsync(path: str) -> bool:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            os.fsync(fd)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.wake.set()
+        self.flush()
+
+
+_solution_file_writers: Dict[str, SolutionFileWriter] = {}
+_solution_file_writers_lock = threading.Lock()
+
+
+def get_solution_file_writer(directory, materialise) -> SolutionFileWriter:
+    """Process-wide started writer for the journal in ``directory`` (``materialise`` binds on first call)."""
+    key = str(Path(directory).resolve())
+    with _solution_file_writers_lock:
+        writer = _solution_file_writers.get(key)
+        if writer is None:
+            writer = _solution_file_writers[key] = SolutionFileWriter(key, materialise).start()
+        return writer
+
+
+class LedgerSegmentStore:
+    """
+    Append-only JSON-lines store behind a ``{"entries": [...]}`` ledger file.
+
+    ``ledger.json`` is backed by ``ledger.segments/`` holding numbered ``.jsonl``
+    segments, rotated at SEGMENT_MAX_BYTES, and ``index.json`` (entry counts, byte
+    sizes, last timestamp, running totals and the document's non-entry header).
+    An append writes one line and rewrites the small index, so its cost does not
+    grow with history. compact() renders the legacy document for consumers that
+    still read the whole file; entries it already rendered are taken from that
+    file, so edits other writers made to them survive.
+    """
+
+    SEGMENT_MAX_BYTES = 8 << 20
+    COMPACT_INTERVAL = 60.0  # seconds a rendered document may lag behind the segments
+    SUMMED_FIELDS = ("hashes_tried", "time_to_solution_seconds", "meets_difficulty")
+
+    def __init__(self, ledger_path, segment_max_bytes: Optional[int] = None):
+        self.ledger_path = Path(ledger_path)
+        self.directory = self.ledger_path.with_name(self.ledger_path.stem + ".segments")
+        self.index_path = self.directory / "index.json"
+        self.segment_max_bytes = segment_max_bytes or self.SEGMENT_MAX_BYTES
+        self._lock = threading.Lock()
+        self._last_compacted = time.monotonic()
+        self.index = self._load_index()
+
+    def _segment_path(self, segment: Dict) -> Path:
+        return self.directory / segment["file"]
+
+    def _new_segment(self, index: Dict) -> Dict:
+        segment = {"file": f"{len(index['segments']) + 1:06d}.jsonl", "first_entry": index["total_entries"], "entries": 0, "bytes": 0}
+        index["segments"].append(segment)
+        return segment
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = None
+        if index is None:
+            legacy = self._read_document(self.ledger_path)
+            legacy_entries = list(legacy.pop("entries", None) or [])
+            index = {"created": current_timestamp(), "last_updated": None, "last_timestamp": None,
+                     "total_entries": 0, "segments": [], "totals": dict.fromkeys(self.SUMMED_FIELDS, 0),
+                     "header": legacy, "rendered_entries": len(legacy_entries)}
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._new_segment(index)
+            self.index = index
+            if legacy_entries:
+                # One-time import of an existing whole-file ledger
+                self._write_lines(index, legacy_entries)
+            self._save_index(index)
+            return index
+        self.index = index
+        self._recover_tail(index)
+        if "totals" not in index:
+            index["totals"] = dict.fromkeys(self.SUMMED_FIELDS, 0)
+            for entry in self.iter_entries():
+                self._add_totals(index, entry)
+        index.setdefault("header", {})
+        index.setdefault("rendered_entries", 0)
+        return index
+
+    @staticmethod
+    def _read_document(path: Path) -> Dict:
+        try:
+            with open(path, "r") as f:
+                document = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return document if isinstance(document, dict) else {}
+
+    def _recover_tail(self, index: Dict) -> None:
+        """Reconcile the active segment with the index after a crash between append and index save."""
+        segment = index["segments"][-1]
+        path = self._segment_path(segment)
+        size = path.stat().st_size if path.exists() else 0
+        if size == segment["bytes"]:
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            complete = data[: data.rfind(b"\n") + 1]
+            if len(complete) != len(data):
+                f.truncate(len(complete))  # torn final line
+        lines = complete.count(b"\n")
+        if "totals" in index:
+            for line in complete.splitlines()[segment["entries"]:]:
+                self._add_totals(index, json.loads(line))
+        index["total_entries"] += lines - segment["entries"]
+        segment["entries"], segment["bytes"] = lines, len(complete)
+        self._save_index(index)
+
+    def _save_index(self, index: Dict) -> None:
+        temp_path = self.index_path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(self.index_path)
+
+    def _add_totals(self, index: Dict, entry: Dict) -> None:
+        if not isinstance(entry, dict):
+            return
+        totals = index["totals"]
+        for field in self.SUMMED_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, (int, float)):
+                totals[field] = totals.get(field, 0) + value
+
+    def _write_lines(self, index: Dict, entries: List[Dict]) -> None:
+        segment = index["segments"][-1]
+        pending = []
+        for entry in entries:
+            line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode()
+            if segment["entries"] and segment["bytes"] + len(line) > self.segment_max_bytes:
+                self._flush_lines(segment, pending)
+                pending = []
+                segment = self._new_segment(index)
+            pending.append(line)
+            segment["entries"] += 1
+            segment["bytes"] += len(line)
+            index["total_entries"] += 1
+            self._add_totals(index, entry)
+            if isinstance(entry, dict) and entry.get("timestamp"):
+                index["last_timestamp"] = entry["timestamp"]
+        self._flush_lines(segment, pending)
+        index["last_updated"] = current_timestamp()
+
+    def _flush_lines(self, segment: Dict, lines: List[bytes]) -> None:
+        if lines:
+            with open(self._segment_path(segment), "ab") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, entry: Dict, update_header=None) -> int:
+        """
+        Append one entry; returns the ledger's total entry count.
+
+        ``update_header(header, totals)`` may refresh the rendered header from the
+        running totals (``totals["entries"]`` plus SUMMED_FIELDS) in the same index write.
+        """
+        with self._lock:
+            self._write_lines(self.index, [entry])
+            if update_header is not None:
+                update_header(self.index["header"], dict(self.index["totals"], entries=self.index["total_entries"]))
+            self._save_index(self.index)
+            return self.index["total_entries"]
+
+    @property
+    def total_entries(self) -> int:
+        return self.index["total_entries"]
+
+    @property
+    def header(self) -> Dict:
+        """Copy of the non-entry fields the rendered document carries."""
+        return copy.deepcopy(self.index["header"])
+
+    @property
+    def pending_entries(self) -> int:
+        """Entries appended since the last compact()."""
+        return self.index["total_entries"] - self.index["rendered_entries"]
+
+    def first_entry(self) -> Optional[Dict]:
+        return next(self.iter_entries(), None)
+
+    def compaction_due(self) -> bool:
+        return bool(self.pending_entries) and time.monotonic() - self._last_compacted >= self.COMPACT_INTERVAL
+
+    def iter_entries(self, start: int = 0):
+        """Entries from position ``start`` on; whole segments before it are skipped via the index."""
+        for segment in list(self.index["segments"]):
+            if segment["first_entry"] + segment["entries"] <= start:
+                continue
+            with open(self._segment_path(segment), "rb") as f:
+                for position, line in enumerate(islice(f, segment["entries"]), segment["first_entry"]):
+                    if position >= start:
+                        yield json.loads(line)
+
+    def compact(self, output_path=None) -> Path:
+        """Render the legacy ``{"entries": [...]}`` document (default: over the ledger file)."""
+        output_path = Path(output_path) if output_path else self.ledger_path
+        with self._lock:
+            rendered = self.index["rendered_entries"] if output_path == self.ledger_path else 0
+            existing = self._read_document(output_path) if rendered else {}
+            prefix = existing.pop("entries", None) or []
+            if len(prefix) < rendered:
+                # Rendered document lost or truncated: render everything from the segments
+                prefix, rendered = [], 0
+            data = {**existing, **self.index["header"]}
+            data["entries"] = prefix[:rendered] + list(self.iter_entries(rendered))
+            data.setdefault("created", self.index["created"])
+            data["last_updated"] = self.index["last_updated"] or current_timestamp()
+            data["total_entries"] = self.index["total_entries"]
+            temp_path = output_path.with_suffix(".tmp")
+            with open(temp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            temp_path.replace(output_path)
+            if output_path == self.ledger_path:
+                self.index["rendered_entries"] = self.index["total_entries"]
+                self._save_index(self.index)
+                self._last_compacted = time.monotonic()
+        return output_path
+
+
+class NonceLeaseScheduler:
+    """
+    Hands out nonce sub-ranges of one template to miners as leases.
+
+    A lease is sized for LEASE_SECONDS of the miner's measured hash rate (an EWMA
+    of its progress reports). Free ranges are handed out in priority order, so
+    the GPS window goes first and the rest of the nonce space follows. With
+    nothing free, an idle miner steals the upper half of the lease with the
+    longest projected time to finish. Leases with no report for LEASE_TIMEOUT
+    seconds are reclaimed. Reported progress goes into an exact, merged interval
+    map, so every lookup and update is logarithmic in the number of intervals
+    rather than linear in miners or nonces.
+    """
+
+    LEASE_SECONDS = 30.0
+    LEASE_TIMEOUT = 90.0
+    MIN_LEASE = 1 << 16
+    MAX_LEASE = 1 << 28
+    DEFAULT_RATE = 100_000.0  # H/s assumed until a miner reports progress
+    RATE_SMOOTHING = 0.3
+
+    def __init__(self, template_key=None, priority_range: Optional[Tuple[int, int]] = None,
+                 nonce_space: Tuple[int, int] = (0, 2**32), extranonce: int = 0):
+        """``priority_range`` is half-open [start, end), like every range here.
+
+        ``extranonce`` is the coinbase extranonce whose nonce space this map covers.
+        """
+        self.template_key = template_key
+        self.extranonce = extranonce
+        space_start, space_end = nonce_space
+        if priority_range:
+            start = max(space_start, priority_range[0])
+            end = min(space_end, priority_range[1])
+            ranges = [(start, end), (end, space_end), (space_start, start)]
+        else:
+            ranges = [(space_start, space_end)]
+        self.free: deque = deque((start, end) for start, end in ranges if start < end)
+        self.leases: Dict[int, Dict[str, Any]] = {}
+        self.miner_rates: Dict[str, float] = {}
+        self.covered_starts: List[int] = []
+        self.covered_ends: List[int] = []
+        self.stolen_leases = 0
+        self.reclaimed_leases = 0
+        self._next_lease_id = 1
+        self._lock = threading.Lock()
+
+    # --- coverage map ----------------------------------------------------------------------
+
+    def _mark_covered(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        starts, ends = self.covered_starts, self.covered_ends
+        # Merge with every interval that overlaps or touches [start, end)
+        lo = bisect_left(ends, start)
+        hi = bisect_right(starts, end)
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+        starts[lo:hi] = [start]
+        ends[lo:hi] = [end]
+
+    def is_covered(self, nonce: int) -> bool:
+        pos = bisect_right(self.covered_starts, nonce) - 1
+        return pos >= 0 and nonce < self.covered_ends[pos]
+
+    @property
+    def covered_count(self) -> int:
+        return sum(end - start for start, end in zip(self.covered_starts, self.covered_ends))
+
+    def coverage(self) -> List[Tuple[int, int]]:
+        return list(zip(self.covered_starts, self.covered_ends))
+
+    # --- leases ----------------------------------------------------------------------------
+
+    def _lease_size(self, miner_id: str) -> int:
+        rate = self.miner_rates.get(miner_id, self.DEFAULT_RATE)
+        return int(min(self.MAX_LEASE, max(self.MIN_LEASE, rate * self.LEASE_SECONDS)))
+
+    def _issue(self, miner_id: str, start: int, end: int, now: float) -> Dict[str, Any]:
+        lease = {
+            "lease_id": self._next_lease_id,
+            "miner_id": miner_id,
+            "start": start,
+            "end": end,
+            "cursor": start,
+            "issued_at": now,
+            "last_report": now,
+        }
+        self._next_lease_id += 1
+        self.leases[lease["lease_id"]] = lease
+        return dict(lease)
+
+    def _steal(self, miner_id: str) -> Optional[Tuple[int, int]]:
+        """Split off the upper half of the lease that would finish last."""
+        victim, slowest = None, 0.0
+        for lease in self.leases.values():
+            remaining = lease["end"] - lease["cursor"]
+            if lease["miner_id"] == miner_id or remaining < 2 * self.MIN_LEASE:
+                continue
+            eta = remaining / self.miner_rates.get(lease["miner_id"], self.DEFAULT_RATE)
+            if eta > slowest:
+                victim, slowest = lease, eta
+        if victim is None:
+            return None
+        split = victim["cursor"] + (victim["end"] - victim["cursor"]) // 2
+        stolen = (split, victim["end"])
+        victim["end"] = split
+        self.stolen_leases += 1
+        return stolen
+
+    def acquire(self, miner_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next lease for ``miner_id`` ({lease_id, start, end, ...}); None once the space is exhausted."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._reclaim_expired(now)
+            size = self._lease_size(miner_id)
+            while self.free:
+                start, end = self.free.popleft()
+                if start + size < end:
+                    self.free.appendleft((start + size, end))
+                    end = start + size
+                return self._issue(miner_id, start, end, now)
+            stolen = self._steal(miner_id)
+            if stolen is None:
+                return None
+            return self._issue(miner_id, stolen[0], stolen[1], now)
+
+    def report(self, lease_id: int, cursor: int, now: Optional[float] = None) -> Optional[int]:
+        """
+        Record that the lease holder hashed up to ``cursor`` (exclusive).
+
+        Returns the lease's current end, which shrinks when its tail was stolen,
+        or None when the lease was reclaimed or completed and the miner should
+        acquire a new one.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return None
+            cursor = max(lease["cursor"], min(cursor, lease["end"]))
+            elapsed = now - lease["last_report"]
+            if elapsed > 0 and cursor > lease["cursor"]:
+                sample = (cursor - lease["cursor"]) / elapsed
+                previous = self.miner_rates.get(lease["miner_id"])
+                self.miner_rates[lease["miner_id"]] = (
+                    sample if previous is None
+                    else previous + self.RATE_SMOOTHING * (sample - previous)
+                )
+            self._mark_covered(lease["cursor"], cursor)
+            lease["cursor"], lease["last_report"] = cursor, now
+            if cursor >= lease["end"]:
+                del self.leases[lease_id]
+                return None
+            return lease["end"]
+
+    def complete(self, lease_id: int, now: Optional[float] = None) -> None:
+        """The holder hashed its whole (possibly shrunk) lease."""
+        with self._lock:
+            lease = self.leases.get(lease_id)
+        if lease is not None:
+            self.report(lease_id, lease["end"], now)
+
+    def _reclaim_expired(self, now: float) -> None:
+        for lease_id, lease in list(self.leases.items()):
+            if now - lease["last_report"] >= self.LEASE_TIMEOUT:
+                del self.leases[lease_id]
+                if lease["cursor"] < lease["end"]:
+                    self.free.appendleft((lease["cursor"], lease["end"]))
+                self.reclaimed_leases += 1
+
+    def reclaim_expired(self, now: Optional[float] = None) -> None:
+        with self._lock:
+            self._reclaim_expired(time.time() if now is None else now)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active_leases": len(self.leases),
+                "free_ranges": len(self.free),
+                "covered_nonces": self.covered_count,
+                "coverage_intervals": len(self.covered_starts),
+                "stolen_leases": self.stolen_leases,
+                "reclaimed_leases": self.reclaimed_leases,
+                "miner_rates": dict(self.miner_rates),
+            }
+
+
+class DTMValidationClient:
+    """
+    Long-lived solution validator for miner processes.
+
+    The DTM behind it boots once, on first use, and each template's target is
+    parsed to an integer once and kept in a small LRU keyed by template
+    identity. Nothing else about the template is cached: validate_miner_solution
+    checks the claimed hash against that target and never rebuilds the header,
+    so there is no header prefix or midstate worth keeping here (the batch path
+    caches its own prefixes, see validate_solutions_batch).
+    """
+
+    TEMPLATE_CACHE_SIZE = 8
+
+    def __init__(self, demo_mode: bool = False, dtm: Optional["GPSEnhancedDynamicTemplateManager"] = None):
+        self.demo_mode = demo_mode
+        self._dtm = dtm
+        self._lock = threading.Lock()
+        self._template_targets: "OrderedDict[Tuple, Optional[int]]" = OrderedDict()
+        self.boot_seconds = 0.0
+        self.validations = 0
+        self.target_cache_hits = 0
+
+    @property
+    def dtm(self) -> "GPSEnhancedDynamicTemplateManager":
+        if self._dtm is None:
+            with self._lock:
+                if self._dtm is None:
+                    started = time.perf_counter()
+                    self._dtm = GPSEnhancedDynamicTemplateManager(demo_mode=self.demo_mode, verbose=False)
+                    self.boot_seconds = time.perf_counter() - started
+        return self._dtm
+
+    @staticmethod
+    def template_key(template: Dict) -> Tuple:
+        return (
+            template.get("previousblockhash"),
+            template.get("height"),
+            template.get("target"),
+            template.get("merkleroot"),
+        )
+
+    def _template_target(self, template: Dict) -> Optional[int]:
+        """Integer form of the template's ``target``, parsed once per template."""
+        key = self.template_key(template)
+        with self._lock:
+            if key in self._template_targets:
+                self._template_targets.move_to_end(key)
+                self.target_cache_hits += 1
+                return self._template_targets[key]
+            try:
+                target_int = int(template.get("target", "f" * 64), 16)
+            except (TypeError, ValueError):
+                target_int = None  # validate_miner_solution reports the conversion error
+            self._template_targets[key] = target_int
+            while len(self._template_targets) > self.TEMPLATE_CACHE_SIZE:
+                self._template_targets.popitem(last=False)
+            return target_int
+
+    def warm(self, template: Optional[Dict] = None) -> "DTMValidationClient":
+        """Boot the DTM (and parse ``template``'s target) ahead of the first solution."""
+        self.dtm
+        if template:
+            self._template_target(template)
+        return self
+
+    def validate(self, solution: Dict, template: Dict) -> Dict:
+        target_int = self._template_target(template)
+        self.validations += 1
+        return self.dtm.validate_miner_solution(solution, template, target_int=target_int)
+
+    def validate_batch(self, solutions: List, template: Dict) -> List[Dict]:
+        """Verdicts for many candidates at once (see validate_solutions_batch)."""
+        self.validations += len(solutions)
+        return self.dtm.validate_solutions_batch(solutions, template)
+
+    def create_proof_files(self, solution: Dict, validation: Dict, template: Dict):
+        return self.dtm.create_validation_proof_files(solution=solution, validation=validation, template=template)
+
+
+_validation_clients: Dict[bool, DTMValidationClient] = {}
+_validation_clients_lock = threading.Lock()
+
+
+def get_dtm_validation_client(demo_mode: bool = False) -> DTMValidationClient:
+    """Process-wide validation client for ``demo_mode`` (created on first call)."""
+    with _validation_clients_lock:
+        client = _validation_clients.get(demo_mode)
+        if client is None:
+            client = _validation_clients[demo_mode] = DTMValidationClient(demo_mode=demo_mode)
+        return client
+
+
+def _double_sha256_headers(headers: bytes) -> bytes:
+    """Concatenated double-SHA256 digests of a buffer of 80-byte headers (also a pool worker)."""
+    view = memoryview(headers)
+    sha256 = hashlib.sha256
+    return b"".join(sha256(sha256(view[start:start + 80]).digest()).digest() for start in range(0, len(view), 80))
+
+
+def template_txid(entry) -> Optional[str]:
+    """Lower-case txid of a template transaction entry (dict or bare hex), or None."""
+    if isinstance(entry, dict):
+        entry = entry.get("txid") or entry.get("hash")
+    return entry.lower() if isinstance(entry, str) and entry else None
+
+
+def template_txid_digest(template: Dict[str, Any]) -> str:
+    """SHA-256 over a template's ordered txids; names the base a template delta applies to."""
+    digest = hashlib.sha256()
+    for entry in template.get("transactions") or []:
+        digest.update((template_txid(entry) or "").encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def compute_template_delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compact delta turning ``previous`` into ``current``, or None when a full template swap is needed.
+
+    A delta only describes a mempool refresh on the same tip: ``previousblockhash``,
+    ``height`` and ``bits`` must match, and ``current`` must keep the surviving
+    transactions in their old order with the new ones appended (what
+    getblocktemplate produces between blocks). Private ``_`` keys are ignored.
+    """
+    if not isinstance(previous, dict) or not isinstance(current, dict):
+        return None
+    if any(previous.get(key) != current.get(key) for key in ("previousblockhash", "height", "bits")):
+        return None
+    old_txs = previous.get("transactions") or []
+    new_txs = current.get("transactions") or []
+    old_ids = [template_txid(entry) for entry in old_txs]
+    new_ids = [template_txid(entry) for entry in new_txs]
+    if None in old_ids or None in new_ids:
+        return None
+
+    new_set = set(new_ids)
+    kept = [txid for txid in old_ids if txid in new_set]
+    if new_ids[: len(kept)] != kept:
+        return None
+    added = new_txs[len(kept):]
+    if len(set(new_ids[len(kept):])) != len(added) or set(new_ids[len(kept):]) & set(old_ids):
+        return None
+
+    fields = {
+        key: value
+        for key, value in current.items()
+        if key != "transactions" and not key.startswith("_") and previous.get(key) != value
+    }
+    dropped = [key for key in previous if key != "transactions" and not key.startswith("_") and key not in current]
+    return {
+        "type": "template_delta",
+        "previousblockhash": current.get("previousblockhash"),
+        "base_txid_digest": template_txid_digest(previous),
+        "removed_txids": [txid for txid in old_ids if txid not in new_set],
+        "added_transactions": added,
+        "fields": fields,
+        "dropped_fields": dropped,
+    }
+
+
+def apply_template_delta(base: Optional[Dict[str, Any]], delta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """New template from ``base`` plus a ``compute_template_delta`` delta, or None if ``base`` is not its base.
+
+    The result is a shallow copy: unchanged transaction entries are shared with
+    ``base`` and its private ``_`` keys (derived caches) are not carried over.
+    """
+    if not isinstance(base, dict) or not isinstance(delta, dict):
+        return None
+    if base.get("previousblockhash") != delta.get("previousblockhash"):
+        return None
+    if template_txid_digest(base) != delta.get("base_txid_digest"):
+        return None
+
+    removed = set(delta.get("removed_txids") or [])
+    template = {
+        key: value
+        for key, value in base.items()
+        if not key.startswith("_") and key not in (delta.get("dropped_fields") or [])
+    }
+    template.update(delta.get("fields") or {})
+    transactions = [entry for entry in base.get("transactions") or [] if template_txid(entry) not in removed]
+    transactions.extend(delta.get("added_transactions") or [])
+    template["transactions"] = transactions
+    return template
+
+
+class TemplatePrefetcher:
+    """Background stage that keeps the next processed template ready in a second buffer.
+
+    ``fetch()`` returns a raw template (or None) and ``process(raw)`` the processed
+    one. A worker thread polls ``fetch`` every ``interval`` seconds and processes
+    any template it has not seen yet into the back buffer, so ``take()`` is a
+    pointer flip on a hit. With nothing staged, ``take()`` fetches; a template
+    with the active one's key is a hit too, and only a new one is processed inline.
+    """
+
+    POLL_SECONDS = 5.0
+
+    def __init__(self, fetch, process, interval: Optional[float] = None):
+        self.fetch = fetch
+        self.process = process
+        self.interval = self.POLL_SECONDS if interval is None else interval
+        self.active: Optional[Tuple[tuple, Dict[str, Any]]] = None
+        self.ready: Optional[Tuple[tuple, Dict[str, Any]]] = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.discarded = 0
+        self.processing_seconds = 0.0
+        self.last_processing_seconds = 0.0
+
+    @staticmethod
+    def template_key(template: Dict[str, Any]) -> tuple:
+        """Identity of a raw template: tip, height, bits and transaction set.
+
+        curtime is left out on purpose: it ticks on every poll, and a template that
+        differs only in its timestamp needs no reprocessing.
+        """
+        return (
+            template.get("previousblockhash"),
+            template.get("height"),
+            template.get("bits"),
+            template_txid_digest(template),
+        )
+
+    def start(self) -> "TemplatePrefetcher":
+        if self.thread is None or not self.thread.is_alive():
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="template-prefetch", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.stop_event.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def take(self) -> Optional[Dict[str, Any]]:
+        """Switch to the prefetched template (hit) or fetch and process one inline (miss)."""
+        with self.lock:
+            entry, self.ready = self.ready, None
+            if entry is not None:
+                self.active = entry
+                self.hits += 1
+        if entry is None:
+            raw = self.fetch()
+            key = self.template_key(raw) if raw else None
+            with self.lock:
+                if key is not None and self.active is not None and self.active[0] == key:
+                    # Unchanged template (at most a new curtime): keep the processed one
+                    self.hits += 1
+                    return self.active[1]
+            self.misses += 1
+            entry = self._process(raw, key) if raw else None
+            if entry is None:
+                return None
+            with self.lock:
+                self.active = entry
+        # Start on the template after this one right away
+        self.wake.set()
+        return entry[1]
+
+    def prefetch_once(self) -> bool:
+        """Fetch and, if it is new, process a template into the back buffer. True if one was staged."""
+        raw = self.fetch()
+        if not raw:
+            return False
+        key = self.template_key(raw)
+        with self.lock:
+            known = {entry[0] for entry in (self.active, self.ready) if entry is not None}
+        if key in known:
+            return False
+        entry = self._process(raw, key)
+        if entry is None:
+            return False
+        with self.lock:
+            if self.ready is not None:
+                self.discarded += 1
+            self.ready = entry
+            self.prefetched += 1
+        return True
+
+    def _process(self, raw: Dict[str, Any], key: Optional[tuple] = None) -> Optional[Tuple[tuple, Dict[str, Any]]]:
+        start = time.perf_counter()
+        try:
+            processed = self.process(raw)
+        except Exception as e:
+            print(f"⚠️ Template prefetch processing failed: {e}")
+            return None
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.processing_seconds += elapsed
+            self.last_processing_seconds = elapsed
+        if not processed:
+            return None
+        return (key or self.template_key(raw), processed)
+
+    def _run(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                self.prefetch_once()
+            except Exception as e:
+                print(f"⚠️ Template prefetch failed: {e}")
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            takes = self.hits + self.misses
+            processed = self.prefetched + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / takes if takes else 0.0,
+                "prefetched": self.prefetched,
+                "discarded": self.discarded,
+                "ready": self.ready is not None,
+                "processing_seconds_total": self.processing_seconds,
+                "processing_seconds_last": self.last_processing_seconds,
+                "processing_seconds_average": self.processing_seconds / processed if processed else 0.0,
+            }
+
+
 class GPSEnhancedDynamicTemplateManager:
+    # validate_solutions_batch hashes in-process below this size (a pool costs more than it saves)
+    BATCH_POOL_THRESHOLD = 50000
+
     # Mapping between logical file keys and their static example references
     EXAMPLE_FILE_MAP: Dict[str, Path] = {
         "global_ledger": Path("System_File_Examples/System/global_ledger_example.json"),
@@ -1260,6 +2889,9 @@ class GPSEnhancedDynamicTemplateManager:
         self.ultra_hex_bucket_size = 64
         self.ultra_hex_max_digits = 256
         self.ultra_hex_consensus: Optional[Dict[str, Any]] = None
+
+        # BIP320 version rolling default for templates handed to miners (config.json dtm.version_rolling)
+        self.version_rolling_enabled = self.configured_version_rolling()
         
         # CRITICAL FIX: Initialize solution_targeting dictionary
         self.solution_targeting = {
@@ -1293,6 +2925,21 @@ class GPSEnhancedDynamicTemplateManager:
             self._create_dtm_tracking_files()
         elif self.verbose:
             print("📋 DTM using Brain-created file structure")
+
+        # Solution intake and shared-memory template state
+        self.monitoring_rescan_interval = 60  # Safety rescan while the event-driven intake is idle
+        self.solution_intake: Optional[SolutionIntake] = None
+        self.processed_file_ledger: Optional[ProcessedFileLedger] = None
+        self.shared_template_region: Optional[SharedTemplateRegion] = None  # Written once per template
+        self.shared_template_enabled = True
+        self.ledger_segment_stores: Dict[str, LedgerSegmentStore] = {}
+        self.batch_template_contexts: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.nonce_lease_scheduler: Optional[NonceLeaseScheduler] = None
+        self.nonce_lease_lock = threading.Lock()
+        # Recent templates for late solutions: LRU by template key, plus generation/tip/header lookups
+        self.validation_templates: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.validation_template_index: Dict[Tuple, Tuple] = {}
+        self.solution_file_writer: Optional[SolutionFileWriter] = None
     
     def _create_dtm_tracking_files(self):
         """
@@ -1565,7 +3212,7 @@ class GPSEnhancedDynamicTemplateManager:
 
         # PIPELINE FLOW.TXT COMPLIANCE: Add automatic subfolder monitoring
         self.monitoring_enabled = True
-        self.monitoring_interval = 5  # Check every 5 seconds
+        self.monitoring_interval = 5  # Check every 5 seconds (scan fallback)
         self.monitoring_thread = None
         self.last_monitoring_check = 0
         
@@ -2106,6 +3753,35 @@ class GPSEnhancedDynamicTemplateManager:
             "timestamp": current_timestamp(),
         }
 
+    def _build_version_rolling_settings(self, enabled: bool, mask: int = BIP320_VERSION_MASK) -> Dict[str, Any]:
+        """Version-rolling block the production miner reads from each template."""
+        return {
+            "enabled": bool(enabled),
+            "mask": f"{mask & BIP320_VERSION_MASK:08x}",
+        }
+
+    @staticmethod
+    def configured_version_rolling(config_path: Optional[Path] = None) -> bool:
+        """``dtm.version_rolling`` from config.json; off when unset or unreadable."""
+        try:
+            with open(config_path or BASE_DIR / "config.json", "r", encoding="utf-8") as handle:
+                config = json.load(handle)
+        except (OSError, ValueError):
+            return False
+        settings = config.get("dtm") if isinstance(config, dict) else None
+        return bool(settings.get("version_rolling", False)) if isinstance(settings, dict) else False
+
+    def set_version_rolling(
+        self, enabled: bool, template_data: Optional[Dict[str, Any]] = None, mask: int = BIP320_VERSION_MASK
+    ) -> Dict[str, Any]:
+        """Turn BIP320 version rolling on/off for one template, or as the default for new ones."""
+        settings = self._build_version_rolling_settings(enabled, mask)
+        if template_data is None:
+            self.version_rolling_enabled = bool(enabled)
+        else:
+            template_data["version_rolling"] = settings
+        return settings
+
     def _augment_template_with_consensus(self, template_data: Dict[str, Any]) -> Dict[str, Any]:
         """Attach consensus metadata without mutating original template."""
         template_copy = copy.deepcopy(template_data)
@@ -2114,6 +3790,8 @@ class GPSEnhancedDynamicTemplateManager:
         template_copy["target_leading_zeros"] = target_zeros
         template_copy["ultra_hex_consensus"] = self._build_ultra_hex_consensus(target_zeros)
         self.ultra_hex_consensus = template_copy["ultra_hex_consensus"]
+        # Per-template setting wins; otherwise apply the DTM default
+        template_copy.setdefault("version_rolling", self._build_version_rolling_settings(self.version_rolling_enabled))
         self.solution_targeting["target_leading_zeros"] = target_zeros
         return template_copy
 
@@ -3039,38 +4717,46 @@ class GPSEnhancedDynamicTemplateManager:
             traceback.print_exc()
             return False
 
-    def _append_to_ledger_file(self, file_path, entry):
+    def _append_to_ledger_file(self, file_path, entry, update_header=None, render_now=False):
         """
-        Append entry to ledger file (atomic operation)
+        Append entry to ledger file's JSON-lines segment store
 
         Args:
-            file_path: Path to ledger file
+            file_path: Path to ledger file (legacy shape via compact_ledger_file)
             entry: Dictionary entry to append
+            update_header: Optional callable(header, totals) refreshing the document header
+            render_now: Re-render the legacy file right away (e.g. for a found block)
         """
         try:
-            # Read existing data
-            if file_path.exists():
-                with open(file_path, "r") as f:
-                    data = json.load(f)
-            else:
-                data = {"entries": [], "created": current_timestamp()}
-
-            # Append new entry
-            data["entries"].append(entry)
-            data["last_updated"] = current_timestamp()
-            data["total_entries"] = len(data["entries"])
-
-            # Write back atomically
-            temp_path = file_path.with_suffix(".tmp")
-            with open(temp_path, "w") as f:
-                json.dump(data, f, indent=2)
-            temp_path.replace(file_path)
-
+            # O(1) JSON-lines append; the whole-file shape is re-rendered at most every
+            # COMPACT_INTERVAL per ledger, or at once when render_now or the file is missing
+            store = self._get_ledger_segment_store(file_path)
+            store.append(entry, update_header)
+            for ledger in list(self.ledger_segment_stores.values()):
+                if ledger is store and (render_now or not store.ledger_path.exists()):
+                    ledger.compact()
+                elif ledger.compaction_due():
+                    ledger.compact()
             return True
         except Exception as e:
             print(f"❌ Error appending to {file_path}: {e}")
             return False
 
+    def _get_ledger_segment_store(self, file_path) -> LedgerSegmentStore:
+        key = str(Path(file_path).resolve())
+        store = self.ledger_segment_stores.get(key)
+        if store is None:
+            store = self.ledger_segment_stores[key] = LedgerSegmentStore(file_path)
+        return store
+
+    def compact_ledger_file(self, file_path) -> Optional[Path]:
+        """Write the legacy {"entries": [...]} document for a segment-backed ledger."""
+        try:
+            return self._get_ledger_segment_store(file_path).compact()
+        except Exception as e:
+            print(f"❌ Error compacting {file_path}: {e}")
+            return None
+
     def get_dynamic_template_path(self, template_type="current"):
         """Get dynamic path for template files using Brain.QTL path management"""
         try:
@@ -3316,6 +5002,7 @@ class GPSEnhancedDynamicTemplateManager:
             # Track last processed template for hot swap helpers
             self.current_template = instruction.get("template") or template_data
             self.template_cache["last_processed"] = self.current_template
+            self.remember_validation_template(self.current_template)
 
             # Update performance stats with error handling
             try:
@@ -3346,6 +5033,44 @@ class GPSEnhancedDynamicTemplateManager:
                 "processing_time": 0
             })
 
+    def process_template_refresh(self, template_data: Dict) -> Dict:
+        """Process a template refresh, as a delta when only the mempool changed.
+
+        On the same ``previousblockhash`` the last instruction and GPS enhancement
+        are kept (they depend only on height, tip and bits) and the delta is applied
+        to the last processed template; a new tip goes through
+        ``process_mining_template``. The result also carries ``mode`` and ``delta``.
+        """
+        start_time = time.time()
+        last_result = self.template_cache.get("last_result")
+        delta = compute_template_delta(self.template_cache.get("last_raw"), template_data) if last_result else None
+        template = apply_template_delta(self.current_template, delta) if delta else None
+        if template is None:
+            result = self.process_mining_template(template_data)
+            if result.get("success"):
+                self.template_cache["last_raw"] = template_data
+                self.template_cache["last_result"] = result
+            return {**result, "mode": "full", "delta": None}
+
+        instruction = dict(last_result["instruction"], template=template, timestamp=current_timestamp())
+        self.current_template = template
+        self.template_cache["last_processed"] = template
+        self.template_cache["last_raw"] = template_data
+        self.remember_validation_template(template)
+        self.performance_stats["template_deltas_applied"] = self.performance_stats.get("template_deltas_applied", 0) + 1
+        if self.verbose:
+            print(
+                f"🔁 Template delta: -{len(delta['removed_txids'])} +{len(delta['added_transactions'])} txs, "
+                f"fields {sorted(delta['fields'])}"
+            )
+        return {
+            **last_result,
+            "instruction": instruction,
+            "processing_time": time.time() - start_time,
+            "mode": "delta",
+            "delta": delta,
+        }
+
     def coordinate_with_miner(self, miner_id: str, template_data: Dict) -> Dict:
         """Coordinate mining template with specific miner"""
         try:
@@ -3397,13 +5122,14 @@ class GPSEnhancedDynamicTemplateManager:
     # CONSENSUS VALIDATION SYSTEM
     # ═══════════════════════════════════════════════════════════════════
 
-    def validate_miner_solution(self, solution: Dict, template: Dict) -> Dict:
+    def validate_miner_solution(self, solution: Dict, template: Dict, target_int: Optional[int] = None) -> Dict:
         """
         Validate miner's solution against original template.
         
         Args:
             solution: Miner's proposed solution with nonce, hash, etc.
             template: Original mining template
+            target_int: Pre-parsed template target (see DTMValidationClient)
             
         Returns:
             {
@@ -3447,8 +5173,9 @@ class GPSEnhancedDynamicTemplateManager:
             # Check 3: Meets difficulty target
             try:
                 hash_int = int(provided_hash, 16)
-                target_hex = template.get("target", "f" * 64)
-                target_int = int(target_hex, 16)
+                if target_int is None:
+                    target_hex = template.get("target", "f" * 64)
+                    target_int = int(target_hex, 16)
                 
                 if hash_int >= target_int:
                     validation_result["valid"] = False
@@ -3747,6 +5474,82 @@ class GPSEnhancedDynamicTemplateManager:
             # Return original template if optimization fails
             return template_data
 
+    def create_template_prefetcher(
+        self, fetch, optimization_mode: str = "balanced", interval: Optional[float] = None
+    ) -> TemplatePrefetcher:
+        """Started prefetcher that runs ``fetch`` templates through ``get_optimized_template`` ahead of use."""
+        return TemplatePrefetcher(
+            fetch, lambda template: self.get_optimized_template(optimization_mode, template), interval
+        ).start()
+
+    def _get_shared_template_region(self) -> Optional[SharedTemplateRegion]:
+        """Shared-memory template region for this environment (None if unavailable)."""
+        if self.shared_template_region is None and self.shared_template_enabled:
+            try:
+                region = SharedTemplateRegion.create(SharedTemplateRegion.name_for(self._solution_intake_dir()))
+            except (OSError, ValueError) as e:
+                self.shared_template_enabled = False
+                if self.verbose:
+                    print(f"⚠️ Shared-memory templates unavailable, using per-miner copies: {e}")
+                return None
+            atexit.register(region.close)
+            self.shared_template_region = region
+        return self.shared_template_region
+
+    def _read_shared_template(self) -> Optional[Dict]:
+        """Template currently in the shared region, or None if absent or not a known document."""
+        if self.shared_template_region is None:
+            return None
+        try:
+            return self.shared_template_region.read_template(getattr(self, "current_template", None))
+        except (OSError, ValueError) as e:
+            if self.verbose:
+                print(f"⚠️ Shared template unreadable: {e}")
+            return None
+
+    def get_nonce_lease_scheduler(self, template: Optional[Dict] = None) -> NonceLeaseScheduler:
+        """Lease scheduler for ``template`` (default: the current one).
+
+        A new template starts a fresh map, and so does a miner that rolled its
+        extranonce past the current map's: the old nonce space is exhausted.
+        Miners still on an older extranonce get the current map and catch up.
+        """
+        template = template or self.current_template or {}
+        key = DTMValidationClient.template_key(template)
+        extranonce = int(template.get("extranonce") or 0)
+        with self.nonce_lease_lock:
+            scheduler = self.nonce_lease_scheduler
+            if scheduler is None or scheduler.template_key != key or scheduler.extranonce < extranonce:
+                priority_range = None
+                if template.get("height"):
+                    # The GPS window is handed out first, then the rest of the nonce space
+                    nonce_start, nonce_end, _, _ = calculate_gps_enhanced_nonce_range(template)
+                    priority_range = (nonce_start, nonce_end + 1)
+                scheduler = self.nonce_lease_scheduler = NonceLeaseScheduler(key, priority_range, extranonce=extranonce)
+            return scheduler
+
+    def acquire_nonce_lease(self, miner_id: str, template: Optional[Dict] = None) -> Optional[Dict]:
+        """Nonce sub-range for ``miner_id`` sized by its measured hash rate (None = space exhausted)."""
+        return self.get_nonce_lease_scheduler(template).acquire(miner_id)
+
+    def report_nonce_lease(self, lease_id: int, cursor: int, template: Optional[Dict] = None) -> Optional[int]:
+        """Progress report from a lease holder; returns the lease's current end or None to re-acquire."""
+        template = template or self.current_template or {}
+        scheduler = self.get_nonce_lease_scheduler(template)
+        if scheduler.extranonce != int(template.get("extranonce") or 0):
+            return None  # leased under an older extranonce; its lease ids mean nothing here
+        return scheduler.report(lease_id, cursor)
+
+    def _handle_nonce_lease_request(self, request: Dict) -> Dict:
+        """Intake socket handler: miners acquire and report leases for the template they mine."""
+        template = request.get("template") or None
+        if request["lease"] == "acquire":
+            scheduler = self.get_nonce_lease_scheduler(template)
+            return {"lease": scheduler.acquire(str(request["miner_id"])), "extranonce": scheduler.extranonce}
+        if request["lease"] == "report":
+            return {"end": self.report_nonce_lease(int(request["lease_id"]), int(request["cursor"]), template)}
+        raise ValueError(f"Unknown lease request {request['lease']!r}")
+
     def register_miner(self, process_id: str) -> queue.Queue:
         """🚀 RAM-BASED: Register a miner and get its template queue"""
         if process_id not in self.template_queues:
@@ -3765,6 +5568,9 @@ class GPSEnhancedDynamicTemplateManager:
         
         try:
             template = self.template_queues[process_id].get(timeout=timeout)
+            if isinstance(template, int):
+                # Queue carries the shared-memory generation - map the template from the region
+                template = self._read_shared_template()
             if self.verbose:
                 print(f"📥 Miner {process_id} retrieved template from RAM")
             return template
@@ -3787,6 +5593,20 @@ class GPSEnhancedDynamicTemplateManager:
             
             daemon_ids = [f"Process_{i:03d}" for i in range(1, daemon_count + 1)]
 
+            # Write the template once into shared memory; queues then only carry its generation
+            generation = None
+            region = self._get_shared_template_region()
+            if region is not None:
+                try:
+                    generation = region.publish(
+                        SharedTemplateRegion.template_document(template_data, template_id=template_id)
+                    )
+                except (TypeError, ValueError) as e:
+                    if self.verbose:
+                        print(f"⚠️ Shared-memory publish failed, sending per-miner copies: {e}")
+            # Solutions naming this generation resolve straight to the template
+            self.remember_validation_template(template_data, generation)
+
             # Send template to each miner's RAM queue
             success_count = 0
             for daemon_id in daemon_ids:
@@ -3797,7 +5617,9 @@ class GPSEnhancedDynamicTemplateManager:
                     
                     # Put template in RAM queue (non-blocking, replace if full)
                     try:
-                        self.template_queues[daemon_id].put_nowait(copy.deepcopy(template_data))
+                        self.template_queues[daemon_id].put_nowait(
+                            generation if generation is not None else copy.deepcopy(template_data)
+                        )
                         if self.verbose:
                             print(f"✅ Template sent to miner {daemon_id} via RAM")
                         success_count += 1
@@ -3805,7 +5627,9 @@ class GPSEnhancedDynamicTemplateManager:
                         # Replace old template with new one
                         try:
                             self.template_queues[daemon_id].get_nowait()
-                            self.template_queues[daemon_id].put_nowait(copy.deepcopy(template_data))
+                            self.template_queues[daemon_id].put_nowait(
+                                generation if generation is not None else copy.deepcopy(template_data)
+                            )
                             if self.verbose:
                                 print(f"✅ Template replaced for miner {daemon_id} via RAM")
                             success_count += 1
@@ -3914,6 +5738,9 @@ class GPSEnhancedDynamicTemplateManager:
                                             template_data = json.load(tf)
                                     except Exception:
                                         pass
+                                elif self.shared_template_region is not None:
+                                    # Template was broadcast through shared memory, not per-daemon files
+                                    template_data = self._read_shared_template() or {}
 
                                 # Validate solution matches template difficulty
                                 if template_data:
@@ -4063,13 +5890,17 @@ class GPSEnhancedDynamicTemplateManager:
                 "error": f"Validation failed: {e}"
             }
 
-    def _reconstruct_header_with_nonce(self, template: Dict, nonce: int) -> bytes:
-        """Reconstruct block header with a different nonce for testing natural-looking solutions"""
+    def _reconstruct_header_with_nonce(self, template: Dict, nonce: int, version: Optional[int] = None) -> bytes:
+        """Reconstruct block header with a different nonce for testing natural-looking solutions
+
+        ``version`` is the miner's BIP320-rolled version when version rolling was enabled.
+        """
         try:
             import struct
             
             # Extract template data
-            version = template.get("version", 536870912)
+            if version is None:
+                version = template.get("version", 536870912)
             prev_hash = template.get("previousblockhash", "")
             merkle_root = template.get("merkleroot", "0" * 64)
             timestamp = template.get("curtime", template.get("time", 0))
@@ -4097,6 +5928,236 @@ class GPSEnhancedDynamicTemplateManager:
                 print(f"⚠️  Could not reconstruct header: {e}")
             return None
 
+    def _batch_template_context(self, template: Dict) -> Dict[str, Any]:
+        """Header prefix and required zeros for ``template``, kept in a small LRU."""
+        key = DTMValidationClient.template_key(template) + (
+            template.get("version"), template.get("curtime", template.get("time")), template.get("bits")
+        )
+        context = self.batch_template_contexts.get(key)
+        if context is not None:
+            self.batch_template_contexts.move_to_end(key)
+            return context
+        header = self._reconstruct_header_with_nonce(template, 0)
+        context = {
+            "header_prefix": header[:76] if header else None,
+            "required_zeros": self.calculate_target_zeros(template.get("bits", "1d00ffff")),
+        }
+        self.batch_template_contexts[key] = context
+        while len(self.batch_template_contexts) > DTMValidationClient.TEMPLATE_CACHE_SIZE:
+            self.batch_template_contexts.popitem(last=False)
+        return context
+
+    def _template_target_int(self, template: Dict) -> int:
+        """Target a hash must be below: the template's ``target`` if present, else its ``bits``."""
+        template_target = template.get("target")
+        if template_target:
+            return int(str(template_target).replace("0x", ""), 16)
+        if template.get("bits"):
+            return self._bits_to_target(template["bits"])
+        return 2**224  # Default Bitcoin target
+
+    def remember_validation_template(self, template: Dict, generation: Optional[int] = None) -> Optional[Dict]:
+        """Add ``template`` to the recent-templates LRU and return its validation entry.
+
+        The entry holds the header prefix, target, required zeros and serialized
+        transaction section, and is indexed by template key, shared-region
+        generation, tip, header merkle root and block id for O(1) lookups.
+        """
+        if not isinstance(template, dict) or not template.get("previousblockhash"):
+            return None
+        key = DTMValidationClient.template_key(template)
+        entry = self.validation_templates.get(key)
+        if entry is None:
+            header = self._reconstruct_header_with_nonce(template, 0)
+            try:
+                target_int = self._template_target_int(template)
+            except (TypeError, ValueError):
+                target_int = None
+            raw_transactions = []
+            for tx in template.get("transactions") or []:
+                raw_hex = tx.get("data") if isinstance(tx, dict) else None
+                if isinstance(raw_hex, str):
+                    raw_transactions.append(raw_hex.lower())
+            entry = {
+                "key": key,
+                "template": template,
+                "header_prefix": header[:76] if header else None,
+                "target_int": target_int,
+                "required_zeros": self.calculate_target_zeros(template.get("bits", "1d00ffff")),
+                "transaction_count": len(template.get("transactions") or []),
+                "raw_transaction_count": len(raw_transactions),
+                "transaction_section_hex": "".join(raw_transactions),
+                "index_keys": [("tip", template["previousblockhash"])],
+            }
+            if template.get("merkleroot"):
+                entry["index_keys"].append(("merkle", template["previousblockhash"], template["merkleroot"]))
+            for field in ("template_id", "block_id"):
+                if template.get(field):
+                    entry["index_keys"].append(("id", template[field]))
+            self.validation_templates[key] = entry
+        else:
+            self.validation_templates.move_to_end(key)
+        if generation is not None:
+            entry["index_keys"].append(("generation", generation))
+        # Newest template wins shared keys such as the tip
+        for index_key in entry["index_keys"]:
+            self.validation_template_index[index_key] = key
+
+        while len(self.validation_templates) > DTMValidationClient.TEMPLATE_CACHE_SIZE:
+            _, evicted = self.validation_templates.popitem(last=False)
+            for index_key in evicted["index_keys"]:
+                if self.validation_template_index.get(index_key) == evicted["key"]:
+                    del self.validation_template_index[index_key]
+        return entry
+
+    def resolve_validation_template(self, solution: Dict, template: Optional[Dict] = None) -> Optional[Dict]:
+        """Validation entry for the template ``solution`` was mined on, falling back to ``template``.
+
+        Looks up, in order, the header's tip and merkle root, the shared-region
+        generation, the header's tip alone and the block id, so a solution that
+        arrives after a template swap is judged against its own template.
+        """
+        lookups = []
+        prev_hash = None
+        block_header = solution.get("block_header")
+        if isinstance(block_header, str) and len(block_header) == 160:
+            try:
+                header_bytes = bytes.fromhex(block_header)
+            except ValueError:
+                header_bytes = b""
+            if header_bytes:
+                prev_hash = header_bytes[4:36][::-1].hex()
+                lookups.append(("merkle", prev_hash, header_bytes[36:68][::-1].hex()))
+        if solution.get("template_generation") is not None:
+            lookups.append(("generation", solution["template_generation"]))
+        if prev_hash:
+            lookups.append(("tip", prev_hash))
+        for field in ("template_id", "block_id"):
+            if solution.get(field):
+                lookups.append(("id", solution[field]))
+
+        for lookup in lookups:
+            key = self.validation_template_index.get(lookup)
+            if key is not None:
+                self.validation_templates.move_to_end(key)
+                self.performance_stats["validation_template_hits"] = (
+                    self.performance_stats.get("validation_template_hits", 0) + 1
+                )
+                return self.validation_templates[key]
+        return self.remember_validation_template(template) if template else None
+
+    def _block_hex_from_validation_entry(self, entry: Dict, block_header: str) -> Optional[str]:
+        """Full block from a solution header and the entry's cached transaction section.
+
+        Only when the header commits to the template's own merkle root and coinbase
+        and every transaction has raw data; otherwise None (the caller rebuilds it).
+        """
+        template = entry["template"]
+        coinbase = template.get("coinbasetxn")
+        coinbase_hex = coinbase.get("data") if isinstance(coinbase, dict) else None
+        merkle_root = template.get("merkleroot")
+        if not coinbase_hex or not merkle_root or not isinstance(block_header, str) or len(block_header) != 160:
+            return None
+        if entry["raw_transaction_count"] != entry["transaction_count"]:
+            return None
+        try:
+            if bytes.fromhex(block_header[72:136])[::-1].hex() != merkle_root.lower():
+                return None
+        except ValueError:
+            return None
+        count = entry["transaction_count"] + 1
+        if count < 0xFD:
+            varint = struct.pack("<B", count)
+        elif count <= 0xFFFF:
+            varint = b"\xfd" + struct.pack("<H", count)
+        else:
+            varint = b"\xfe" + struct.pack("<I", count)
+        return block_header.lower() + varint.hex() + coinbase_hex.lower() + entry["transaction_section_hex"]
+
+    def _is_current_validation_entry(self, entry: Optional[Dict]) -> bool:
+        return entry is None or not self.current_template or (
+            entry["key"] == DTMValidationClient.template_key(self.current_template)
+        )
+
+    def _hash_header_buffer(self, headers: bytes, processes: Optional[int] = None,
+                            pool_threshold: Optional[int] = None) -> bytes:
+        count = len(headers) // 80
+        if count < (pool_threshold or self.BATCH_POOL_THRESHOLD):
+            return _double_sha256_headers(headers)
+        processes = max(1, min(processes or (os.cpu_count() or 1), count))
+        step = -(-count // processes) * 80
+        chunks = [headers[start:start + step] for start in range(0, len(headers), step)]
+        try:
+            with multiprocessing.get_context().Pool(len(chunks)) as pool:
+                return b"".join(pool.map(_double_sha256_headers, chunks))
+        except (OSError, RuntimeError) as e:
+            if self.verbose:
+                print(f"⚠️ Validation pool unavailable, hashing in-process: {e}")
+            return _double_sha256_headers(headers)
+
+    def validate_solutions_batch(self, solutions: List, template: Dict, processes: Optional[int] = None,
+                                 pool_threshold: Optional[int] = None) -> List[Dict]:
+        """
+        Verify many candidate solutions against one template in a single pass.
+
+        Each candidate's header comes from its ``block_header`` (hex or bytes), a
+        SolutionRecord, or the cached template prefix plus its nonce. All headers
+        are packed into one buffer and double-SHA256'd together, over a process
+        pool once the batch reaches BATCH_POOL_THRESHOLD. Verdicts are returned in
+        input order and use validate_and_format_solution's rule: real leading hex
+        zeros must reach what the template's bits require, and a claimed hash
+        must match the real one.
+        """
+        context = self._batch_template_context(template)
+        prefix = context["header_prefix"]
+        buffer = bytearray(80 * len(solutions))
+        verdicts = []
+        for index, candidate in enumerate(solutions):
+            verdict = {"index": index, "valid": False, "reason": None}
+            try:
+                if isinstance(candidate, SolutionRecord):
+                    header, claimed, nonce = candidate.header, candidate.digest.hex(), candidate.nonce
+                else:
+                    header = candidate.get("block_header")
+                    claimed = candidate.get("hash") or candidate.get("best_hash")
+                    nonce = candidate.get("nonce", candidate.get("best_nonce"))
+                    if header:
+                        header = bytes.fromhex(header) if isinstance(header, str) else bytes(header)
+                    elif prefix is not None and nonce is not None:
+                        header = bytearray(prefix + struct.pack("<I", nonce))
+                        if candidate.get("version") is not None:
+                            struct.pack_into("<I", header, 0, candidate["version"])
+                if nonce is None or not (0 <= int(nonce) <= 0xFFFFFFFF):
+                    verdict["reason"] = f"Nonce {nonce} out of valid range [0, 4294967295]"
+                elif header is None or len(header) != 80:
+                    verdict["reason"] = "No 80-byte block header to verify"
+                else:
+                    buffer[index * 80:(index + 1) * 80] = header
+                    verdict["nonce"] = int(nonce)
+                    verdict["claimed_hash"] = claimed
+            except (TypeError, ValueError, struct.error, AttributeError) as e:
+                verdict["reason"] = f"Malformed solution: {e}"
+            verdicts.append(verdict)
+
+        digests = self._hash_header_buffer(bytes(buffer), processes, pool_threshold)
+        required_zeros = context["required_zeros"]
+        for verdict in verdicts:
+            if verdict["reason"] is not None:
+                continue
+            index = verdict["index"]
+            real_hash_hex = digests[index * 32:(index + 1) * 32].hex()
+            real_leading_zeros = len(real_hash_hex) - len(real_hash_hex.lstrip("0"))
+            claimed = verdict.pop("claimed_hash")
+            verdict.update(hash=real_hash_hex, leading_zeros=real_leading_zeros, required_zeros=required_zeros)
+            if claimed and str(claimed).lower() != real_hash_hex:
+                verdict["reason"] = f"Hash mismatch: claimed {str(claimed)[:16]}..., header hashes to {real_hash_hex[:16]}..."
+            elif real_leading_zeros < required_zeros:
+                verdict["reason"] = f"Solution too weak: {real_leading_zeros} < {required_zeros} zeros"
+            else:
+                verdict["valid"] = True
+                verdict["reason"] = "All validation checks passed"
+        return verdicts
+
     def validate_and_format_solution(self, solution: Dict, template: Dict) -> Dict:
         """
         Validate miner's solution and format for Bitcoin submission.
@@ -4122,7 +6183,14 @@ class GPSEnhancedDynamicTemplateManager:
             # Mining result format vs submission format
             if not block_hex and not solution_hash:
                 return {"success": False, "error": "No block_hex or hash in solution"}
-            
+
+            # Judge the solution against the template it was mined on, even after a swap
+            entry = self.resolve_validation_template(solution, template)
+            if entry is not None:
+                template = entry["template"]
+                if not block_hex and block_header:
+                    block_hex = self._block_hex_from_validation_entry(entry, block_header)
+
             # If we have hash but no block_hex, construct it
             if not block_hex and solution_hash and nonce is not None:
                 if self.verbose:
@@ -4131,7 +6199,7 @@ class GPSEnhancedDynamicTemplateManager:
                 try:
                     from production_bitcoin_miner import ProductionBitcoinMiner
                     temp_miner = ProductionBitcoinMiner(demo_mode=self.demo_mode)
-                    header = temp_miner.construct_block_header(template, nonce)
+                    header = temp_miner.construct_block_header(template, nonce, version=solution.get("version"))
                     block_hex = temp_miner.construct_complete_block(header, nonce, template)
                     if self.verbose:
                         print(f"   ✅ Block constructed: {len(block_hex) if block_hex else 0} chars")
@@ -4170,7 +6238,7 @@ class GPSEnhancedDynamicTemplateManager:
 
             # Calculate template's required leading zeros
             template_bits = template.get("bits", "1d00ffff")
-            required_zeros = self.calculate_target_zeros(template_bits)
+            required_zeros = entry["required_zeros"] if entry is not None else self.calculate_target_zeros(template_bits)
             ultra_hex_consensus = self._build_ultra_hex_consensus(required_zeros)
             self.ultra_hex_consensus = ultra_hex_consensus
 
@@ -4212,7 +6280,7 @@ class GPSEnhancedDynamicTemplateManager:
                 for offset in range(1, max_search):
                     test_nonce = original_nonce + offset
                     # Reconstruct header with new nonce
-                    test_header = self._reconstruct_header_with_nonce(template, test_nonce)
+                    test_header = self._reconstruct_header_with_nonce(template, test_nonce, solution.get("version"))
                     if test_header:
                         test_hash = hashlib.sha256(hashlib.sha256(test_header).digest()).digest()
                         test_hash_hex = test_hash.hex()
@@ -4271,6 +6339,7 @@ class GPSEnhancedDynamicTemplateManager:
                 "target_leading_zeros": required_zeros,
                 "ultra_hex_consensus": ultra_hex_consensus,
                 "quality_multiplier": validation_result.get("quality_multiplier", 1),
+                "stale_template": not self._is_current_validation_entry(entry),
             }
 
             if self.verbose:
@@ -4328,8 +6397,8 @@ class GPSEnhancedDynamicTemplateManager:
             if self.verbose:
                 print(f"📥 Received template {template_id} from looping system")
 
-            # Process the template
-            processed_template = self.process_mining_template(template_data)
+            # Process the template (as a delta when only the mempool changed)
+            processed_template = self.process_template_refresh(template_data)
 
             # Extract the template with GPS data embedded
             template_to_save = processed_template.get("instruction", {}).get("template", template_data)
@@ -4755,7 +6824,7 @@ class GPSEnhancedDynamicTemplateManager:
     ) -> Dict[str, Any]:
         """Quickly process and broadcast a template to active miners."""
         identifier = generate_unique_block_id()
-        processed = self.process_mining_template(template_data)
+        processed = self.process_template_refresh(template_data)
 
         if isinstance(processed, dict) and not processed.get("success", True):
             return {
@@ -4869,41 +6938,120 @@ class GPSEnhancedDynamicTemplateManager:
             print(f"❌ Error during template cleanup: {e}")
 
 
+    def _solution_intake_dir(self) -> Path:
+        # 🎯 MODE-AWARE: the folder miners write to; the intake socket and shared region are named after it
+        return daemon_template_dir(self.demo_mode, getattr(self, "test_mode", False))
+
+    def _load_validation_template(self, temp_template_dir: Path):
+        # 🎯 ENSURE TEMPLATE IS LOADED: Load current template if not already set
+        if not self.current_template:
+            template_file = temp_template_dir / "current_template.json"
+            if template_file.exists():
+                try:
+                    with open(template_file, 'r') as f:
+                        self.current_template = json.load(f)
+                    self.remember_validation_template(self.current_template)
+                    if self.verbose:
+                        print(f"✅ Loaded template for validation: height {self.current_template.get('height')}")
+                except Exception as e:
+                    if self.verbose:
+                        print(f"⚠️ Could not load template: {e}")
+
+    def _get_processed_file_ledger(self, temp_template_dir: Path) -> ProcessedFileLedger:
+        if self.processed_file_ledger is None:
+            ledger_path = temp_template_dir / ".dtm_processed_files.json" if temp_template_dir.exists() else None
+            self.processed_file_ledger = ProcessedFileLedger(ledger_path)
+        return self.processed_file_ledger
+
+    def _process_solution_data(self, miner_id: str, solution_file, solution_data: Dict) -> Optional[Dict]:
+        """Validate one miner result and create its DTM files. Returns the solutions_found entry or None."""
+        if self.verbose:
+            print(f"🔍 Checking solution from {miner_id}: {Path(solution_file).name}")
+
+        # Validate solution against original template
+        if self.current_template:
+            validated_solution = self.validate_and_format_solution(
+                solution_data, self.current_template
+            )
+
+            if not validated_solution.get("success"):
+                if self.verbose:
+                    print(f"❌ Invalid solution from {miner_id}: {validated_solution.get('error', 'Unknown error')}")
+
+                # Give feedback to losing miner as per Pipeline flow.txt
+                self.provide_miner_feedback(miner_id, validated_solution.get('error', 'Solution validation failed'))
+                return None
+
+            if self.verbose:
+                print(f"✅ Valid solution found from {miner_id}")
+
+            # 🧮 PRESERVE mathematical_proof from original miner solution
+            validated_solution["mathematical_proof"] = solution_data.get("mathematical_proof", {})
+            validated_solution["difficulty"] = solution_data.get("difficulty", 0.0)
+            quality_score = self.calculate_solution_quality(validated_solution)
+        else:
+            # NO TEMPLATE: Process solution anyway (standalone mode)
+            if self.verbose:
+                print(f"✅ Processing solution without template validation from {miner_id}")
+
+            # Use solution data as-is
+            validated_solution = solution_data
+            quality_score = solution_data.get("leading_zeros", 0)
+
+        # Ledger, math proof and submission files per Pipeline flow.txt (written behind)
+        files_created = self._record_solution_files(validated_solution, miner_id)
+
+        return {
+            "miner_id": miner_id,
+            "solution_file": str(solution_file),
+            "solution": validated_solution,
+            "quality_score": quality_score,
+            "files_created": files_created,
+        }
+
+    @staticmethod
+    def _select_best_solution(solutions_found: List[Dict]) -> Optional[Dict]:
+        # Implement consensus mechanism for multiple solutions
+        if not solutions_found:
+            return None
+        # Always return a consistent dict format
+        if len(solutions_found) == 1:
+            # Single solution - wrap in success dict
+            return {
+                "success": True,
+                "solution": solutions_found[0]["solution"],
+                "miner_id": solutions_found[0]["miner_id"],
+                "leading_zeros": solutions_found[0]["solution"].get("leading_zeros", 0)
+            }
+        # Multiple solutions - return best one
+        best = max(solutions_found, key=lambda x: x.get("quality_score", 0))
+        return {
+            "success": True,
+            "solution": best["solution"],
+            "miner_id": best["miner_id"],
+            "leading_zeros": best["solution"].get("leading_zeros", 0),
+            "total_solutions_found": len(solutions_found)
+        }
+
     def check_miner_subfolders_for_solutions(self):
         """
         Automatically check temporary template subfolders for miner solutions.
         This implements the Pipeline flow.txt requirement for Dynamic Template Manager
         to check subfolders and validate solutions.
         
-        🚀 ENHANCED: Checks for instant notification signals first, then polls folders
+        🚀 ENHANCED: Checks for instant notification signals first, then polls folders.
+        Results already in the processed-file ledger are not parsed again.
         """
         try:
-            from pathlib import Path
-            import json
-            
-            # 🎯 MODE-AWARE: Use correct path based on demo mode
-            if self.demo_mode:
-                temp_template_dir = Path("Test/Demo/Temporary Template")
-            else:
-                temp_template_dir = Path("Mining/Temporary Template")
+            temp_template_dir = self._solution_intake_dir()
             
             if not temp_template_dir.exists():
                 if self.verbose:
                     print(f"⚠️ Temporary template directory not found: {temp_template_dir}")
                 return None
             
-            # 🎯 ENSURE TEMPLATE IS LOADED: Load current template if not already set
-            if not self.current_template:
-                template_file = temp_template_dir / "current_template.json"
-                if template_file.exists():
-                    try:
-                        with open(template_file, 'r') as f:
-                            self.current_template = json.load(f)
-                        if self.verbose:
-                            print(f"✅ Loaded template for validation: height {self.current_template.get('height')}")
-                    except Exception as e:
-                        if self.verbose:
-                            print(f"⚠️ Could not load template: {e}")
+            self._load_validation_template(temp_template_dir)
+            ledger = self._get_processed_file_ledger(temp_template_dir)
             
             # 🚀 INSTANT DETECTION: Check for signal files first
             signal_files = list(temp_template_dir.glob("dtm_notification_*.signal"))
@@ -4914,81 +7062,24 @@ class GPSEnhancedDynamicTemplateManager:
             
             # Look for process subfolders (both Process_ and process_)
             for subfolder in temp_template_dir.iterdir():
-                if subfolder.is_dir() and (subfolder.name.startswith("Process_") or subfolder.name.startswith("process_")):
+                if subfolder.is_dir() and SolutionIntake.is_process_folder(subfolder.name):
                     # Check ONLY for mining_result.json (not working_template.json!)
                     solution_file = subfolder / "mining_result.json"
-                    if solution_file.exists():
-                        try:
-                            with open(solution_file, 'r') as f:
-                                solution_data = json.load(f)
-                            
-                            if self.verbose:
-                                print(f"🔍 Checking solution from {subfolder.name}: {solution_file.name}")
-                            
-                            # Validate solution against original template
-                            if self.current_template:
-                                validated_solution = self.validate_and_format_solution(
-                                    solution_data, self.current_template
-                                )
-                                
-                                if validated_solution.get("success"):
-                                    if self.verbose:
-                                        print(f"✅ Valid solution found from {subfolder.name}")
-                                    
-                                    # 🧮 PRESERVE mathematical_proof from original miner solution
-                                    validated_solution["mathematical_proof"] = solution_data.get("mathematical_proof", {})
-                                    validated_solution["difficulty"] = solution_data.get("difficulty", 0.0)
-                                    
-                                    # Create ledger files as per Pipeline flow.txt
-                                    self._create_global_ledger_file(validated_solution, subfolder.name)
-                                    self._create_hourly_ledger_file(validated_solution, subfolder.name)
-                                    self._create_global_math_proof_file(validated_solution, subfolder.name)
-                                    self._create_hourly_math_proof_file(validated_solution, subfolder.name)
-                                    # Create block submission file (DTM creates this)
-                                    self._create_block_submission_file(validated_solution, subfolder.name)
-                                    # Create submission tracking files
-                                    self._create_global_submission_file(validated_solution, subfolder.name)
-                                    self._create_hourly_submission_file(validated_solution, subfolder.name)
-                                    
-                                    solutions_found.append({
-                                        "miner_id": subfolder.name,
-                                        "solution_file": str(solution_file),
-                                        "solution": validated_solution,
-                                        "quality_score": self.calculate_solution_quality(validated_solution)
-                                    })
-                                else:
-                                    if self.verbose:
-                                        print(f"❌ Invalid solution from {subfolder.name}: {validated_solution.get('error', 'Unknown error')}")
-                                    
-                                    # Give feedback to losing miner as per Pipeline flow.txt
-                                    self.provide_miner_feedback(subfolder.name, validated_solution.get('error', 'Solution validation failed'))
-                            else:
-                                # NO TEMPLATE: Process solution anyway (standalone mode)
-                                if self.verbose:
-                                    print(f"✅ Processing solution without template validation from {subfolder.name}")
-                                
-                                # Use solution data as-is
-                                # Create ledger files as per Pipeline flow.txt
-                                self._create_global_ledger_file(solution_data, subfolder.name)
-                                self._create_hourly_ledger_file(solution_data, subfolder.name)
-                                self._create_global_math_proof_file(solution_data, subfolder.name)
-                                self._create_hourly_math_proof_file(solution_data, subfolder.name)
-                                # Create block submission file (DTM creates this)
-                                self._create_block_submission_file(solution_data, subfolder.name)
-                                # Create submission tracking files
-                                self._create_global_submission_file(solution_data, subfolder.name)
-                                self._create_hourly_submission_file(solution_data, subfolder.name)
-                                
-                                solutions_found.append({
-                                    "miner_id": subfolder.name,
-                                    "solution_file": str(solution_file),
-                                    "solution": solution_data,
-                                    "quality_score": solution_data.get("leading_zeros", 0)
-                                })
-                            
-                        except (json.JSONDecodeError, IOError) as e:
-                            if self.verbose:
-                                print(f"⚠️ Could not read solution file {solution_file}: {e}")
+                    signature = ledger.signature(solution_file)
+                    if signature is None or ledger.is_processed(solution_file, signature):
+                        continue
+                    try:
+                        with open(solution_file, 'r') as f:
+                            solution_data = json.load(f)
+                    except (json.JSONDecodeError, IOError) as e:
+                        if self.verbose:
+                            print(f"⚠️ Could not read solution file {solution_file}: {e}")
+                        continue
+
+                    ledger.mark(solution_file, signature)
+                    entry = self._process_solution_data(subfolder.name, solution_file, solution_data)
+                    if entry:
+                        solutions_found.append(entry)
             
             # 🚀 CLEANUP: Remove signal files after processing
             for signal_file in signal_files:
@@ -5000,46 +7091,113 @@ class GPSEnhancedDynamicTemplateManager:
                     if self.verbose:
                         print(f"⚠️ Could not remove signal file {signal_file.name}: {e}")
             
-            # Implement consensus mechanism for multiple solutions
-            if len(solutions_found) > 0:
-                # Always return a consistent dict format
-                if len(solutions_found) == 1:
-                    # Single solution - wrap in success dict
-                    return {
-                        "success": True,
-                        "solution": solutions_found[0]["solution"],
-                        "miner_id": solutions_found[0]["miner_id"],
-                        "leading_zeros": solutions_found[0]["solution"].get("leading_zeros", 0)
-                    }
-                else:
-                    # Multiple solutions - return best one
-                    best = max(solutions_found, key=lambda x: x.get("quality_score", 0))
-                    return {
-                        "success": True,
-                        "solution": best["solution"],
-                        "miner_id": best["miner_id"],
-                        "leading_zeros": best["solution"].get("leading_zeros", 0),
-                        "total_solutions_found": len(solutions_found)
-                    }
-            else:
-                return None
+            return self._select_best_solution(solutions_found)
                 
         except Exception as e:
             if self.verbose:
                 print(f"❌ Error checking miner subfolders: {e}")
             return None
 
+    def process_solution_events(self, events: List[Dict]):
+        """Validate the results named by intake events; each file version is parsed once."""
+        try:
+            temp_template_dir = self._solution_intake_dir()
+            self._load_validation_template(temp_template_dir)
+            ledger = self._get_processed_file_ledger(temp_template_dir)
+
+            # Binary notices are verified together, before any JSON is parsed
+            record_events = [event for event in events if event.get("record") is not None]
+            record_verdicts = {}
+            if record_events and self.current_template:
+                verdicts = self.validate_solutions_batch([event["record"] for event in record_events], self.current_template)
+                record_verdicts = {id(event): verdict for event, verdict in zip(record_events, verdicts)}
+
+            solutions_found = []
+            for event in events:
+                path = event.get("path")
+                miner_id = event.get("miner_id") or (Path(path).parent.name if path else "unknown")
+                solution_data = event.get("solution")
+                record = event.get("record")
+
+                signature = ledger.signature(path) if path else None
+                if signature is not None and ledger.is_processed(path, signature):
+                    continue  # Same write already reported by the other source
+                verdict = record_verdicts.get(id(event))
+                if verdict is not None and not verdict["valid"]:
+                    if signature is not None:
+                        ledger.mark(path, signature)
+                    self.provide_miner_feedback(miner_id, verdict["reason"])
+                    continue
+                if solution_data is None:
+                    if signature is None:
+                        if record is None:
+                            continue
+                        solution_data = record.to_solution()  # result file is gone; the record is all we have
+                    else:
+                        try:
+                            with open(path, 'r') as f:
+                                solution_data = json.load(f)
+                        except (json.JSONDecodeError, IOError) as e:
+                            if self.verbose:
+                                print(f"⚠️ Could not read solution file {path}: {e}")
+                            continue
+
+                if signature is not None:
+                    ledger.mark(path, signature)
+                entry = self._process_solution_data(miner_id, path or "inline", solution_data)
+                if entry:
+                    solutions_found.append(entry)
+
+            return self._select_best_solution(solutions_found)
+
+        except Exception as e:
+            if self.verbose:
+                print(f"❌ Error processing solution events: {e}")
+            return None
+
+    def _start_solution_intake(self) -> Optional[SolutionIntake]:
+        """Start the socket/inotify intake; None means fall back to interval scans."""
+        if self.solution_intake is None:
+            intake = SolutionIntake(
+                self._solution_intake_dir(), SolutionIntake.address_for(self._solution_intake_dir())
+            )
+            intake.lease_handler = self._handle_nonce_lease_request
+            if not intake.start():
+                return None
+            self.solution_intake = intake
+            if self.verbose:
+                print(f"📡 Solution intake active: {' + '.join(intake.sources)}")
+        return self.solution_intake
 
     def _continuous_monitoring_loop(self):
         """
         Continuous monitoring loop that automatically checks miner subfolders.
         Implements Pipeline flow.txt automatic checking requirement.
+
+        With the solution intake running the thread sleeps until a miner notice or
+        inotify event arrives; interval scans remain the fallback.
         """
         if self.verbose:
             print("🔄 DTM Automatic Monitoring Loop: ACTIVE")
+
+        intake = self._start_solution_intake()
         
         while self.monitoring_enabled:
             try:
+                if intake is not None:
+                    events = intake.wait(self.monitoring_rescan_interval)
+                    if not self.monitoring_enabled:
+                        break
+                    # Timeout without events: cheap safety rescan (ledger skips parsed files)
+                    valid_solution = (
+                        self.process_solution_events(events) if events else self.check_miner_subfolders_for_solutions()
+                    )
+                    if valid_solution:
+                        if self.verbose:
+                            print("🎉 VALID SOLUTION FOUND BY AUTOMATIC MONITORING!")
+                        self._notify_looping_of_valid_solution(valid_solution)
+                    continue
+
                 current_time_val = time.time()
                 
                 # Throttle monitoring to avoid excessive checking
@@ -5106,7 +7264,8 @@ class GPSEnhancedDynamicTemplateManager:
                                     # STEP 1: Create/update ALL required files per Pipeline flow.txt
                                     # "the Dynamic Template manger will create/ update the Global Ledger file, 
                                     # Global Math proof file, hourly ledger file, hourly math proof file"
-                                    files_created = self._create_all_dtm_files(validated_solution, subfolder.name)
+                                    # (one durable record now; the files follow in the background)
+                                    files_created = self._record_solution_files(validated_solution, subfolder.name)
                                     
                                     if files_created:
                                         # STEP 2: ONLY AFTER files created, tell Looping
@@ -5164,6 +7323,11 @@ class GPSEnhancedDynamicTemplateManager:
             if missing_fields:
                 return {"success": False, "error": f"Missing required fields: {missing_fields}"}
             
+            # Resolve the template the solution was mined on (recent templates are cached)
+            entry = self.resolve_validation_template(solution_data, original_template)
+            if entry is not None:
+                original_template = entry["template"]
+
             # Phase 2: Extract Solution Data
             block_header_hex = solution_data.get('block_header', '')
             nonce = solution_data.get('nonce', 0)
@@ -5248,7 +7412,9 @@ class GPSEnhancedDynamicTemplateManager:
                 hash_int = int(recreated_hash, 16)
                 
                 # Use template target if available, otherwise derive from bits
-                if template_target:
+                if entry is not None and entry["target_int"] is not None:
+                    target_int = entry["target_int"]
+                elif template_target:
                     target_int = int(template_target.replace('0x', ''), 16)
                 elif template_bits:
                     # Convert bits to target (Bitcoin difficulty calculation)
@@ -5276,6 +7442,7 @@ class GPSEnhancedDynamicTemplateManager:
                     "hash_meets_target": True,
                     "validation_method": "comprehensive_bitcoin_validation",
                     "block_structure_valid": True,
+                    "stale_template": not self._is_current_validation_entry(entry),
                     "header_fields": {
                         "version": header_version,
                         "previous_hash": header_prev_hash,
@@ -5339,6 +7506,13 @@ class GPSEnhancedDynamicTemplateManager:
             # 4. Hourly math proof file
             hourly_math_proof_file = self._create_hourly_math_proof_file(validated_solution, miner_id)
             files_created['hourly_math_proof'] = hourly_math_proof_file
+
+            # 5. Block submission file (DTM creates this)
+            files_created['block_submission'] = self._create_block_submission_file(validated_solution, miner_id)
+
+            # 6-7. Global and hourly submission tracking files
+            files_created['global_submission'] = self._create_global_submission_file(validated_solution, miner_id)
+            files_created['hourly_submission'] = self._create_hourly_submission_file(validated_solution, miner_id)
             
             if self.verbose:
                 print("✅ ALL DTM FILES CREATED per Pipeline flow.txt:")
@@ -5353,6 +7527,27 @@ class GPSEnhancedDynamicTemplateManager:
             return None
 
 
+    def _get_solution_file_writer(self) -> Optional[SolutionFileWriter]:
+        """Write-behind writer for the per-solution DTM files (None if its folder is missing)."""
+        if self.solution_file_writer is None:
+            directory = self._solution_intake_dir()
+            if not directory.exists():
+                return None
+            # One writer per journal for the whole process, however many DTMs are created
+            self.solution_file_writer = get_solution_file_writer(directory, self._create_all_dtm_files)
+        return self.solution_file_writer
+
+    def _record_solution_files(self, validated_solution, miner_id):
+        """Durably record a validated solution and queue its DTM files; returns where the record lives.
+
+        Without a writer folder the files are created inline, as before.
+        """
+        writer = self._get_solution_file_writer()
+        if writer is None:
+            return self._create_all_dtm_files(validated_solution, miner_id)
+        offset = writer.submit(validated_solution, miner_id)
+        return {"solution_journal": str(writer.journal.path), "journal_offset": offset}
+
     def _create_global_ledger_file(self, solution, miner_id):
         """
         Create/update Global Ledger - ADAPTS to System_File_Examples template.
@@ -5362,21 +7557,14 @@ class GPSEnhancedDynamicTemplateManager:
             ledger_dir = self._get_ledger_path()
             global_ledger_file = ledger_dir / "global_ledger.json"
             
-            # Load existing or create from Brainstem-generated template
-            if global_ledger_file.exists():
-                try:
-                    with open(global_ledger_file, 'r') as f:
-                        ledger_data = json.load(f)
-                except json.JSONDecodeError as e:
-                    print(f"Warning: Corrupted ledger {global_ledger_file}: {e}. Using template.")
-                    ledger_data = load_template_from_examples('global_ledger', 'DTM')
-                except (FileNotFoundError, PermissionError) as e:
-                    print(f"Warning: Cannot read {global_ledger_file}: {e}. Using template.")
-                    ledger_data = load_template_from_examples('global_ledger', 'DTM')
-            else:
+            # Entries live in the segment store (an existing whole-file ledger is imported
+            # on first open); only a brand-new ledger starts from the Brainstem template
+            store = self._get_ledger_segment_store(global_ledger_file)
+            ledger_data = store.header
+            if not ledger_data:
                 ledger_data = load_template_from_examples('global_ledger', 'DTM')
                 # RESET ALL COUNTS TO ZERO (clear fake template data)
-                ledger_data['entries'] = []
+                ledger_data.pop('entries', None)
                 ledger_data['total_hashes'] = 0
                 ledger_data['total_blocks_found'] = 0
                 ledger_data['total_attempts'] = 0
@@ -5399,7 +7587,7 @@ class GPSEnhancedDynamicTemplateManager:
                     ledger_data['system_status']['issues'] = []
             
             # Get template entry structure to adapt to
-            template_entry = ledger_data.get("entries", [{}])[0] if ledger_data.get("entries") else {}
+            template_entry = store.first_entry() or {}
             
             # Build entry adapting to template structure
             new_entry = {}
@@ -5474,28 +7662,27 @@ class GPSEnhancedDynamicTemplateManager:
             if "difficulty_target" in template_entry:
                 new_entry["difficulty_target"] = solution.get("target", "")
             
-            # Add entry
-            ledger_data["entries"].append(new_entry)
-            
-            # Update metadata if it exists
-            if "metadata" in ledger_data:
-                ledger_data["metadata"]["last_updated"] = current_timestamp()
-            
-            # Update statistics if they exist
-            if "total_attempts" in ledger_data:
-                ledger_data["total_attempts"] = len(ledger_data["entries"])
-            if "total_hashes" in ledger_data:
-                ledger_data["total_hashes"] = sum(e.get("hashes_tried", 0) for e in ledger_data["entries"])
-            if "total_blocks_found" in ledger_data:
-                ledger_data["total_blocks_found"] = sum(1 for e in ledger_data["entries"] if e.get("meets_difficulty"))
-            
-            # NEW: Update computational_hours
-            if "computational_hours" in ledger_data:
-                total_seconds = sum(e.get("time_to_solution_seconds", 0) for e in ledger_data["entries"])
-                ledger_data["computational_hours"] = round(total_seconds / 3600.0, 2)
-            
-            # Write using Brain hierarchical system
-            defensive_write_json(str(global_ledger_file), ledger_data, "DTM")
+            def refresh_header(header, totals):
+                if not header:
+                    header.update(ledger_data)
+                # Update metadata if it exists
+                if "metadata" in header:
+                    header["metadata"]["last_updated"] = current_timestamp()
+                # Update statistics if they exist, from the store's running totals
+                if "total_attempts" in header:
+                    header["total_attempts"] = totals["entries"]
+                if "total_hashes" in header:
+                    header["total_hashes"] = totals["hashes_tried"]
+                if "total_blocks_found" in header:
+                    header["total_blocks_found"] = totals["meets_difficulty"]
+                # NEW: Update computational_hours
+                if "computational_hours" in header:
+                    header["computational_hours"] = round(totals["time_to_solution_seconds"] / 3600.0, 2)
+            
+            # Append entry; a found block is rendered into global_ledger.json at once for Looping
+            if not self._append_to_ledger_file(global_ledger_file, new_entry, refresh_header,
+                                               render_now=bool(new_entry.get("meets_difficulty"))):
+                return None
             
             # Use Brain hierarchical write for all time levels
             if HAS_BRAIN_FILE_SYSTEM:
@@ -5685,21 +7872,13 @@ class GPSEnhancedDynamicTemplateManager:
             
             hourly_ledger_file = hourly_dir / "hourly_ledger.json"
             
-            # Read existing or initialize from template
-            hourly_data = None
-            if hourly_ledger_file.exists() and hourly_ledger_file.stat().st_size > 0:
-                try:
-                    with open(hourly_ledger_file, 'r') as f:
-                        hourly_data = json.load(f)
-                except (json.JSONDecodeError, ValueError) as e:
-                    if self.verbose:
-                        print(f"⚠️ Corrupted hourly ledger, recreating: {e}")
-                    hourly_data = None
-            
-            if hourly_data is None:
+            # Entries live in the segment store; a new hour starts from the template header
+            store = self._get_ledger_segment_store(hourly_ledger_file)
+            hourly_data = store.header
+            if not hourly_data:
                 # Load structure from System_File_Examples
                 hourly_data = load_file_template_from_examples('hourly_ledger')
-                hourly_data['entries'] = []  # Clear example data
+                hourly_data.pop('entries', None)  # Clear example data
                 hourly_data['hour'] = f"{year}-{month}-{day}_{hour}"
             
             # Get real system info
@@ -5731,14 +7910,17 @@ class GPSEnhancedDynamicTemplateManager:
                 "status": "mined" if solution.get("meets_difficulty") else "mining"
             }
             
-            hourly_data["entries"].append(hourly_entry)
-            hourly_data["metadata"]["last_updated"] = current_timestamp()
-            hourly_data["hashes_this_hour"] = sum(e.get("hashes_tried", 0) for e in hourly_data["entries"])
-            hourly_data["attempts_this_hour"] = len(hourly_data["entries"])
-            hourly_data["blocks_found"] = sum(1 for e in hourly_data["entries"] if e.get("meets_difficulty"))
+            def refresh_header(header, totals):
+                if not header:
+                    header.update(hourly_data)
+                header.setdefault("metadata", {})["last_updated"] = current_timestamp()
+                header["hashes_this_hour"] = totals["hashes_tried"]
+                header["attempts_this_hour"] = totals["entries"]
+                header["blocks_found"] = totals["meets_difficulty"]
             
-            with open(hourly_ledger_file, 'w') as f:
-                json.dump(hourly_data, f, indent=2)
+            if not self._append_to_ledger_file(hourly_ledger_file, hourly_entry, refresh_header,
+                                               render_now=bool(hourly_entry["meets_difficulty"])):
+                return None
             
             return str(hourly_ledger_file)
             
@@ -6305,8 +8487,11 @@ class GPSEnhancedDynamicTemplateManager:
 
     def _notify_looping_of_valid_solution(self, solution_package):
         """
-        PIPELINE FLOW.TXT COMPLIANCE: Notify Looping AFTER all files created.
+        PIPELINE FLOW.TXT COMPLIANCE: Notify Looping once the solution is durably recorded.
         'The Dynamic template manger tells the looping we have a solution and gives the solution to the looping file'
+
+        The ledger/proof/submission files may still be materialising in the
+        background (``files_created`` then names the solution journal record).
         """
         try:
             # Create solution notification file for Looping to pick up
@@ -6314,27 +8499,28 @@ class GPSEnhancedDynamicTemplateManager:
             if not validate_folder_exists_dtm(str(looping_dir), "DTM-looping-notifications"):
                 raise FileNotFoundError(f"Looping notifications directory not found: {looping_dir}. Brain.QTL canonical authority via Brainstem should create this folder structure.")
             
-            timestamp = int(time.time())
-            notification_file = looping_dir / f"valid_solution_{timestamp}.json"
-            
+            files_created = solution_package.get("files_created") or {}
             notification_data = {
                 "timestamp": current_timestamp(),
                 "notification_type": "valid_solution_found",
                 "miner_id": solution_package["miner_id"],
                 "solution": solution_package["solution"],
-                "files_created": solution_package["files_created"],
-                "dtm_status": "all_files_created_and_validated",
+                "files_created": files_created,
+                "dtm_status": (
+                    "validated_files_writing" if "journal_offset" in files_created else "all_files_created_and_validated"
+                ),
                 "ready_for_submission": True,
                 "created_by": "DTM_AutomaticMonitoring_TestingNode"
             }
             
-            with open(notification_file, 'w') as f:
-                json.dump(notification_data, f, indent=2)
+            # One durable record per event instead of one file per event
+            journal = NotificationJournal(looping_dir)
+            journal.append(notification_data)
             
             if self.verbose:
                 print("🎉 PIPELINE FLOW.TXT COMPLIANCE COMPLETE!")
-                print(f"   ✅ All DTM files created FIRST")
-                print(f"   📨 Looping notified AFTER: {notification_file}")
+                print(f"   ✅ Solution recorded: {notification_data['dtm_status']}")
+                print(f"   📨 Looping notified: {journal.path}")
                 print("   🔄 DTM → Looping handoff per specification")
                 
         except Exception as e:
@@ -6489,6 +8675,9 @@ def main():
     def stop_automatic_monitoring(self):
         """Stop automatic subfolder monitoring."""
         self.monitoring_enabled = False
+        if self.solution_intake is not None:
+            self.solution_intake.close()  # wakes the monitoring thread
+            self.solution_intake = None
         if hasattr(self, 'monitoring_thread') and self.monitoring_thread and self.monitoring_thread.is_alive():
             if self.verbose:
                 print("🛑 Stopping automatic subfolder monitoring")
@@ -10,23 +10,34 @@ Optimized for Real Bitcoin Network Mining
 # ⚡ MAXIMUM PERFORMANCE MODE ACTIVATED
 # 🎯 PUSHED TO ABSOLUTE LIMITS
 
+import atexit
 import base64
 import contextlib
+import copy
 import gc
 import io
 import hashlib
 import json
 import logging
+import multiprocessing
 import os
+import queue
 import sys
 import random
+import re
 import signal
 import struct
+import tempfile
 import threading
 import time
 import urllib.error
 import urllib.request
+from array import array
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime
+from itertools import chain, islice
+from multiprocessing.connection import Client, Listener
 from pathlib import Path
 from typing import Optional
 
@@ -290,7 +301,883 @@ def normalized_path(path_str: str) -> Path:
     return Path(normalize_path_str(path_str))
 
 
+_NONCE_STRUCT = struct.Struct("<I")
+
+
+class MidstateHeaderKernel:
+    """Per-template double SHA-256 kernel for the mining hot loop.
+
+    The 76-byte header prefix (version, prev hash, merkle root, time, bits) is
+    fixed for a template, so the SHA-256 state after the first 64-byte block is
+    taken once and ``.copy()``-ed for every nonce. Only the last 16 bytes
+    (merkle tail, time, bits, nonce) are rewritten in a preallocated buffer.
+    """
+
+    __slots__ = ("prefix", "midstate", "tail")
+
+    def __init__(self, header_prefix: bytes):
+        if len(header_prefix) != 76:
+            raise ValueError(f"header prefix must be 76 bytes, got {len(header_prefix)}")
+        self.prefix = bytes(header_prefix)
+        self.midstate = hashlib.sha256(self.prefix[:64])
+        self.tail = bytearray(self.prefix[64:]) + bytearray(4)
+
+    @property
+    def version(self) -> int:
+        return _NONCE_STRUCT.unpack_from(self.prefix, 0)[0]
+
+    def with_version(self, version: int) -> "MidstateHeaderKernel":
+        """Kernel for the same template with a rolled block version (new midstate)."""
+        return MidstateHeaderKernel(_NONCE_STRUCT.pack(version) + self.prefix[4:])
+
+    def header(self, nonce: int) -> bytes:
+        """Full 80-byte header for ``nonce`` (cold path: submissions/reports)."""
+        return self.prefix + _NONCE_STRUCT.pack(nonce)
+
+    def hash_nonce(self, nonce: int) -> bytes:
+        """Double SHA-256 of the header for ``nonce``, identical to hashing ``header(nonce)``."""
+        tail = self.tail
+        _NONCE_STRUCT.pack_into(tail, 12, nonce)
+        inner = self.midstate.copy()
+        inner.update(tail)
+        return hashlib.sha256(inner.digest()).digest()
+
+
+NONCE_SPACE = 2**32
+NONCE_CHUNK_SIZE = 16384
+
+
+def iter_nonce_chunks(nonces, chunk_size=NONCE_CHUNK_SIZE):
+    """Group a lazy nonce stream into compact ``array('I')`` blocks.
+
+    The nonce strategies are generators, so mine_block starts hashing after the
+    first block instead of after a full 350k-1M element list is built.
+    """
+    nonces = iter(nonces)
+    while True:
+        chunk = array("I", islice(nonces, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class NonceCoverageIndex:
+    """Roaring-style set of the nonces already hashed for one 76-byte header prefix.
+
+    The prefix pins (template, version, extranonce), so membership means the
+    exact header was hashed before. The nonce space is split on the high 16 bits;
+    each container is a sorted ``array('H')`` of low halves until it reaches
+    ARRAY_LIMIT entries, then an 8 KiB bitmap.
+    """
+
+    ARRAY_LIMIT = 4096
+
+    __slots__ = ("containers", "count")
+
+    def __init__(self):
+        self.containers = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, nonce):
+        container = self.containers.get(nonce >> 16)
+        if container is None:
+            return False
+        low = nonce & 0xFFFF
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] & (1 << (low & 7)))
+        pos = bisect_left(container, low)
+        return pos < len(container) and container[pos] == low
+
+    def add(self, nonce) -> bool:
+        """Record ``nonce``; False if it was already covered (caller should skip hashing)."""
+        high = nonce >> 16
+        low = nonce & 0xFFFF
+        container = self.containers.get(high)
+        if container is None:
+            self.containers[high] = array("H", (low,))
+        elif isinstance(container, bytearray):
+            bit = 1 << (low & 7)
+            if container[low >> 3] & bit:
+                return False
+            container[low >> 3] |= bit
+        else:
+            pos = bisect_left(container, low)
+            if pos < len(container) and container[pos] == low:
+                return False
+            if len(container) < self.ARRAY_LIMIT:
+                container.insert(pos, low)
+            else:
+                bitmap = bytearray(8192)
+                for value in container:
+                    bitmap[value >> 3] |= 1 << (value & 7)
+                bitmap[low >> 3] |= 1 << (low & 7)
+                self.containers[high] = bitmap
+        self.count += 1
+        return True
+
+    @property
+    def coverage_percent(self) -> float:
+        return self.count * 100.0 / NONCE_SPACE
+
+
+def _mining_worker_main(worker_index, header_prefix, target, nonce_start, nonce_end,
+                        event_queue, stop_event, batch_size=65536):
+    """Worker process body for MiningWorkerPool: sweep [nonce_start, nonce_end) on one core.
+
+    Events sent back over ``event_queue`` are plain tuples:
+        ("best", worker_index, nonce, hash_bytes)      - new best hash for this shard
+        ("solution", worker_index, nonce, hash_bytes)  - hash < target
+        ("progress", worker_index, hashes_done)        - once per batch
+        ("done", worker_index, hashes_done)            - shard exhausted or stopped
+    """
+    kernel = MidstateHeaderKernel(header_prefix)
+    hash_nonce = kernel.hash_nonce
+    target_bytes = min(target, 2**256 - 1).to_bytes(32, "big")
+    best = b"\xff" * 32
+    hashes_done = 0
+
+    try:
+        for batch_start in range(nonce_start, nonce_end, batch_size):
+            if stop_event.is_set():
+                break
+            batch_end = min(batch_start + batch_size, nonce_end)
+            for nonce in range(batch_start, batch_end):
+                digest = hash_nonce(nonce)
+                # Same ordering as int.from_bytes(digest, "big") used throughout the miner
+                if digest < target_bytes:
+                    # Every hit is reported, not only those that also beat the shard's best
+                    event_queue.put(("solution", worker_index, nonce, digest))
+                if digest < best:
+                    best = digest
+                    event_queue.put(("best", worker_index, nonce, digest))
+            hashes_done += batch_end - batch_start
+            event_queue.put(("progress", worker_index, hashes_done))
+    finally:
+        event_queue.put(("done", worker_index, hashes_done))
+
+
+class MiningWorkerPool:
+    """Shard the 2^32 nonce space of one template across N worker processes.
+
+    Each worker owns a disjoint, contiguous nonce range and hashes it with a
+    MidstateHeaderKernel, so throughput scales with cores instead of being
+    capped by the GIL of a single mining thread. Workers only report back
+    best-hash / solution / progress tuples over a multiprocessing queue.
+    """
+
+    def __init__(self, header_prefix: bytes, target: int, processes: int | None = None,
+                 hardware_config: dict | None = None, nonce_start: int = 0,
+                 nonce_end: int = NONCE_SPACE):
+        self.header_prefix = bytes(header_prefix)
+        self.target = target
+        self.processes = processes or self.resolve_process_count(hardware_config)
+        self.shards = self.shard_nonce_space(self.processes, nonce_start, nonce_end)
+        self._ctx = multiprocessing.get_context()
+        self.event_queue = None
+        self.stop_event = None
+        self.workers = []
+        self.hashes_by_worker = {}
+        self.best_nonce = None
+        self.best_hash = None
+        self.solutions = []
+        self.started_at = None
+
+    @staticmethod
+    def resolve_process_count(hardware_config: dict | None = None) -> int:
+        """Worker count from config.json ``hardware.miner_processes`` / ``cpu_cores_reserved``."""
+        hardware_config = hardware_config or {}
+        requested = hardware_config.get("miner_processes", "auto")
+        if isinstance(requested, int) and requested > 0:
+            return requested
+        if isinstance(requested, str) and requested.isdigit() and int(requested) > 0:
+            return int(requested)
+
+        try:
+            reserved = int(hardware_config.get("cpu_cores_reserved", 0))
+        except (TypeError, ValueError):
+            reserved = 0
+        return max(1, (os.cpu_count() or 1) - max(0, reserved))
+
+    @staticmethod
+    def shard_nonce_space(processes: int, nonce_start: int = 0, nonce_end: int = NONCE_SPACE) -> list:
+        """Split [nonce_start, nonce_end) into ``processes`` disjoint contiguous (start, end) ranges."""
+        processes = max(1, processes)
+        span = max(0, nonce_end - nonce_start)
+        shard_size, remainder = divmod(span, processes)
+        shards = []
+        cursor = nonce_start
+        for index in range(processes):
+            size = shard_size + (1 if index < remainder else 0)
+            shards.append((cursor, cursor + size))
+            cursor += size
+        return shards
+
+    @property
+    def total_hashes(self) -> int:
+        return sum(self.hashes_by_worker.values())
+
+    @property
+    def hash_rate(self) -> float:
+        if not self.started_at:
+            return 0.0
+        elapsed = time.time() - self.started_at
+        return self.total_hashes / elapsed if elapsed > 0 else 0.0
+
+    def is_alive(self) -> bool:
+        return any(worker.is_alive() for worker in self.workers)
+
+    def start(self):
+        if self.workers:
+            return self
+        self.event_queue = self._ctx.Queue()
+        self.stop_event = self._ctx.Event()
+        self.started_at = time.time()
+        for index, (start, end) in enumerate(self.shards):
+            worker = self._ctx.Process(
+                target=_mining_worker_main,
+                args=(index, self.header_prefix, self.target, start, end, self.event_queue, self.stop_event),
+                name=f"MiningWorker-{index}",
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+            self.hashes_by_worker[index] = 0
+        return self
+
+    def poll(self, timeout: float = 0.5) -> list:
+        """Drain pending worker events, updating pool-wide best/solution/progress state."""
+        events = []
+        if self.event_queue is None:
+            return events
+        try:
+            events.append(self.event_queue.get(timeout=timeout))
+            while True:
+                events.append(self.event_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        for event in events:
+            kind, worker_index = event[0], event[1]
+            if kind == "best":
+                if self.best_hash is None or event[3] < self.best_hash:
+                    self.best_nonce, self.best_hash = event[2], event[3]
+            elif kind == "solution":
+                self.solutions.append({"worker": worker_index, "nonce": event[2], "hash": event[3]})
+            elif kind in ("progress", "done"):
+                self.hashes_by_worker[worker_index] = event[2]
+        return events
+
+    def stop(self, timeout: float = 5.0):
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join(1)
+        # Collect final progress counters so total_hashes is accurate
+        self.poll(timeout=0.05)
+        self.workers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class HashVerdict:
+    """Everything the mining loop needs about one hash, derived once from its raw bytes.
+
+    ``bits`` is the leading zero BIT count (what count_leading_zeros returns for the
+    hex string), ``hex_zeros`` the whole zero hex digits, ``ultra_hex_bucket`` the
+    64-per-bucket Ultra Hex digit and ``meets_target`` the hash < target check.
+    The hex string is only materialised when ``hex`` is read.
+    """
+
+    __slots__ = ("digest", "value", "bits", "hex_zeros", "ultra_hex_bucket", "meets_target", "_hex")
+
+    def __init__(self, hash_result, target):
+        if isinstance(hash_result, str):
+            # Ultra Hex string results carry their own width
+            self.digest = None
+            self._hex = hash_result
+            self.value = int(hash_result, 16)
+            width = len(hash_result) * 4
+        else:
+            self.digest = hash_result
+            self._hex = None
+            self.value = int.from_bytes(hash_result, "big")
+            width = len(hash_result) * 8
+        self.bits = width - self.value.bit_length()
+        self.hex_zeros = self.bits >> 2
+        self.ultra_hex_bucket = min(256, self.bits // 64 + 1)
+        self.meets_target = self.value < target
+
+    @property
+    def hex(self) -> str:
+        if self._hex is None:
+            self._hex = self.digest.hex()
+        return self._hex
+
+    @property
+    def binary_zeros(self) -> int:
+        """Leading zero bits of the value as a 256-bit integer (count_leading_zero_bits)."""
+        return 256 - self.value.bit_length()
+
+
+UNIVERSE_GALAXY_BASE = 208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_MASK_256 = (1 << 256) - 1
+DUAL_KNUTH_CATEGORIES = ("entropy", "decryption", "near_solution", "math_problems", "math_paradoxes")
+
+
+class DualKnuthPlan:
+    """Precompiled Knuth parameters for the per-hash enhancement path.
+
+    Everything in ``mathematically_enhanced_hash_calculation`` and the dual-Knuth
+    categories that does not depend on the nonce (parsed K(base,levels,iterations)
+    strings, products of the 111-digit BitLoad, bias masks) is computed once here.
+    Per nonce only small multiplies, XORs and masks remain, with identical results.
+    """
+
+    __slots__ = (
+        "collective_levels",
+        "collective_iterations",
+        "knuth_power",
+        "bias_low64",
+        "target_zeros",
+        "magnitude_reduction",
+        "knuth_notation",
+        "concurrent_mathematical_power",
+        "quintillion_factor",
+        "galaxy_pattern",
+        "knuth_amplifier_coefficient",
+        "category_params",
+        "category_coefficients",
+        "collective_pattern_coefficient",
+    )
+
+    def __init__(self, collective_levels, collective_iterations, bitload, category_knuth, multipliers=None):
+        """``category_knuth`` maps category -> (base K(...) string, modifier K(...) string)."""
+        multipliers = multipliers or {}
+        self.collective_levels = collective_levels
+        self.collective_iterations = collective_iterations
+
+        # mathematically_enhanced_hash_calculation
+        self.knuth_power = (UNIVERSE_GALAXY_BASE * collective_levels * collective_iterations) % (2**256)
+        self.bias_low64 = self.knuth_power & _MASK_64
+        zero_bias_factor = collective_iterations // 1000
+        self.target_zeros = min(20 + (zero_bias_factor % 44), 63)
+        self.magnitude_reduction = 2 ** (self.target_zeros * 4)
+        self.knuth_notation = f"K({UNIVERSE_GALAXY_BASE},{collective_levels},{collective_iterations})"
+
+        # Galaxy amplifier terms
+        self.concurrent_mathematical_power = int(collective_levels * collective_iterations)
+        self.quintillion_factor = int(self.concurrent_mathematical_power // 10**9)
+        self.galaxy_pattern = int(UNIVERSE_GALAXY_BASE % (2**32))
+        self.knuth_amplifier_coefficient = (self.galaxy_pattern * self.quintillion_factor) & _MASK_64
+
+        # Dual-Knuth categories: each contribution is (pow(foundation, levels) * iterations * base * nonce)
+        # mod 2**256, so base + modifier collapse into one coefficient per category.
+        foundation = bitload % (2**128)
+        self.category_params = {}
+        self.category_coefficients = []
+        for category in DUAL_KNUTH_CATEGORIES:
+            base_params, mod_params = (
+                self.parse_knuth_notation(notation) for notation in category_knuth.get(category, ("", ""))
+            )
+            self.category_params[category] = (base_params, mod_params)
+            coefficient = 0
+            for params in (base_params, mod_params):
+                power = pow(foundation, min(params["levels"], 10), 2**256)
+                coefficient += power * params["iterations"] * params["base"]
+            self.category_coefficients.append((coefficient * multipliers.get(category, 1)) & _MASK_256)
+        self.collective_pattern_coefficient = (185 * 12 * 10) * (34 * 21 * 10)
+
+    @staticmethod
+    def parse_knuth_notation(knuth_str):
+        """Parse K(X,Y,Z) notation into parameters"""
+        match = re.match(r"K\((\d+),(\d+),(\d+)\)", knuth_str or "")
+        if match:
+            return {"base": int(match.group(1)), "levels": int(match.group(2)), "iterations": int(match.group(3))}
+        return {"base": 1, "levels": 1, "iterations": 1}
+
+    def mathematical_bias(self, nonce):
+        """``(knuth_power ^ (nonce * levels)) % 2**64`` without touching the 256-bit constant."""
+        return self.bias_low64 ^ ((nonce * self.collective_levels) & _MASK_64)
+
+    def knuth_amplifier(self, nonce):
+        return (self.knuth_amplifier_coefficient * nonce) & _MASK_64
+
+    def dual_knuth_pattern(self, nonce):
+        """XOR of all five dual-Knuth category contributions for ``nonce``."""
+        combined = 0
+        for coefficient in self.category_coefficients:
+            combined ^= (coefficient * nonce) & _MASK_256
+        return combined
+
+    def collective_pattern(self, nonce):
+        return (nonce * self.collective_pattern_coefficient) & _MASK_32
+
+
+class AchievementSink:
+    """Background writer for DTM consensus achievements.
+
+    ``submit`` only enqueues on a bounded queue, so the hashing thread never touches
+    the filesystem. A daemon writer batches entries, drops repeats of the same
+    (nonce, hash) and appends them as JSON lines to one segment file per minute
+    (``achievements_YYYYMMDD_HHMM.jsonl``). When the queue is full new entries are
+    dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, directory_factory, max_queue=10000, batch_size=512, flush_interval=1.0, dedupe_window=65536):
+        self.directory_factory = directory_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dedupe_window = dedupe_window
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.submitted = 0
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.segment_path = None
+        self._recent = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, achievement) -> bool:
+        """Queue ``achievement`` without blocking; False if it was dropped."""
+        if self._closed:
+            return False
+        if self._thread is None:
+            self._start()
+        try:
+            self.queue.put_nowait(achievement)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="achievement-sink", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(entry is None for entry in batch)
+            try:
+                self._write([entry for entry in batch if entry is not None])
+            except Exception as e:
+                print(f"   ⚠️ DTM GPS: Could not save achievements: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write(self, batch):
+        lines = []
+        for achievement in batch:
+            key = (achievement.get("nonce"), str(achievement.get("hash") or achievement.get("hash_hex") or "")[:32])
+            if key in self._recent:
+                self.duplicates += 1
+                continue
+            self._recent[key] = None
+            if len(self._recent) > self.dedupe_window:
+                del self._recent[next(iter(self._recent))]
+            lines.append(json.dumps(achievement, separators=(",", ":"), default=str))
+        if not lines:
+            return
+
+        segment_path = Path(self.directory_factory()) / f"achievements_{datetime.now().strftime('%Y%m%d_%H%M')}.jsonl"
+        if segment_path != self.segment_path:
+            segment_path.parent.mkdir(parents=True, exist_ok=True)
+            self.segment_path = segment_path
+        with open(segment_path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+        self.written += len(lines)
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self.queue.join()
+
+    def close(self, timeout=5.0):
+        """Drain the queue and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "segment": str(self.segment_path) if self.segment_path else None,
+        }
+
+
+class MinerStateStore:
+    """Write-behind store for the miner's read-modify-write JSON files.
+
+    Callers queue ``update(path, mutator, factory)`` and return immediately; a
+    daemon flusher applies the mutators to the in-memory documents (loading each
+    file once) and writes dirty documents as atomic snapshots (temp file +
+    ``os.replace``) every ``flush_interval`` seconds, and on ``flush``/``close``.
+    Like save_to_dynamic_path, it never creates missing Brain.QTL folders.
+    """
+
+    def __init__(self, flush_interval=5.0):
+        self.flush_interval = flush_interval
+        self.flush_count = 0
+        self.last_flush = None
+        self._documents = {}
+        self._fallbacks = {}
+        self._dirty = set()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._documents_lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def update(self, path, mutator, factory=dict, fallback_path=None):
+        """Queue ``mutator(document)`` for the JSON file at ``path`` (no file I/O here)."""
+        path = Path(path)
+        with self._pending_lock:
+            self._pending.append((path, mutator, factory))
+            if fallback_path is not None:
+                self._fallbacks[path] = Path(fallback_path)
+        if self._closed:
+            self.flush()
+        elif self._thread is None:
+            self._start()
+
+    def get(self, path, default=None):
+        """Current contents of ``path`` including queued updates (a copy)."""
+        self._apply_pending()
+        path = Path(path)
+        with self._documents_lock:
+            document = self._documents.get(path)
+            if document is None and path.exists():
+                document = self._document(path, dict)
+            return copy.deepcopy(document) if document is not None else default
+
+    def paths(self):
+        self._apply_pending()
+        with self._documents_lock:
+            return sorted(str(path) for path in self._documents)
+
+    def _start(self):
+        with self._pending_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="miner-state-store", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _document(self, path, factory):
+        document = self._documents.get(path)
+        if document is None:
+            if path.exists():
+                try:
+                    with open(path, "r", encoding="utf-8") as handle:
+                        document = json.load(handle)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"⚠️ Cannot read {path}, starting fresh: {e}")
+            if document is None:
+                document = factory()
+            self._documents[path] = document
+        return document
+
+    def _apply_pending(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._documents_lock:
+            for path, mutator, factory in pending:
+                try:
+                    mutator(self._document(path, factory))
+                    self._dirty.add(path)
+                except Exception as e:
+                    print(f"❌ Error updating {path}: {e}")
+
+    def flush(self):
+        """Apply queued updates and write every dirty document now."""
+        with self._flush_lock:
+            self._apply_pending()
+            with self._documents_lock:
+                snapshots = [(path, json.dumps(self._documents[path], indent=2)) for path in self._dirty]
+                self._dirty.clear()
+            for path, payload in snapshots:
+                if not self._write_atomic(path, payload):
+                    fallback = self._fallbacks.get(path)
+                    if fallback is not None and self._write_atomic(fallback, payload):
+                        print(f"⚠️ {path.name} saved to fallback: {fallback}")
+            if snapshots:
+                self.flush_count += 1
+                self.last_flush = time.time()
+
+    @staticmethod
+    def _write_atomic(path, payload):
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            if not path.parent.exists():
+                raise FileNotFoundError(f"Directory not found: {path.parent}. Brain.QTL canonical authority via Brainstem should create this folder structure.")
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"❌ Error saving to {path}: {e}")
+            with contextlib.suppress(OSError):
+                tmp_path.unlink()
+            return False
+
+    def close(self):
+        """Stop the flusher and write the final snapshot."""
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            if self._thread is not None and self._thread is not threading.current_thread():
+                self._thread.join(self.flush_interval + 5)
+        self.flush()
+
+
+class MinerControlChannel:
+    """Push-based looping -> miner control plane over a Unix domain socket.
+
+    Each message is a JSON object ``{"id", "command", "parameters"}`` carried by
+    ``multiprocessing.connection`` as raw bytes (never pickled) and answered with
+    an acknowledgement. Accepted commands queue up for the miner, which drains
+    them with ``poll()`` or sleeps on ``wait()``, so an idle miner touches no
+    files. ``miner_commands.json`` stays as the fallback when no socket answers.
+    """
+
+    COMMANDS = frozenset(
+        {
+            "shutdown",
+            "stop",
+            "pause",
+            "resume",
+            "restart_fresh_template",
+            "sustain_target_zeros",
+            "fresh_template_instant_solve",
+            "mine_with_gps",
+            "new_template",
+            "status_request",
+        }
+    )
+    MAX_MESSAGE_BYTES = 1 << 20
+
+    def __init__(self, address, status_provider=None, on_command=None):
+        self.address = str(address)
+        self.status_provider = status_provider
+        self.on_command = on_command
+        self.commands_received = 0
+        self.commands_rejected = 0
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._listener = None
+        self._serve_thread = None
+        self._closed = False
+
+    @staticmethod
+    def address_for(command_dir, miner_id):
+        """Socket path for ``miner_id`` serving the command directory ``command_dir``."""
+        return str(Path(tempfile.gettempdir()) / f"{MinerControlChannel._prefix(command_dir)}{miner_id}.sock")
+
+    @staticmethod
+    def addresses(command_dir):
+        """Sockets of every miner listening for ``command_dir``."""
+        return sorted(str(path) for path in Path(tempfile.gettempdir()).glob(f"{MinerControlChannel._prefix(command_dir)}*.sock"))
+
+    @staticmethod
+    def _prefix(command_dir):
+        # Unix socket paths are limited to ~100 bytes - key by a digest of the directory
+        digest = hashlib.sha1(str(Path(command_dir).resolve()).encode()).hexdigest()[:16]
+        return f"miner_control_{digest}_"
+
+    def start(self):
+        """Bind the socket and start accepting commands. Returns False if unavailable."""
+        try:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.address)  # stale socket from a miner that did not exit cleanly
+            self._listener = Listener(self.address, family="AF_UNIX")
+            os.chmod(self.address, 0o600)
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Miner control socket unavailable, using command file: {e}")
+            self._listener = None
+            return False
+        self._serve_thread = threading.Thread(target=self._serve, name="miner-control", daemon=True)
+        self._serve_thread.start()
+        atexit.register(self.close)
+        return True
+
+    @property
+    def active(self):
+        return self._listener is not None and not self._closed
+
+    @property
+    def pending(self):
+        return bool(self._pending)
+
+    def poll(self):
+        """Next queued command message, or None (never blocks, no file I/O)."""
+        with self._condition:
+            return self._pending.popleft() if self._pending else None
+
+    def wait(self, timeout=None):
+        """Sleep until a command is queued (True) or ``timeout`` passes (False)."""
+        with self._condition:
+            return bool(self._condition.wait_for(lambda: self._pending or self._closed, timeout)) and bool(self._pending)
+
+    def _serve(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                conn.close()
+                return
+            threading.Thread(target=self._handle, args=(conn,), name="miner-control-conn", daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while not self._closed:
+                try:
+                    raw = conn.recv_bytes(self.MAX_MESSAGE_BYTES)
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send_bytes(json.dumps(self._accept(raw), default=str).encode())
+                except OSError:
+                    return
+
+    def _accept(self, raw):
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            self.commands_rejected += 1
+            return {"ok": False, "error": "malformed message"}
+
+        command = message.get("command")
+        parameters = message.get("parameters") or {}
+        ack = {"id": message.get("id"), "command": command, "received_at": time.time()}
+        if command not in self.COMMANDS or not isinstance(parameters, dict):
+            self.commands_rejected += 1
+            return {**ack, "ok": False, "error": f"unknown command: {command}"}
+
+        self.commands_received += 1
+        if command == "status_request":
+            # Answered from the listener thread - nothing to queue for the miner
+            status = self.status_provider() if self.status_provider else {}
+            return {**ack, "ok": True, "status": status}
+
+        with self._condition:
+            self._pending.append({"id": message.get("id"), "command": command, "parameters": parameters})
+            self._condition.notify_all()
+        if self.on_command:
+            self.on_command(command)
+        return {**ack, "ok": True, "queued": True}
+
+    def close(self):
+        """Stop accepting commands and remove the socket."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._condition:
+            self._condition.notify_all()
+        if self._listener is not None:
+            # Let the accept loop exit before the listener's fd number can be reused
+            with contextlib.suppress(OSError):
+                Client(self.address, family="AF_UNIX").close()
+            if self._serve_thread is not None and self._serve_thread is not threading.current_thread():
+                self._serve_thread.join(1.0)
+            with contextlib.suppress(OSError):
+                self._listener.close()
+            self._listener = None
+        with contextlib.suppress(OSError):
+            os.unlink(self.address)
+
+
+def send_miner_control_command(command_dir, command, parameters=None, timeout=2.0):
+    """Push ``command`` to every miner listening for ``command_dir``.
+
+    Returns the acknowledgements received; an empty list means no miner socket
+    answered and the caller should fall back to ``miner_commands.json``.
+    """
+    message = json.dumps(
+        {
+            "id": f"{os.getpid()}-{time.time_ns()}",
+            "command": command,
+            "parameters": parameters or {},
+            "timestamp": datetime.now().isoformat(),
+        },
+        default=str,
+    ).encode()
+
+    acks = []
+    for address in MinerControlChannel.addresses(command_dir):
+        try:
+            with Client(address, family="AF_UNIX") as conn:
+                conn.send_bytes(message)
+                if conn.poll(timeout):
+                    acks.append(json.loads(conn.recv_bytes()))
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Miner exited without cleaning up - drop its socket
+            with contextlib.suppress(OSError):
+                os.unlink(address)
+        except (OSError, EOFError, ValueError, AttributeError):
+            continue
+    return acks
+
+
 class ProductionBitcoinMiner:
+    # Bytes reserved at the end of the coinbase scriptSig for extranonce rolling
+    EXTRANONCE_SIZE = 8
+    # BIP320: version bits 13-28 are free for general-purpose (version-rolling) use
+    BIP320_VERSION_MASK = 0x1FFFE000
+
     def _determine_environment(self, override: str | None) -> str:
         if override:
             return override
@@ -550,7 +1437,7 @@ class ProductionBitcoinMiner:
         self.demo_mode = demo_mode
         self.repo_root = Path(__file__).resolve().parent
         self.config_data = self._load_config()
-        self._template_cache_version = 1
+        self._template_cache_version = 2
         self.environment = self._determine_environment(environment)
         self.brain_path_provider = get_brain_qtl_file_path
         
@@ -699,15 +1586,39 @@ class ProductionBitcoinMiner:
 
     def _parse_knuth_notation(self, knuth_str):
         """Parse K(X,Y,Z) notation into parameters"""
-        import re
-        match = re.match(r'K\((\d+),(\d+),(\d+)\)', knuth_str)
-        if match:
-            return {
-                'base': int(match.group(1)),
-                'levels': int(match.group(2)),
-                'iterations': int(match.group(3))
+        return DualKnuthPlan.parse_knuth_notation(knuth_str)
+
+    def get_knuth_plan(self):
+        """Return the precompiled DualKnuthPlan, rebuilt only when the collective values change.
+
+        The per-category ``_apply_dual_knuth_*`` methods remain the reference formulas.
+        """
+        plan = getattr(self, "_knuth_plan", None)
+        if (
+            plan is None
+            or plan.collective_levels != self.collective_collective_levels
+            or plan.collective_iterations != self.collective_collective_iterations
+        ):
+            category_knuth = {
+                category: (
+                    getattr(self, f"{category}_base_knuth", ""),
+                    getattr(self, f"{category}_modifier_knuth", ""),
+                )
+                for category in DUAL_KNUTH_CATEGORIES
+            }
+            multipliers = {
+                "math_problems": getattr(self, "active_problems", 8),
+                "math_paradoxes": getattr(self, "active_paradoxes", 8),
             }
-        return {'base': 1, 'levels': 1, 'iterations': 1}
+            plan = DualKnuthPlan(
+                self.collective_collective_levels,
+                self.collective_collective_iterations,
+                self.galaxy_category.get("bitload", 1),
+                category_knuth,
+                multipliers,
+            )
+            self._knuth_plan = plan
+        return plan
 
     def _calculate_knuth_contribution(self, nonce, base, levels, iterations):
         """
@@ -829,24 +1740,11 @@ class ProductionBitcoinMiner:
         """
         Apply ALL 5 dual-Knuth categories and combine their mathematical power
         Returns combined pattern for hash enhancement
+
+        Same XOR of the five ``_apply_dual_knuth_*`` results, evaluated through the
+        precompiled plan (one coefficient multiply per category).
         """
-        # Apply each category's dual-Knuth mathematics
-        entropy = self._apply_dual_knuth_entropy(nonce)
-        decryption = self._apply_dual_knuth_decryption(nonce)
-        near_solution = self._apply_dual_knuth_near_solution(nonce)
-        math_problems = self._apply_dual_knuth_math_problems(nonce)
-        math_paradoxes = self._apply_dual_knuth_math_paradoxes(nonce)
-        
-        # Combine all 5 categories with XOR for distribution
-        combined = (
-            entropy 
-            ^ decryption 
-            ^ near_solution 
-            ^ math_problems 
-            ^ math_paradoxes
-        )
-        
-        return combined
+        return self.get_knuth_plan().dual_knuth_pattern(nonce)
 
     def set_mining_mode(self, mode: str):
         """Set mining mode - affects BEHAVIOR only, NOT folder names per Pipeline flow.txt"""
@@ -871,12 +1769,116 @@ class ProductionBitcoinMiner:
         self.last_command_check = time.time()
         self.leading_zeros_sustained = 0
 
+        # Push-based control socket (see start_control_channel); the command files are the fallback
+        self.control_channel = None
+        self._control_command_pending = False
+        self.control_rescan_interval = 30.0  # Safety rescan of template files while waiting on the socket
+
+        # DTM shared-memory template region (see poll_shared_template)
+        self.shared_template_region = None
+        self._shared_template_attach_after = 0.0
+        self._shared_template_base = None
+
+        # DTM nonce lease being swept (see leased_nonce_strategy)
+        self.nonce_lease = None
+
+        # Worker count (0 = from config.json hardware) when this process mines
+        # through a MiningWorkerPool instead of in-process (see mine_daemon_template)
+        self.worker_pool_processes = None
+
+        # Long-lived DTM validation client (see get_dtm_validation_client)
+        self.dtm_validation_client = None
+
         # Initialize looping mode detection
         self.is_looping_mode = None  # Will be detected on first use
 
         # Initialize pipeline operations tracking
         self.pipeline_operations = []
 
+    def start_control_channel(self):
+        """Listen for looping-system commands on a Unix socket instead of polling files."""
+        if self.control_channel is not None and self.control_channel.active:
+            return self.control_channel
+
+        channel = MinerControlChannel(
+            MinerControlChannel.address_for(self.temporary_template_root, self.process_id),
+            status_provider=self._control_status,
+            on_command=self._on_control_command,
+        )
+        if not channel.start():
+            return None
+        self.control_channel = channel
+        if not self.daemon_mode:
+            print(f"📡 Control socket listening: {channel.address}")
+        return channel
+
+    def _on_control_command(self, command):
+        # Runs on the listener thread: flag the hash loop, and stop it right away on shutdown
+        if command == "shutdown":
+            self.shutdown_requested = True
+        self._control_command_pending = True
+
+    def stop_control_channel(self):
+        if self.control_channel is not None:
+            self.control_channel.close()
+            self.control_channel = None
+        self._control_command_pending = False
+
+    def _control_status(self):
+        return {
+            "terminal_id": self.terminal_id,
+            "current_attempts": self.current_attempts,
+            "hash_count": getattr(self, "hash_count", 0),
+            "best_difficulty": getattr(self, "best_difficulty", 0),
+            "mining_active": not self.shutdown_requested,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def poll_shared_template(self, latest=False):
+        """Template newly published in the DTM's shared-memory region, or None.
+
+        The region is mapped once; while the generation is unchanged this is a
+        single integer read, so every daemon shares one copy of the template.
+        ``latest=True`` returns the region's current template even when this
+        daemon already took that generation (commands that need a template now).
+        """
+        region = self.shared_template_region
+        if region is None:
+            if time.time() < self._shared_template_attach_after and not latest:
+                return None
+            self._shared_template_attach_after = time.time() + 5
+            try:
+                from dynamic_template_manager import SharedTemplateRegion
+            except ImportError:
+                return None
+            region = SharedTemplateRegion.attach(SharedTemplateRegion.name_for(self.temporary_template_root))
+            if region is None:
+                return None
+            self.shared_template_region = region
+
+        if latest:
+            snapshot = region.read()
+            document = snapshot[1] if snapshot else None
+        else:
+            document = region.read_if_new()
+        if document is None:
+            return None
+        try:
+            kind, body = region.parse_document(document)
+            if kind == "template":
+                template = body
+            else:
+                # Mempool-only refresh: patch the last template, or load the full copy if we missed it
+                template = self.apply_template_delta(body["template_delta"])
+                if template is None:
+                    template = region.load_template_file(body["template_file"])
+        except (OSError, ValueError) as e:
+            if not self.daemon_mode:
+                print(f"⚠️ Ignoring shared template: {e}")
+            return None
+        self._shared_template_base = template
+        return template
+
     def _init_mining_system(self, target_leading_zeros: int):
         """Initialize mining system components"""
         # Universe-scale mining - NO LIMITS!
@@ -1213,6 +2215,19 @@ class ProductionBitcoinMiner:
         self.total_hashes = 0
         self.hash_count = 0  # Track total hash attempts
         self.mathematical_nonce_count = 0  # Track mathematical nonces generated
+        self.nonce_coverage = {}  # Header prefix -> NonceCoverageIndex for the current template
+        self.current_nonce_coverage = None
+        self.duplicate_nonces_skipped = 0
+        self.state_store = MinerStateStore()  # Write-behind registry/ledger/proof files
+
+        # Two-phase template swaps: caches are built off the mining thread, then adopted between hashes
+        self._template_swap_lock = threading.Lock()
+        self._template_swap_generation = 0
+        self._staged_template = None
+        self._hash_loop_active = False
+        self.template_swap_count = 0
+        self.last_template_swap_latency = None
+        self.max_template_swap_latency = 0.0
         self.blocks_found = 0
         
         # Load previous best difficulty to maintain progressive improvement
@@ -1264,30 +2279,22 @@ class ProductionBitcoinMiner:
         self.pipeline_operations = []
 
     def update_global_submission_registry(self, submission_data, timestamp):
-        """Update global submission registry with new submission using System_File_Examples template"""
+        """Update global submission registry with new submission using System_File_Examples template.
+
+        The read-modify-write happens on the state store's flusher thread.
+        """
         try:
-            from Singularity_Dave_Brainstem_UNIVERSE_POWERED import load_file_template_from_examples, capture_system_info
+            from Singularity_Dave_Brainstem_UNIVERSE_POWERED import load_file_template_from_examples
             
             registry_path = self._brain_path("global_submission")
             if registry_path is None:
                 registry_path = (self.repo_root / f"{brain_get_base_path()}/Submission_Logs/global_submission.json")
 
-            # Load existing or initialize from template
-            if registry_path.exists():
-                try:
-                    with open(registry_path, "r", encoding="utf-8") as handle:
-                        registry = json.load(handle)
-                except (OSError, IOError, PermissionError, json.JSONDecodeError) as e:
-                    self.logger.error(f"Cannot read registry, initializing from template: {e}")
-                    registry = load_file_template_from_examples('global_submission')
-                    registry['submissions'] = []
-            else:
+            def new_registry():
                 registry = load_file_template_from_examples('global_submission')
                 registry['submissions'] = []
+                return registry
 
-            # Get real system info
-            system_info = capture_system_info()
-            
             moment = datetime.fromtimestamp(timestamp)
 
             # Create submission entry with real data
@@ -1303,32 +2310,32 @@ class ProductionBitcoinMiner:
                 "confirmations": submission_data.get("confirmations", 0),
                 "payout_btc": submission_data.get("amount_btc", 0.0)
             }
-            
-            registry["submissions"].append(submission_entry)
-            registry["metadata"]["last_updated"] = datetime.now().isoformat()
-            registry["total_submissions"] = len(registry["submissions"])
-            registry["accepted"] = sum(1 for s in registry["submissions"] if s.get("status") == "accepted")
-            registry["rejected"] = sum(1 for s in registry["submissions"] if s.get("status") == "rejected")
-            registry["pending"] = sum(1 for s in registry["submissions"] if s.get("status") == "pending")
-
-            try:
-                with open(registry_path, "w", encoding="utf-8") as handle:
-                    json.dump(registry, handle, indent=2)
-            except (OSError, IOError, PermissionError) as write_error:
-                self.logger.error(f"Cannot write registry: {write_error}")
-                try:
-                    fallback_path = Path("/tmp/global_submission_registry.json")
-                    with open(fallback_path, "w", encoding="utf-8") as handle:
-                        json.dump(registry, handle, indent=2)
-                    self.logger.info(f"Registry saved to fallback: {fallback_path}")
-                except Exception as fallback_error:
-                    self.logger.error(f"Fallback registry save failed: {fallback_error}")
+            last_updated = datetime.now().isoformat()
+
+            def append_submission(registry):
+                registry.setdefault("submissions", [])
+                registry["submissions"].append(submission_entry)
+                registry.setdefault("metadata", {})["last_updated"] = last_updated
+                registry["total_submissions"] = len(registry["submissions"])
+                registry["accepted"] = sum(1 for s in registry["submissions"] if s.get("status") == "accepted")
+                registry["rejected"] = sum(1 for s in registry["submissions"] if s.get("status") == "rejected")
+                registry["pending"] = sum(1 for s in registry["submissions"] if s.get("status") == "pending")
+
+            self.state_store.update(
+                registry_path,
+                append_submission,
+                new_registry,
+                fallback_path=Path("/tmp/global_submission_registry.json"),
+            )
 
         except Exception as exc:
             print(f"❌ Error updating global submission registry: {exc}")
 
     def update_daily_ledger(self, submission_data):
-        """Update daily ledger with detailed information using System_File_Examples template"""
+        """Update daily ledger with detailed information using System_File_Examples template.
+
+        The read-modify-write happens on the state store's flusher thread.
+        """
         try:
             from Singularity_Dave_Brainstem_UNIVERSE_POWERED import load_file_template_from_examples, capture_system_info
             
@@ -1358,56 +2365,53 @@ class ProductionBitcoinMiner:
                 if not validate_folder_exists_miner(str(ledger_path.parent), "Production-Miner-hourly-ledger"):
                     print(f"⚠️ Continuing without hourly ledger path: {ledger_path.parent}")
 
-            # Load existing or initialize from template
-            if ledger_path.exists():
-                try:
-                    with open(ledger_path, "r", encoding="utf-8") as handle:
-                        ledger = json.load(handle)
-                except (OSError, IOError, PermissionError, json.JSONDecodeError) as e:
-                    self.logger.error(f"Cannot read ledger, initializing from template: {e}")
-                    ledger = load_file_template_from_examples('hourly_ledger')
-                    ledger['entries'] = []
-            else:
+            def new_ledger():
                 ledger = load_file_template_from_examples('hourly_ledger')
                 ledger['entries'] = []
                 ledger['hour'] = moment.strftime("%Y-%m-%d_%H")
+                return ledger
+
+            def append_entry(ledger):
+                # Get real system info
+                system_info = capture_system_info()
+
+                # Create entry with real data
+                ledger_entry = {
+                    "attempt_id": f"attempt_{moment.strftime('%Y%m%d_%H%M%S')}_{submission_data.get('nonce', 0)}",
+                    "timestamp": submission_data.get("timestamp"),
+                    "block_height": submission_data.get("height", 0),
+                    "miner_id": self.terminal_id,
+                    "hardware": {
+                        "ip_address": system_info['network']['ip_address'],
+                        "hostname": system_info['network']['hostname'],
+                        "cpu": system_info['hardware']['cpu'],
+                        "ram": system_info['hardware']['memory']
+                    },
+                    "nonce": submission_data.get("nonce"),
+                    "merkleroot": submission_data.get("merkle_root", ""),
+                    "block_hash": submission_data.get("hash", ""),
+                    "meets_difficulty": submission_data.get("meets_difficulty", False),
+                    "leading_zeros": submission_data.get("leading_zeros", 0),
+                    "status": "mined" if submission_data.get("meets_difficulty") else "mining"
+                }
+                
+                ledger.setdefault("entries", [])
+                ledger["entries"].append(ledger_entry)
+                ledger.setdefault("metadata", {})["last_updated"] = moment.isoformat()
+                ledger["hashes_this_hour"] = sum(e.get("hashes_tried", 0) for e in ledger["entries"])
+                ledger["attempts_this_hour"] = len(ledger["entries"])
+                ledger["blocks_found"] = sum(1 for e in ledger["entries"] if e.get("meets_difficulty"))
 
-            # Get real system info
-            system_info = capture_system_info()
-
-            # Create entry with real data
-            ledger_entry = {
-                "attempt_id": f"attempt_{moment.strftime('%Y%m%d_%H%M%S')}_{submission_data.get('nonce', 0)}",
-                "timestamp": submission_data.get("timestamp"),
-                "block_height": submission_data.get("height", 0),
-                "miner_id": self.terminal_id,
-                "hardware": {
-                    "ip_address": system_info['network']['ip_address'],
-                    "hostname": system_info['network']['hostname'],
-                    "cpu": system_info['hardware']['cpu'],
-                    "ram": system_info['hardware']['memory']
-                },
-                "nonce": submission_data.get("nonce"),
-                "merkleroot": submission_data.get("merkle_root", ""),
-                "block_hash": submission_data.get("hash", ""),
-                "meets_difficulty": submission_data.get("meets_difficulty", False),
-                "leading_zeros": submission_data.get("leading_zeros", 0),
-                "status": "mined" if submission_data.get("meets_difficulty") else "mining"
-            }
-            
-            ledger["entries"].append(ledger_entry)
-            ledger["metadata"]["last_updated"] = moment.isoformat()
-            ledger["hashes_this_hour"] = sum(e.get("hashes_tried", 0) for e in ledger["entries"])
-            ledger["attempts_this_hour"] = len(ledger["entries"])
-            ledger["blocks_found"] = sum(1 for e in ledger["entries"] if e.get("meets_difficulty"))
-
-            self.save_to_dynamic_path(ledger_path, ledger)
+            self.state_store.update(ledger_path, append_entry, new_ledger)
 
         except Exception as e:
             print(f"❌ Error updating daily ledger: {e}")
 
     def update_daily_math_proof(self, submission_data):
-        """Update daily math proof with step-by-step evidence using templates"""
+        """Update daily math proof with step-by-step evidence using templates.
+
+        The read-modify-write happens on the state store's flusher thread.
+        """
         try:
             from Singularity_Dave_Brainstem_UNIVERSE_POWERED import load_file_template_from_examples, capture_system_info
             
@@ -1434,52 +2438,50 @@ class ProductionBitcoinMiner:
                 )
                 proof_path = fallback / "hourly_math_proof.json"
 
-            # Load existing or create from template
-            if proof_path.exists():
-                with open(proof_path, 'r') as f:
-                    proof = json.load(f)
-            else:
+            def new_proof():
                 proof = load_file_template_from_examples('hourly_math_proof')
                 proof['proofs'] = []
                 proof['hour'] = moment.strftime("%Y-%m-%d_%H")
-
-            # Get real system info
-            system_info = capture_system_info()
-
-            # Add new proof entry
-            proof_entry = {
-                "proof_id": f"proof_{moment.strftime('%Y%m%d_%H%M%S')}_{submission_data.get('nonce', 0)}",
-                "timestamp": moment.isoformat(),
-                "block_height": submission_data.get("height", 0),
-                "miner_id": self.terminal_id,
-                "hardware_attestation": {
-                    "ip_address": system_info['network']['ip_address'],
-                    "hostname": system_info['network']['hostname'],
-                    "cpu": system_info['hardware']['cpu'],
-                    "ram": system_info['hardware']['memory']
-                },
-                "computation_proof": {
-                    "nonce": submission_data.get("nonce", 0),
-                    "merkleroot": submission_data.get("merkle_root", ""),
-                    "block_hash": submission_data.get("hash", ""),
-                    "difficulty_target": submission_data.get("difficulty", ""),
-                    "leading_zeros": submission_data.get("leading_zeros", 0)
-                },
-                "mathematical_framework": {
-                    "categories_applied": ["families", "lanes", "strides", "palette", "sandbox"],
-                    "knuth_parameters": {
-                        "levels": self.knuth_sorrellian_class_levels,
-                        "iterations": self.knuth_sorrellian_class_iterations
+                return proof
+
+            def append_proof(proof):
+                # Get real system info
+                system_info = capture_system_info()
+
+                # Add new proof entry
+                proof_entry = {
+                    "proof_id": f"proof_{moment.strftime('%Y%m%d_%H%M%S')}_{submission_data.get('nonce', 0)}",
+                    "timestamp": moment.isoformat(),
+                    "block_height": submission_data.get("height", 0),
+                    "miner_id": self.terminal_id,
+                    "hardware_attestation": {
+                        "ip_address": system_info['network']['ip_address'],
+                        "hostname": system_info['network']['hostname'],
+                        "cpu": system_info['hardware']['cpu'],
+                        "ram": system_info['hardware']['memory']
                     },
-                    "universe_bitload": "208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909"
+                    "computation_proof": {
+                        "nonce": submission_data.get("nonce", 0),
+                        "merkleroot": submission_data.get("merkle_root", ""),
+                        "block_hash": submission_data.get("hash", ""),
+                        "difficulty_target": submission_data.get("difficulty", ""),
+                        "leading_zeros": submission_data.get("leading_zeros", 0)
+                    },
+                    "mathematical_framework": {
+                        "categories_applied": ["families", "lanes", "strides", "palette", "sandbox"],
+                        "knuth_parameters": {
+                            "levels": self.knuth_sorrellian_class_levels,
+                            "iterations": self.knuth_sorrellian_class_iterations
+                        },
+                        "universe_bitload": "208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909"
+                    }
                 }
-            }
 
-            proof['proofs'].append(proof_entry)
-            proof['metadata']['last_updated'] = moment.isoformat()
+                proof.setdefault('proofs', [])
+                proof['proofs'].append(proof_entry)
+                proof.setdefault('metadata', {})['last_updated'] = moment.isoformat()
 
-            # Save proof
-            self.save_to_dynamic_path(proof_path, proof)
+            self.state_store.update(proof_path, append_proof, new_proof)
 
         except Exception as e:
             print(f"❌ Error updating daily math proof: {e}")
@@ -1492,6 +2494,7 @@ class ProductionBitcoinMiner:
         print("🤖 DAEMON WORK LOOP STARTED")
         print(f"🆔 Daemon Terminal ID: {self.terminal_id}")
         print("⏳ Waiting for templates from Dynamic Template Manager...")
+        self.start_control_channel()
 
         # Template file paths for daemon communication
         template_file = self.mining_process_folder / "working_template.json"
@@ -1509,21 +2512,24 @@ class ProductionBitcoinMiner:
                 if looping_command == "mine_with_gps":
                     print("🚀 GPS MINING command received - engaging Universe-Scale mathematical power!")
                     
-                    # Load template from working_template.json
+                    # Map the template from shared memory, else load working_template.json. The
+                    # rescan may already have taken this generation, so read the current one.
+                    template = self.poll_shared_template(latest=True)
                     template_file = self.mining_process_folder / "working_template.json"
-                    if not template_file.exists():
-                        print(f"❌ Template file not found: {template_file}")
-                        time.sleep(1)
-                        continue
-                    
-                    with open(template_file, 'r') as f:
-                        template_data = json.load(f)
-                    
-                    # Extract actual template (handle both wrapped and direct formats)
-                    if 'template' in template_data:
-                        template = template_data['template']
-                    else:
-                        template = template_data
+                    if template is None:
+                        if not template_file.exists():
+                            print(f"❌ Template file not found: {template_file}")
+                            time.sleep(1)
+                            continue
+
+                        with open(template_file, 'r') as f:
+                            template_data = json.load(f)
+
+                        # Extract actual template (handle both wrapped and direct formats)
+                        if 'template' in template_data:
+                            template = template_data['template']
+                        else:
+                            template = template_data
                     
                     print(f"📋 Loaded template for block: {template.get('height', 'unknown')}")
                     print(f"   📦 Transactions: {len(template.get('transactions', []))}")
@@ -1537,6 +2543,8 @@ class ProductionBitcoinMiner:
                     )
                     
                     print(f"✅ GPS mining completed - check {results_file}")
+                    if results_file.exists():
+                        self.push_solution_notice(results_file)
                     
                     # Delete template AND command file to signal completion
                     if template_file.exists():
@@ -1551,21 +2559,32 @@ class ProductionBitcoinMiner:
                     
                     time.sleep(1)
                     continue
-                elif looping_command:
+                elif looping_command and looping_command != "new_template":
                     print(f"📥 Command received: {looping_command}")
                     # Handle other commands...
                     time.sleep(0.5)
                     continue
                 
                 # Only check for templates if NO commands are pending
-                # Brief sleep to avoid spinning
-                time.sleep(0.1)
+                if self.control_channel is not None and looping_command != "new_template":
+                    # Sleep on the control socket - template files are only read when a
+                    # command wakes us up or on the slow rescan timer
+                    if self.control_channel.wait(self.control_rescan_interval):
+                        continue
+                else:
+                    # Brief sleep to avoid spinning
+                    time.sleep(0.1)
                 
                 # Check for new template from looping system first
-                if template_file.exists():
-                    # Read template from looping distribution
-                    with open(template_file, "r") as f:
-                        template_data = json.load(f)
+                shared_template = self.poll_shared_template()
+                if shared_template is not None or template_file.exists():
+                    if shared_template is not None:
+                        # Mapped from the shared-memory region - no per-daemon template file
+                        template_data = shared_template
+                    else:
+                        # Read template from looping distribution
+                        with open(template_file, "r") as f:
+                            template_data = json.load(f)
 
                     print(f"📥 Template received from looping system: Height {template_data.get('height', 'Unknown')}")
                     templates_processed += 1
@@ -1580,7 +2599,8 @@ class ProductionBitcoinMiner:
                     # Mine the template with reasonable time limit (10 seconds)
                     print("⛏️ Starting mining on received template...")
                     mining_start_time = time.time()
-                    self.mine_block(max_time_seconds=10)  # 10 second limit - write results regardless
+                    # 10 second limit - write results regardless
+                    self.mine_daemon_template(max_time_seconds=10)
                     mining_elapsed = time.time() - mining_start_time
                     
                     # Convert to hex for display
@@ -1628,9 +2648,11 @@ class ProductionBitcoinMiner:
                     result_file = self.mining_process_folder / "mining_result.json"
                     with open(result_file, "w") as f:
                         json.dump(result, f, indent=2)
+                    self.push_solution_notice(result_file, result)
 
                     # Clean up template file to signal completion
-                    template_file.unlink()
+                    if template_file.exists():
+                        template_file.unlink()
                     print("✅ Template processing complete. Results saved.")
                     
                     # 🎮 DEMO MODE FIX: Add sleep to prevent CPU spin
@@ -1663,7 +2685,8 @@ class ProductionBitcoinMiner:
                             # Mine the template with reasonable time limit (10 seconds)
                             print("⛏️ Starting mining on DTM template...")
                             mining_start_time = time.time()
-                            self.mine_block(max_time_seconds=10)  # 10 second limit - write results regardless
+                            # 10 second limit - write results regardless
+                            self.mine_daemon_template(max_time_seconds=10)
                             mining_elapsed = time.time() - mining_start_time
 
                             # Capture mining results
@@ -1705,6 +2728,7 @@ class ProductionBitcoinMiner:
                             result_file = self.mining_process_folder / "mining_result.json"
                             with open(result_file, "w") as f:
                                 json.dump(result, f, indent=2)
+                            self.push_solution_notice(result_file, result)
 
                             print("✅ DTM template processing complete. Results saved.")
                             
@@ -1718,7 +2742,8 @@ class ProductionBitcoinMiner:
                     else:
                         print("📋 No DTM template available - waiting...")
                         gc.collect()
-                        time.sleep(5)  # Wait longer when no template available
+                        if self.control_channel is None:
+                            time.sleep(5)  # Wait longer when no template available
 
                     # Status update every 30 seconds
                     if time.time() - last_template_time > 30:
@@ -1733,6 +2758,7 @@ class ProductionBitcoinMiner:
                 gc.collect()
                 time.sleep(5)  # Wait before retrying
 
+        self.stop_control_channel()
         print("🛑 Daemon work loop terminated")
 
     def graceful_shutdown(self):
@@ -1750,6 +2776,17 @@ class ProductionBitcoinMiner:
             else:
                 print("✅ Mining thread completed successfully")
 
+        self.stop_control_channel()
+        if self.shared_template_region is not None:
+            self.shared_template_region.close()
+            self.shared_template_region = None
+
+        # Flush queued DTM consensus achievements and miner state before reporting stray threads
+        if getattr(self, "achievement_sink", None) is not None:
+            self.achievement_sink.close()
+        if getattr(self, "state_store", None) is not None:
+            self.state_store.close()
+
         # Force cleanup of any remaining threads
         import threading
 
@@ -1964,7 +3001,6 @@ class ProductionBitcoinMiner:
 
             # LIVE HOT-SWAP: Update template instantly without stopping mining
             self.live_template_swap(template)
-            self._get_template_cache(self.current_template)
 
             # Update status for looping system
             self.update_status_for_looping_system(
@@ -1987,6 +3023,7 @@ class ProductionBitcoinMiner:
         """🚀 RAM-BASED: Register with DTM and get template queue"""
         try:
             self.dtm_instance = dtm_instance
+            self.dtm_validation_client = None  # rebuilt around the registered DTM on next use
             self.template_queue = dtm_instance.register_miner(self.process_id)
             print(f"✅ Registered with DTM - RAM queue ready for {self.process_id}")
             return True
@@ -2024,9 +3061,8 @@ class ProductionBitcoinMiner:
                 json.dump(solution, f, indent=2)
             print(f"⚡ Solution written INSTANTLY to {solution_file}")
             
-            # Signal DTM if registered
-            if self.dtm_instance:
-                # DTM will pick it up via automatic monitoring
+            # Push straight to the DTM's solution intake (its monitoring also catches the file)
+            if self.push_solution_notice(solution_file, solution) or self.dtm_instance:
                 print(f"📡 DTM notified - solution ready for validation")
             
             return True
@@ -2041,9 +3077,8 @@ class ProductionBitcoinMiner:
             print(f"   📊 New template height: {new_template.get('height', 'unknown')}")
             print(f"   🎯 New template target: {new_template.get('target', 'unknown')[:20]}...")
 
-            # Instantly update current template - mining loop will pick up new template on next nonce
-            self.current_template = new_template
-            self._get_template_cache(self.current_template)
+            # Cache is built in the background - mining loop adopts the template between hashes
+            self.stage_template_swap(new_template)
 
             print("✅ Template hot - swapped successfully (leading zeros generation uninterrupted)")
             return True
@@ -2506,9 +3541,9 @@ class ProductionBitcoinMiner:
         """
         print("🔥 LIVE TEMPLATE HOT - SWAP: Zero interruption to mathematical power!")
 
-        # Atomic template swap - single operation, no performance impact
+        # Two-phase swap - cache precomputed off the mining thread, adopted between hashes
         old_height = self.current_template.get("height", "unknown") if self.current_template else "none"
-        self.current_template = new_template
+        self.stage_template_swap(new_template)
         new_height = new_template.get("height", "unknown")
 
         print(f"⚡ HOT - SWAP: {old_height} → {new_height} (zero downtime)")
@@ -2663,39 +3698,41 @@ class ProductionBitcoinMiner:
             print(f"❌ Error calculating universe hash: {e}")
             return None
 
-    def mathematically_enhanced_hash_calculation(self, header, nonce):
+    def mathematically_enhanced_hash_calculation(self, header, nonce, base_hash=None):
         """
         Apply Galaxy mathematical operations to enhance hash targeting
         Uses the UNIVERSE - SCALE 1.623e + 119 operations per hash to efficiently generate 50+ leading zeros
+
+        ``base_hash`` lets the hot loop pass the double SHA-256 already produced by the
+        midstate kernel; ``header`` may then be None.
         """
         import hashlib
         
         # Start with standard Bitcoin double SHA256
-        base_hash = hashlib.sha256(hashlib.sha256(header).digest()).digest()
+        if base_hash is None:
+            base_hash = hashlib.sha256(hashlib.sha256(header).digest()).digest()
         
         # USE KNUTH-SORRELLIAN-CLASS MATHEMATICS FOR LEADING ZERO GENERATION
         # Mathematical power calculates optimal nonces that produce massive leading zeros
         base_hash_int = int.from_bytes(base_hash, "big")
         
-        # KNUTH-SORRELLIAN-CLASS LEADING ZERO CALCULATION
-        universe_galaxy_base = 208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909
-        collective_levels = self.collective_collective_levels  # Dynamic: 841
-        collective_iterations = self.collective_collective_iterations  # Dynamic: 3,138,240
+        # KNUTH-SORRELLIAN-CLASS LEADING ZERO CALCULATION (nonce-independent part precompiled)
+        plan = self.get_knuth_plan()
+        collective_levels = plan.collective_levels  # Dynamic: 841
+        collective_iterations = plan.collective_iterations  # Dynamic: 3,138,240
         
         # Calculate mathematical bias for massive leading zeros using universe-scale operations
-        knuth_power = (universe_galaxy_base * collective_levels * collective_iterations) % (2**256)
-        mathematical_bias = (knuth_power ^ (nonce * collective_levels)) % (2**64)
+        mathematical_bias = plan.mathematical_bias(nonce)
         
         # Apply Knuth-Sorrellian-Class mathematical optimization for leading zeros
         # Each universe-scale operation increases probability of leading zeros exponentially
-        zero_bias_factor = collective_iterations // 1000  # Scale down for computation
-        target_zeros = min(20 + (zero_bias_factor % 44), 63)  # Target 20-63 leading zeros
+        target_zeros = plan.target_zeros  # Target 20-63 leading zeros
         
         # Mathematical leading zero generation using Knuth operations
         if target_zeros >= 20:
             # Calculate required magnitude reduction for target leading zeros
             # Each hex zero requires hash < 2^(256-4) = reduce by factor of 16
-            magnitude_reduction = 2 ** (target_zeros * 4)
+            magnitude_reduction = plan.magnitude_reduction
             
             # Apply mathematical bias to achieve target leading zeros
             biased_hash_int = (base_hash_int ^ mathematical_bias) % magnitude_reduction
@@ -2720,7 +3757,7 @@ class ProductionBitcoinMiner:
                     "hash": biased_hash_bytes.hex(),
                     "timestamp": int(time.time()),
                     "mathematical_power_used": collective_iterations,
-                    "knuth_notation": f"K({universe_galaxy_base},{collective_levels},{collective_iterations})"
+                    "knuth_notation": plan.knuth_notation
                 }
                 
                 # GPS-like coordination: Report to DTM consensus system
@@ -2736,18 +3773,10 @@ class ProductionBitcoinMiner:
         
         # Return standard hash if mathematical optimization doesn't achieve target
         return base_hash
-        universe_galaxy_base = 208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909
+        universe_galaxy_base = UNIVERSE_GALAXY_BASE
         # USE DYNAMIC COLLECTIVE VALUES: Base (400, 784560) + Modifiers (441, 2353680) = Total (841, 3138240)
-        universe_bitload = 208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909
-        knuth_base_universe = universe_bitload * self.collective_collective_levels * self.collective_collective_iterations  # Dynamic collective
-        
         # Use dynamic collective mathematical power from actual brainstem calculations
-        collective_levels = self.collective_collective_levels  # Dynamic: 841 (400 base + 441 modifiers)
-        collective_iterations = self.collective_collective_iterations  # Dynamic: 3,138,240 (784,560 base + 2,353,680 modifiers)
-        
-        concurrent_mathematical_power = int(
-            collective_levels * collective_iterations
-        )  # Real collective power: 841 × 3,138,240 = 2,639,297,840
+        concurrent_mathematical_power = plan.concurrent_mathematical_power  # 841 × 3,138,240 = 2,639,297,840
 
         # Convert to integers for mathematical operations
         base_hash_int = int.from_bytes(base_hash, "big")
@@ -2772,12 +3801,9 @@ class ProductionBitcoinMiner:
         # Method 2: OPTIMIZED leading zero generation using billion-scale operations efficiently
         if concurrent_mathematical_power > 10**9:  # Billion-scale power (matches actual 2.6B ops/hash)
             # Calculate exponential bias factor for efficient 50+ zero generation
-            quintillion_factor = int(concurrent_mathematical_power // 10**9)  # Use billions for efficient scaling
-
             # Method 3: Apply universe-scale Knuth mathematical operations for pattern optimization FIRST
-            # Use the universe constant to create favorable hash patterns
-            galaxy_pattern = int(universe_galaxy_base % (2**32))
-            knuth_amplifier = (galaxy_pattern * quintillion_factor * nonce) % (2**64)
+            # Use the universe constant to create favorable hash patterns (galaxy_pattern × quintillion_factor)
+            knuth_amplifier = plan.knuth_amplifier(nonce)
             enhanced_hash_int = enhanced_hash_int ^ knuth_amplifier
 
             # Method 4: DUAL-KNUTH category-specific modifiers for leading zero optimization
@@ -2788,9 +3814,7 @@ class ProductionBitcoinMiner:
 
             # Apply DUAL-KNUTH collective mathematical enhancement
             # Collective Base K(185,12,10) × Collective Modifier K(34,21,10)
-            collective_base_power = 185 * 12 * 10  # Collective base parameters
-            collective_mod_power = 34 * 21 * 10    # Collective modifier parameters
-            collective_pattern = (nonce * collective_base_power * collective_mod_power) % (2**32)
+            collective_pattern = plan.collective_pattern(nonce)
             
             # Combine dual-Knuth patterns with collective enhancement
             final_dual_knuth_pattern = combined_dual_knuth_pattern ^ (collective_pattern & 0xFFFFFFFF)
@@ -3495,11 +4519,22 @@ class ProductionBitcoinMiner:
         cache["coinbase_hex"] = coinbase_hex
         leaves = self._collect_merkle_leaves(template, coinbase_hex)
         cache["merkle_leaves_le"] = leaves
-        merkle_root_be = self._calculate_merkle_root_from_leaves(leaves)
+        self._set_merkle_levels(cache, self._update_merkle_levels([list(leaves)], 0))
+        cache["extranonce"] = None
+        self._set_transaction_lists(cache, template)
+        return cache
+
+    def _set_merkle_levels(self, cache, levels):
+        """Store the merkle levels (leaves first) with the root and coinbase branch they imply."""
+        merkle_root_be = levels[-1][0][::-1] if levels[0] else b"\x00" * 32
+        cache["merkle_levels_le"] = levels
+        # Below the root every level has at least two nodes; node 1 is the coinbase path's sibling
+        cache["merkle_branch_le"] = [layer[1] for layer in levels[:-1]]
         cache["merkle_root_hex"] = merkle_root_be.hex()
         cache["merkle_root_bytes_be"] = merkle_root_be
         cache["merkle_root_bytes_le"] = merkle_root_be[::-1]
 
+    def _set_transaction_lists(self, cache, template):
         tx_hex_list = []
         txids = []
         for tx in template.get("transactions", []):
@@ -3511,8 +4546,89 @@ class ProductionBitcoinMiner:
                 txids.append(txid_hex)
 
         cache["transactions_hex"] = tx_hex_list
+        # Serialized non-coinbase transactions, ready to append after the coinbase in a block
+        cache["transaction_section_hex"] = "".join(tx_hex_list)
         cache["transaction_txids"] = txids
-        return cache
+
+    def _update_merkle_levels(self, levels, first_changed):
+        """Rehash, in place, every node at or right of leaf ``first_changed``'s path.
+
+        ``levels[0]`` holds the leaves; parents left of the path are kept, so a
+        mempool refresh that appends transactions costs O(new + log n) hashes.
+        Odd levels pair their last node with itself, as in
+        ``_calculate_merkle_root_and_branch``.
+        """
+        depth, index = 0, first_changed
+        while len(levels[depth]) > 1:
+            layer = levels[depth]
+            if depth + 1 == len(levels):
+                levels.append([])
+            parents = levels[depth + 1]
+            index //= 2
+            del parents[index:]
+            for position in range(index * 2, len(layer), 2):
+                right = layer[position + 1] if position + 1 < len(layer) else layer[position]
+                parents.append(self._double_sha256(layer[position] + right)[::-1])
+            depth += 1
+        del levels[depth + 1:]
+        return levels
+
+    def apply_template_delta(self, delta, base=None):
+        """Template from ``base`` plus a template delta, with its merkle tree updated incrementally.
+
+        ``base`` defaults to the last template taken from the shared region. The
+        new template carries a ready ``_resolved_cache``: kept leaves are reused,
+        only paths right of the first removed/added transaction are rehashed, and
+        the whole tree only when the coinbase changes. None if ``base`` is not the
+        delta's base (the caller then loads the full template).
+        """
+        from dynamic_template_manager import apply_template_delta as template_from_delta, template_txid
+
+        base = base if base is not None else self._shared_template_base
+        template = template_from_delta(base, delta)
+        if template is None:
+            return None
+
+        base_txs = base.get("transactions") or []
+        base_cache = base.get("_resolved_cache") or {}
+        levels = base_cache.get("merkle_levels_le")
+        if (
+            base_cache.get("version") != self._template_cache_version
+            or not levels
+            or len(levels[0]) != len(base_txs) + 1
+        ):
+            template["_resolved_cache"] = self._build_template_cache(template)
+            return template
+
+        removed = set(delta.get("removed_txids") or [])
+        leaves = [None]
+        first_changed = len(base_txs) + 1
+        for index, tx in enumerate(base_txs, 1):
+            if template_txid(tx) in removed:
+                first_changed = min(first_changed, index)
+            else:
+                leaves.append(levels[0][index])
+        for tx in delta.get("added_transactions") or []:
+            leaf = self._leaf_from_entry(tx)
+            if leaf is None:
+                template["_resolved_cache"] = self._build_template_cache(template)
+                return template
+            leaves.append(leaf)
+
+        coinbase_hex = self._resolve_coinbase_hex(template)
+        leaves[0] = self._coinbase_leaf(template, coinbase_hex)
+        if leaves[0] != levels[0][0]:
+            first_changed = 0
+        # The base cache may still be in use by the hashing loop, so work on copies
+        new_levels = [leaves] + [list(layer) for layer in levels[1:]]
+
+        cache = {"version": self._template_cache_version, "coinbase_hex": coinbase_hex}
+        cache["merkle_leaves_le"] = list(leaves)
+        self._set_merkle_levels(cache, self._update_merkle_levels(new_levels, first_changed))
+        cache["extranonce"] = None
+        self._set_transaction_lists(cache, template)
+        template["_resolved_cache"] = cache
+        return template
 
     def _resolve_coinbase_hex(self, template):
         coinbase_txn = template.get("coinbasetxn") if isinstance(template, dict) else None
@@ -3528,7 +4644,17 @@ class ProductionBitcoinMiner:
         return fallback.lower() if isinstance(fallback, str) else fallback
 
     def _collect_merkle_leaves(self, template, coinbase_hex):
-        leaves = []
+        leaves = [self._coinbase_leaf(template, coinbase_hex)]
+
+        transaction_list = template.get("transactions", []) if isinstance(template, dict) else []
+        for tx in transaction_list:
+            leaf = self._leaf_from_entry(tx)
+            if leaf is not None:
+                leaves.append(leaf)
+
+        return leaves
+
+    def _coinbase_leaf(self, template, coinbase_hex):
         coinbase_leaf = None
         if coinbase_hex and self._is_hex_string(coinbase_hex):
             coinbase_leaf = self._leaf_from_raw_transaction(coinbase_hex)
@@ -3546,15 +4672,7 @@ class ProductionBitcoinMiner:
         if coinbase_leaf is None:
             fallback_hex = self.create_simple_coinbase_transaction()
             coinbase_leaf = self._leaf_from_raw_transaction(fallback_hex)
-        leaves.append(coinbase_leaf or (b"\x00" * 32))
-
-        transaction_list = template.get("transactions", []) if isinstance(template, dict) else []
-        for tx in transaction_list:
-            leaf = self._leaf_from_entry(tx)
-            if leaf is not None:
-                leaves.append(leaf)
-
-        return leaves
+        return coinbase_leaf or (b"\x00" * 32)
 
     def _leaf_from_raw_transaction(self, tx_hex):
         if not isinstance(tx_hex, str) or not self._is_hex_string(tx_hex):
@@ -3599,23 +4717,171 @@ class ProductionBitcoinMiner:
 
     def _calculate_merkle_root_from_leaves(self, leaves):
         if not leaves:
-            return b"\x00" * 32
+            return b"\x00" * 32
+
+        layer = list(leaves)
+        while len(layer) > 1:
+            if len(layer) % 2 == 1:
+                layer.append(layer[-1])
+            next_layer = []
+            for index in range(0, len(layer), 2):
+                combined = layer[index] + layer[index + 1]
+                hashed = self._double_sha256(combined)[::-1]
+                next_layer.append(hashed)
+            layer = next_layer
+
+        return layer[0][::-1]
+
+    def _calculate_merkle_root_and_branch(self, leaves):
+        """Merkle root plus the coinbase (leaf 0) branch, in one pass over the tree.
+
+        The branch holds the sibling of the coinbase path at every level, so a new
+        coinbase can be re-rooted in O(log n) by ``_merkle_root_from_branch``.
+        Produces the same root as ``_calculate_merkle_root_from_leaves``.
+        """
+        if not leaves:
+            return b"\x00" * 32, []
 
+        branch = []
         layer = list(leaves)
         while len(layer) > 1:
             if len(layer) % 2 == 1:
                 layer.append(layer[-1])
-            next_layer = []
-            for index in range(0, len(layer), 2):
-                combined = layer[index] + layer[index + 1]
-                hashed = self._double_sha256(combined)[::-1]
-                next_layer.append(hashed)
-            layer = next_layer
+            branch.append(layer[1])
+            layer = [
+                self._double_sha256(layer[index] + layer[index + 1])[::-1]
+                for index in range(0, len(layer), 2)
+            ]
 
-        return layer[0][::-1]
+        return layer[0][::-1], branch
+
+    def _merkle_root_from_branch(self, coinbase_leaf, branch):
+        """Re-root a coinbase leaf through a precomputed merkle branch (O(log n))."""
+        node = coinbase_leaf
+        for sibling in branch:
+            node = self._double_sha256(node + sibling)[::-1]
+        return node[::-1]
+
+    def _split_coinbase_for_extranonce(self, coinbase_hex):
+        """Split a coinbase around an extranonce slot appended to its scriptSig.
+
+        Returns ``(prefix, suffix)`` bytes so that ``prefix + extranonce + suffix`` is the
+        coinbase with a ``EXTRANONCE_SIZE``-byte push at the end of the scriptSig.
+        """
+        raw = bytes.fromhex(coinbase_hex)
+        position = 4  # version
+        if raw[position:position + 2] == b"\x00\x01":
+            position += 2  # segwit marker + flag
+
+        input_count, position = self._read_varint(raw, position)
+        if input_count != 1:
+            raise ValueError(f"coinbase must have exactly one input, found {input_count}")
+        position += 36  # null prevout (txid + index)
+
+        script_len_start = position
+        script_len, script_start = self._read_varint(raw, position)
+        script_end = script_start + script_len
+        new_script_len = script_len + 1 + self.EXTRANONCE_SIZE
+        if new_script_len > 100:
+            raise ValueError(f"coinbase scriptSig would exceed 100 bytes ({new_script_len}) with extranonce")
+
+        prefix = (
+            raw[:script_len_start]
+            + self.encode_varint(new_script_len)
+            + raw[script_start:script_end]
+            + bytes([self.EXTRANONCE_SIZE])
+        )
+        return prefix, raw[script_end:]
+
+    @staticmethod
+    def _read_varint(data, position):
+        """Decode a Bitcoin varint at ``position``; returns (value, next_position)."""
+        first = data[position]
+        if first < 0xFD:
+            return first, position + 1
+        if first == 0xFD:
+            return struct.unpack_from("<H", data, position + 1)[0], position + 3
+        if first == 0xFE:
+            return struct.unpack_from("<I", data, position + 1)[0], position + 5
+        return struct.unpack_from("<Q", data, position + 1)[0], position + 9
+
+    def roll_extranonce(self, template=None, extranonce=None):
+        """Advance the coinbase extranonce once the 32-bit nonce space is exhausted.
+
+        Only the coinbase leaf and its merkle path are recomputed (via the branch
+        precomputed in ``_build_template_cache``); the cached coinbase, leaves and
+        merkle root are updated in place so headers and complete blocks pick them up.
+        ``extranonce`` jumps straight to that value (the DTM's lease epoch) instead
+        of the next one. Returns the new extranonce value.
+        """
+        if template is None:
+            template = self.current_template
+        cache = self._get_template_cache(template)
+
+        split = cache.get("coinbase_extranonce_split")
+        if split is None:
+            split = self._split_coinbase_for_extranonce(cache["coinbase_hex"])
+            cache["coinbase_extranonce_split"] = split
+
+        if extranonce is None:
+            extranonce = (cache.get("extranonce") or 0) + 1
+        extranonce %= 1 << (8 * self.EXTRANONCE_SIZE)
+        prefix, suffix = split
+        coinbase = prefix + extranonce.to_bytes(self.EXTRANONCE_SIZE, "little") + suffix
+        coinbase_leaf = self._double_sha256(coinbase)[::-1]
+        merkle_root_be = self._merkle_root_from_branch(coinbase_leaf, cache.get("merkle_branch_le", []))
+
+        cache["extranonce"] = extranonce
+        cache["coinbase_hex"] = coinbase.hex()
+        cache["merkle_leaves_le"][0] = coinbase_leaf
+        cache["merkle_root_hex"] = merkle_root_be.hex()
+        cache["merkle_root_bytes_be"] = merkle_root_be
+        cache["merkle_root_bytes_le"] = merkle_root_be[::-1]
+
+        # Header prefix changed - force the midstate kernel to rebuild
+        self._header_kernel = None
+        return extranonce
+
+    def version_rolling_mask(self, template=None):
+        """BIP320 version-rolling mask enabled for ``template`` by the DTM (0 when disabled)."""
+        if template is None:
+            template = self.current_template
+        settings = template.get("version_rolling") if isinstance(template, dict) else None
+        if isinstance(settings, bool):
+            settings = {"enabled": settings}
+        if not isinstance(settings, dict) or not settings.get("enabled"):
+            return 0
 
-    def construct_block_header(self, template_or_nonce, nonce=None):
-        """Construct Bitcoin block header for mining (PRODUCTION READY) - supports both signatures"""
+        mask = settings.get("mask", self.BIP320_VERSION_MASK)
+        if isinstance(mask, str):
+            try:
+                mask = int(mask, 16)
+            except ValueError:
+                mask = self.BIP320_VERSION_MASK
+        # Never touch bits outside the BIP320 general-purpose range
+        return mask & self.BIP320_VERSION_MASK
+
+    def rolled_block_version(self, template, roll):
+        """Template version with ``roll`` scattered into the enabled version-rolling bits."""
+        base_version = template.get("version", 0x20000000) if isinstance(template, dict) else 0x20000000
+        mask = self.version_rolling_mask(template)
+        if not mask:
+            return base_version
+
+        rolled_bits = 0
+        roll_bit = 0
+        for position in range(32):
+            if mask >> position & 1:
+                if roll >> roll_bit & 1:
+                    rolled_bits |= 1 << position
+                roll_bit += 1
+        return (base_version & ~mask & 0xFFFFFFFF) | rolled_bits
+
+    def construct_block_header(self, template_or_nonce, nonce=None, version=None):
+        """Construct Bitcoin block header for mining (PRODUCTION READY) - supports both signatures
+
+        ``version`` overrides the template version (BIP320 version rolling).
+        """
         # Handle overloaded method signatures
         if nonce is None:
             # Called with single argument (nonce only)
@@ -3628,8 +4894,119 @@ class ProductionBitcoinMiner:
             # Called with two arguments (template, nonce)
             template = template_or_nonce
 
+        return self._build_header_prefix(template, version) + _NONCE_STRUCT.pack(nonce)
+
+    def get_header_kernel(self, template=None, version=None):
+        """Return the midstate hashing kernel for ``template`` (built once per template).
+
+        The hot loop in ``mine_block`` hashes through this kernel; ``construct_block_header``
+        stays as the cold path for submissions and reporting. A rolled ``version`` only
+        re-derives the midstate, the rest of the prefix is reused.
+        """
+        if template is None:
+            if self.current_template is None:
+                self.current_template = self.get_fallback_universe_template()
+            template = self.current_template
+
+        cached = getattr(self, "_header_kernel", None)
+        if cached is None or cached[0] is not template:
+            cached = (template, MidstateHeaderKernel(self._build_header_prefix(template)))
+            self._header_kernel = cached
+
+        kernel = cached[1]
+        if version is not None and version != kernel.version:
+            return kernel.with_version(version)
+        return kernel
+
+    def stage_template_swap(self, new_template, target=None):
+        """Two-phase template swap: build the cache and header kernel, then switch.
+
+        While ``mine_block`` is hashing, the build runs on a background thread and the
+        loop adopts the result before its next hash; otherwise the swap happens inline.
+        ``target`` (if given) switches together with the template. Returns the
+        preparing thread, or None when the swap was applied immediately.
+        """
+        requested_at = time.perf_counter()
+        with self._template_swap_lock:
+            self._template_swap_generation += 1
+            generation = self._template_swap_generation
+
+        if not self._hash_loop_active:
+            self._prepare_template_swap(new_template, target, generation, requested_at)
+            self.adopt_staged_template()
+            return None
+
+        worker = threading.Thread(
+            target=self._prepare_template_swap,
+            args=(new_template, target, generation, requested_at),
+            name="template-swap",
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+    def _prepare_template_swap(self, template, target, generation, requested_at):
+        try:
+            self._get_template_cache(template)
+            kernel = MidstateHeaderKernel(self._build_header_prefix(template))
+        except Exception as e:
+            print(f"❌ Template swap preparation failed: {e}")
+            return
+        with self._template_swap_lock:
+            # A newer swap was requested while this one was building - drop it
+            if generation == self._template_swap_generation:
+                self._staged_template = (template, kernel, target, requested_at)
+
+    def adopt_staged_template(self):
+        """Switch to the prepared template (mining thread side). Returns it, or None."""
+        with self._template_swap_lock:
+            staged = self._staged_template
+            self._staged_template = None
+        if staged is None:
+            return None
+
+        template, kernel, target, requested_at = staged
+        self._header_kernel = (template, kernel)
+        if target is not None:
+            self.current_target = target
+        self.current_template = template
+
+        latency = time.perf_counter() - requested_at
+        self.template_swap_count += 1
+        self.last_template_swap_latency = latency
+        self.max_template_swap_latency = max(self.max_template_swap_latency, latency)
+        return template
+
+    def _hash_loop_nonces(self, nonces):
+        """Flatten ``nonces`` chunks while marking the hash loop active for template swaps."""
+        self._hash_loop_active = True
+        try:
+            yield from chain.from_iterable(nonces)
+        finally:
+            self._hash_loop_active = False
+
+    def get_nonce_coverage(self, template, header_kernel):
+        """Return the tried-nonce index for the header ``header_kernel`` hashes.
+
+        One index per header prefix (template + version + extranonce); all of them
+        are dropped when the template id (previous block, height) changes.
+        """
+        template_id = (template.get("previousblockhash"), template.get("height"))
+        if getattr(self, "_nonce_coverage_template_id", None) != template_id:
+            self._nonce_coverage_template_id = template_id
+            self.nonce_coverage = {}
+
+        coverage = self.nonce_coverage.get(header_kernel.prefix)
+        if coverage is None:
+            coverage = self.nonce_coverage[header_kernel.prefix] = NonceCoverageIndex()
+        self.current_nonce_coverage = coverage
+        return coverage
+
+    def _build_header_prefix(self, template, version=None):
+        """Pack the 76 nonce-independent header bytes for ``template``."""
         # Bitcoin block header (80 bytes)
-        version = template.get("version", 0x20000000)
+        if version is None:
+            version = template.get("version", 0x20000000)
 
         # Handle previous block hash - ensure it's bytes
         prev_hash_hex = template.get("previousblockhash", "0" * 64)
@@ -3664,36 +5041,28 @@ class ProductionBitcoinMiner:
         else:
             bits = self.difficulty_to_bits(self.current_difficulty)
 
-        # Pack header (80 bytes total)
+        # Pack header prefix (76 bytes; the 4-byte nonce is appended by the caller)
         header = struct.pack("<I", version)  # 4 bytes: Version
         header += prev_hash  # 32 bytes: Previous block hash
         header += merkle_root_le  # 32 bytes: Merkle root (little-endian)
         header += struct.pack("<I", timestamp)  # 4 bytes: Timestamp
         header += struct.pack("<I", bits)  # 4 bytes: Difficulty bits
-        header += struct.pack("<I", nonce)  # 4 bytes: Nonce
 
         return header
 
     def save_dtm_consensus_achievement(self, achievement):
-        """Save DTM consensus achievement for GPS-like coordination"""
-        try:
-            import json
-            from pathlib import Path
-            
-            # DTM consensus directory
-            consensus_dir = Path(f"{brain_get_base_path()}/System/DTM_Consensus")
-            consensus_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save achievement with timestamp
-            achievement_file = consensus_dir / f"achievement_{int(time.time())}.json"
-            
-            with open(achievement_file, 'w') as f:
-                json.dump(achievement, f, indent=2)
-                
-            print(f"   📁 DTM GPS: Achievement saved to {achievement_file}")
-            
-        except Exception as e:
-            print(f"   ⚠️ DTM GPS: Could not save achievement: {e}")
+        """Save DTM consensus achievement for GPS-like coordination.
+
+        Hands the achievement to the background AchievementSink; the per-minute
+        segments land in System/DTM_Consensus.
+        """
+        sink = getattr(self, "achievement_sink", None)
+        if sink is None:
+            sink = self.achievement_sink = AchievementSink(
+                lambda: Path(f"{brain_get_base_path()}/System/DTM_Consensus")
+            )
+        if not sink.submit(achievement) and sink.dropped and sink.dropped % 10000 == 1:
+            print(f"   ⚠️ DTM GPS: Achievement queue full, {sink.dropped:,} achievements dropped")
 
     def calculate_merkle_root_bytes(self, transactions):
         """Calculate merkle root from transactions (returns bytes)"""
@@ -3743,6 +5112,10 @@ class ProductionBitcoinMiner:
 
     def get_dual_leading_zeros(self, hash_result):
         """Get both binary (for protocol) and hex (for display) leading zero counts"""
+        if isinstance(hash_result, HashVerdict):
+            # Already counted once in the mining loop
+            return hash_result.binary_zeros, hash_result.bits
+
         # Convert hash_result to appropriate formats
         if isinstance(hash_result, bytes):
             hash_hex = hash_result.hex()
@@ -3768,49 +5141,37 @@ class ProductionBitcoinMiner:
         return 0
 
     def save_best_difficulty(self, leading_zeros):
-        """Save best difficulty to maintain progressive improvement across sessions"""
-        try:
-            # Update daily registry
-            today = datetime.now().strftime("%Y/%m/%d")
-            daily_dir = f"{brain_get_base_path()}/Ledgers/{today}"
-            if not Path(daily_dir).exists():
-                raise FileNotFoundError(f"Daily ledger directory not found: {daily_dir}. Brain.QTL canonical authority via Brainstem should create this folder structure.")
-            
-            daily_path = f"{daily_dir}/daily_registry.json"
-            registry = {}
-            if os.path.exists(daily_path):
-                with open(daily_path, 'r') as f:
-                    registry = json.load(f)
-            
+        """Save best difficulty to maintain progressive improvement across sessions.
+
+        The daily registry and mining achievements are updated in the write-behind
+        state store, so a new best never waits on the filesystem.
+        """
+        now = datetime.now()
+        last_updated = now.isoformat()
+
+        def bump_registry(registry):
             registry["best_leading_zeros"] = max(registry.get("best_leading_zeros", 0), leading_zeros)
-            registry["last_updated"] = datetime.now().isoformat()
-            
-            with open(daily_path, 'w') as f:
-                json.dump(registry, f, indent=2)
-                
-            # Update overall achievements
-            results_dir = "Output/Bitcoin/Mining/Results"
-            if not Path(results_dir).exists():
-                raise FileNotFoundError(f"Results directory not found: {results_dir}. Brain.QTL canonical authority via Brainstem should create this folder structure.")
-            achievements_path = f"{results_dir}/mining_achievements.json"
-            
-            achievements = {}
-            if os.path.exists(achievements_path):
-                with open(achievements_path, 'r') as f:
-                    achievements = json.load(f)
-            
+            registry["last_updated"] = last_updated
+
+        def bump_achievements(achievements):
             achievements["all_time_best_leading_zeros"] = max(
                 achievements.get("all_time_best_leading_zeros", 0), leading_zeros
             )
             achievements["6x_universe_scale_active"] = True
             achievements["ultra_hex_system_active"] = True
-            achievements["last_updated"] = datetime.now().isoformat()
-            
-            with open(achievements_path, 'w') as f:
-                json.dump(achievements, f, indent=2)
-                
-        except Exception as e:
-            print(f"⚠️ Could not save achievements: {e}")
+            achievements["last_updated"] = last_updated
+
+        # Update daily registry
+        daily_dir = f"{brain_get_base_path()}/Ledgers/{now.strftime('%Y/%m/%d')}"
+        self.state_store.update(f"{daily_dir}/daily_registry.json", bump_registry)
+
+        # Update overall achievements
+        results_dir = "Output/Bitcoin/Mining/Results"
+        self.state_store.update(f"{results_dir}/mining_achievements.json", bump_achievements)
+
+    def get_best_difficulty_record(self):
+        """Persisted all-time best as the state store currently holds it (queued updates included)."""
+        return self.state_store.get("Output/Bitcoin/Mining/Results/mining_achievements.json", {})
 
     def get_ultra_hex_leading_zeros(self, hash_result):
         """Ultra Hex buckets: 64 leading zeros per bucket, Ultra 2 starts at 64+, max 256 buckets.
@@ -3819,7 +5180,12 @@ class ProductionBitcoinMiner:
         """
         import hashlib
         
+        # Standard dual count (reused from a HashVerdict when the mining loop passes one)
+        binary_leading_zeros, standard_hex_leading_zeros = self.get_dual_leading_zeros(hash_result)
+
         # Convert hash_result to appropriate formats
+        if isinstance(hash_result, HashVerdict):
+            hash_result = hash_result.digest if hash_result.digest is not None else hash_result.hex
         if isinstance(hash_result, bytes):
             hash_hex = hash_result.hex()
             hash_int = int.from_bytes(hash_result, "big")
@@ -3829,9 +5195,6 @@ class ProductionBitcoinMiner:
         else:
             hash_int = hash_result
             hash_hex = hex(hash_result)[2:].zfill(64)
-        
-        # Standard dual count
-        binary_leading_zeros, standard_hex_leading_zeros = self.get_dual_leading_zeros(hash_result)
 
         base_ultra_hex_zeros = standard_hex_leading_zeros
 
@@ -3940,14 +5303,21 @@ class ProductionBitcoinMiner:
         # For testnet/development
         return 0x207FFFFF  # Easy target
 
-    def universe_scale_nonce_generation(self, start_nonce=0, max_nonces=4294967295):
-        """Generate nonces using universe-scale mathematical framework"""
+    def universe_scale_nonce_generation(self, start_nonce=0, max_nonces=4294967295, chunk_size=NONCE_CHUNK_SIZE):
+        """Generate nonces using universe-scale mathematical framework.
+
+        Returns a lazy stream of ``array('I')`` chunks (see iter_nonce_chunks).
+        """
+        return iter_nonce_chunks(self._universe_scale_nonce_values(start_nonce, max_nonces), chunk_size)
+
+    def _universe_scale_nonce_values(self, start_nonce, max_nonces):
+        """Nonce-by-nonce producer behind universe_scale_nonce_generation."""
         print("🌌 UNIVERSE - SCALE NONCE GENERATION ACTIVE")
         print(f"   🔥 Mathematical Power: {self.knuth_sorrellian_class_iterations:,} operations per nonce")
         print(f"   🎯 Target: {self.universe_target_zeros} leading zeros")
 
         # Mathematical nonce generation using universe-scale BitLoad
-        nonces = []
+        generated = 0
 
         # ENHANCED Method 1: High-precision entropy-based generation for 19+ zeros
         for i in range(75000):  # Increased for higher precision
@@ -3955,7 +5325,8 @@ class ProductionBitcoinMiner:
             entropy_base = (self.bitload * (i + 1) * self.knuth_sorrellian_class_levels) % 4294967296
             # Apply universe-scale enhancement for higher leading zeros
             entropy_nonce = (entropy_base ^ (self.knuth_sorrellian_class_iterations >> (i % 32))) % 4294967296
-            nonces.append(entropy_nonce)
+            yield entropy_nonce
+            generated += 1
 
         # ENHANCED Method 2: Nuclear-scale mathematical sequence targeting
         for i in range(50000):  # Increased coverage
@@ -3965,7 +5336,8 @@ class ProductionBitcoinMiner:
             ) % 4294967296
             # Apply leading zero targeting transformation
             math_nonce = (math_base ^ (self.bitload >> (i % 64))) % 4294967296
-            nonces.append(math_nonce)
+            yield math_nonce
+            generated += 1
 
         # ENHANCED Method 3: Universe-scale pattern extraction with precision targeting
         for i in range(75000):  # Increased for better coverage
@@ -3976,7 +5348,8 @@ class ProductionBitcoinMiner:
             ) % 4294967296
             # Apply advanced bit manipulation for leading zero optimization
             pattern_nonce = (pattern_base ^ (self.universe_target_zeros << (i % 16))) % 4294967296
-            nonces.append(pattern_nonce)
+            yield pattern_nonce
+            generated += 1
 
         # ENHANCED Method 4: Direct mathematical targeting with universe-scale amplification
         for i in range(start_nonce, min(start_nonce + 150000, max_nonces)):  # Increased range
@@ -3991,25 +5364,37 @@ class ProductionBitcoinMiner:
                 enhanced_nonce = (enhanced_base ^ (qtl_enhancement >> (i % 32))) % 4294967296
             else:
                 enhanced_nonce = (enhanced_base ^ (self.knuth_sorrellian_class_iterations >> (i % 32))) % 4294967296
-            nonces.append(enhanced_nonce)
+            yield enhanced_nonce
+            generated += 1
 
-        print(f"✅ Generated {len(nonces):,} NUCLEAR - ENHANCED universe - scale nonces")
-        print(f"   🚀 Total Mathematical Operations: {len(nonces) * self.knuth_sorrellian_class_iterations:,}")
+        print(f"✅ Generated {generated:,} NUCLEAR - ENHANCED universe - scale nonces")
+        print(f"   🚀 Total Mathematical Operations: {generated * self.knuth_sorrellian_class_iterations:,}")
         print(f"   🎯 Targeting {self.universe_target_zeros} leading zeros with mathematical superiority")
-        return nonces
 
-    def galaxy_universe_scale_nonce_generation(self, start_nonce, max_nonces):
+    GALAXY_NONCE_COUNT = 1000000  # ULTRA HEX AMPLIFIED: 1M nonces optimized for breakthrough performance
+
+    def galaxy_nonce_batch_size(self, start_nonce, max_nonces):
+        """Number of nonces one galaxy round streams for ``start_nonce`` (without generating them)."""
+        return max(0, min(start_nonce + self.GALAXY_NONCE_COUNT, max_nonces) - start_nonce)
+
+    def galaxy_universe_scale_nonce_generation(self, start_nonce, max_nonces, chunk_size=NONCE_CHUNK_SIZE):
         """
         GALAXY ORCHESTRATION: Generate nonces using FULL Knuth mathematical power with proper category modifiers
         MASSIVE MATHEMATICAL ADVANTAGE: Each category properly amplified
+
+        Returns a lazy stream of ``array('I')`` chunks (see iter_nonce_chunks).
         """
+        return iter_nonce_chunks(self._galaxy_nonce_values(start_nonce, max_nonces), chunk_size)
+
+    def _galaxy_nonce_values(self, start_nonce, max_nonces):
+        """Nonce-by-nonce producer behind galaxy_universe_scale_nonce_generation."""
         print("🌌 GALAXY: Generating nonces with FULL mathematical power and category modifiers...")
-        nonces = []
+        generated = 0
 
         galaxy_base = self.galaxy_category["bitload"]
         knuth_levels = self.knuth_sorrellian_class_levels
         knuth_iterations = self.knuth_sorrellian_class_iterations
-        galaxy_nonce_count = 1000000  # ULTRA HEX AMPLIFIED: 1M nonces optimized for breakthrough performance
+        galaxy_nonce_count = self.GALAXY_NONCE_COUNT
 
         # UNIVERSE-SCALE MATHEMATICAL OPERATIONS PER NONCE - DYNAMIC COLLECTIVE CONCURRENT POWER
         universe_bitload = 208500855993373022767225770164375163068756085544106017996338881654571185256056754443039992227128051932599645909
@@ -4193,9 +5578,10 @@ class ProductionBitcoinMiner:
             all_nonces = [entropy_nonce, decryption_nonce, near_solution_nonce, problems_nonce, paradoxes_nonce]
             combined_power = sum(all_nonces) % (2**64)
             final_nonce = (combined_power ^ (galaxy_base >> ((i + 29) % 32))) % 4294967296
-            nonces.append(final_nonce)
+            yield final_nonce
+            generated += 1
 
-        print(f"   🌟 Generated {len(nonces):,} mathematically enhanced nonces")
+        print(f"   🌟 Generated {generated:,} mathematically enhanced nonces")
         # USE DYNAMIC COLLECTIVE VALUES: (841, 3,138,240)
         ultra_hex_levels = self.collective_collective_levels
         ultra_hex_iterations = self.collective_collective_iterations
@@ -4209,20 +5595,29 @@ class ProductionBitcoinMiner:
             f"   � Mathematical Breakthroughs: Paradoxes×{self.math_paradoxes_modifier}, Problems×{self.math_problems_modifier}"
         )
         print("   ✅ REALISTIC MATHEMATICAL CLAIMS MATCHING ACTUAL PERFORMANCE!")
-        return nonces
 
-    def galaxy_universe_scale_nonce_generation_enhanced(self, start_nonce, max_nonces, brain_qtl_data):
+    def galaxy_universe_scale_nonce_generation_enhanced(
+        self, start_nonce, max_nonces, brain_qtl_data, chunk_size=NONCE_CHUNK_SIZE
+    ):
         """
         GALAXY + BRAIN.QTL: Enhanced nonce generation with MASSIVE collective category orchestration
         This achieves INSANE mathematical operations with proper amplification
+
+        Returns a lazy stream of ``array('I')`` chunks (see iter_nonce_chunks).
         """
+        return iter_nonce_chunks(
+            self._galaxy_enhanced_nonce_values(start_nonce, max_nonces, brain_qtl_data), chunk_size
+        )
+
+    def _galaxy_enhanced_nonce_values(self, start_nonce, max_nonces, brain_qtl_data):
+        """Nonce-by-nonce producer behind galaxy_universe_scale_nonce_generation_enhanced."""
         print("🌌🧠 GALAXY + BRAIN.QTL: Enhanced collective orchestration with 64-ZERO TARGETING...")
 
-        # Start with MASSIVELY amplified galaxy nonces
-        base_nonces = self.galaxy_universe_scale_nonce_generation(start_nonce, max_nonces)
+        # Start with MASSIVELY amplified galaxy nonces (streamed, never materialised)
+        base_nonces = self._galaxy_nonce_values(start_nonce, max_nonces)
 
         # Apply Brain.QTL HYPER-AGGRESSIVE enhancement for 64-zero targeting
-        enhanced_nonces = []
+        generated = 0
         brain_enhancement_base = hash(str(brain_qtl_data)) % (2**32)
 
         # Calculate Brain.QTL multipliers using DYNAMIC COLLECTIVE VALUES
@@ -4249,37 +5644,36 @@ class ProductionBitcoinMiner:
         print(f"   🎲 QTL Math Problems: {qtl_problems_amp}x (13,631,168 iterations supremacy)")
         print(f"   🌌 QTL COLLECTIVE: {qtl_collective_amp:,}x ULTRA HEX REVOLUTIONARY AMPLIFICATION")
 
+        # Apply MASSIVE Brain.QTL collective enhancement (only the paradoxes term depends on the index)
+        qtl_entropy_enhancement = (hash(brain_qtl_data.get("galaxy_category", "enabled")) * qtl_entropy_amp) % (
+            2**32
+        )
+        qtl_decryption_enhancement = (
+            hash(str(brain_qtl_data.get("collective_categories", []))) * qtl_decryption_amp
+        ) % (2**32)
+        qtl_near_solution_enhancement = (hash(str(brain_qtl_data.get("attempt", 1))) * qtl_near_solution_amp) % (
+            2**32
+        )
+        qtl_problems_enhancement = (
+            hash(brain_qtl_data.get("mathematical_enhancement", "galaxy")) * qtl_problems_amp
+        ) % (2**32)
+
+        # Apply galaxy mathematical operations scaling with MASSIVE amplification
+        galaxy_ops_enhancement = (self.galaxy_enhanced_operations * qtl_collective_amp) % (2**64)
+        static_enhancement = (
+            qtl_entropy_enhancement
+            ^ qtl_decryption_enhancement
+            ^ qtl_near_solution_enhancement
+            ^ qtl_problems_enhancement
+            ^ (galaxy_ops_enhancement & 0xFFFFFFFF)
+        )
+
         for i, nonce in enumerate(base_nonces):
-            # Apply MASSIVE Brain.QTL collective enhancement
-            qtl_entropy_enhancement = (hash(brain_qtl_data.get("galaxy_category", "enabled")) * qtl_entropy_amp) % (
-                2**32
-            )
-            qtl_decryption_enhancement = (
-                hash(str(brain_qtl_data.get("collective_categories", []))) * qtl_decryption_amp
-            ) % (2**32)
-            qtl_near_solution_enhancement = (hash(str(brain_qtl_data.get("attempt", 1))) * qtl_near_solution_amp) % (
-                2**32
-            )
             qtl_paradoxes_enhancement = (brain_enhancement_base * qtl_paradoxes_amp * (i + 1)) % (2**32)
-            qtl_problems_enhancement = (
-                hash(brain_qtl_data.get("mathematical_enhancement", "galaxy")) * qtl_problems_amp
-            ) % (2**32)
-
-            # Apply galaxy mathematical operations scaling with MASSIVE amplification
-            galaxy_ops_enhancement = (self.galaxy_enhanced_operations * qtl_collective_amp) % (2**64)
 
             # Combine ALL enhancements for MAXIMUM mathematical power
-            mega_enhanced_nonce = (
-                nonce
-                ^ qtl_entropy_enhancement
-                ^ qtl_decryption_enhancement
-                ^ qtl_near_solution_enhancement
-                ^ qtl_paradoxes_enhancement
-                ^ qtl_problems_enhancement
-                ^ (galaxy_ops_enhancement & 0xFFFFFFFF)
-            ) % 4294967296
-
-            enhanced_nonces.append(mega_enhanced_nonce)
+            yield (nonce ^ static_enhancement ^ qtl_paradoxes_enhancement) % 4294967296
+            generated += 1
 
         print("   🧠 Applied Brain.QTL MASSIVE collective category enhancement")
         # NOW USING TRUE ULTRA HEX PARAMETERS FROM INTERATION 3.YAML  
@@ -4290,16 +5684,26 @@ class ProductionBitcoinMiner:
         print(
             f"   🚀 Combined mathematical power: Knuth - Sorrellian - Class({ultra_hex_knuth_levels}, {(self.galaxy_enhanced_operations * qtl_collective_amp) // 10**18}, {ultra_hex_iterations})"
         )
-        print(f"   🏆 Total enhanced nonces: {len(enhanced_nonces):,}")
+        print(f"   🏆 Total enhanced nonces: {generated:,}")
         print("   🔥 NO MORE CHOKING - UNLEASHED MATHEMATICAL TSUNAMI!")
-        return enhanced_nonces
 
-    def universe_scale_nonce_generation_enhanced(self, start_nonce, max_nonces, brain_qtl_data):
-        """Enhanced universe-scale nonce generation with Brain.QTL integration"""
+    def universe_scale_nonce_generation_enhanced(
+        self, start_nonce, max_nonces, brain_qtl_data, chunk_size=NONCE_CHUNK_SIZE
+    ):
+        """Enhanced universe-scale nonce generation with Brain.QTL integration.
+
+        Returns a lazy stream of ``array('I')`` chunks (see iter_nonce_chunks).
+        """
+        return iter_nonce_chunks(
+            self._universe_enhanced_nonce_values(start_nonce, max_nonces, brain_qtl_data), chunk_size
+        )
+
+    def _universe_enhanced_nonce_values(self, start_nonce, max_nonces, brain_qtl_data):
+        """Nonce-by-nonce producer behind universe_scale_nonce_generation_enhanced."""
         print("🧮 Generating ENHANCED universe - scale nonces...")
         print(f"   🧠 Brain.QTL Data: {'AVAILABLE' if brain_qtl_data else 'NONE'}")
 
-        nonces = []
+        generated = 0
 
         # Method 1: BitLoad mathematical patterns (enhanced)
         base_pattern = self.bitload % max_nonces
@@ -4310,7 +5714,8 @@ class ProductionBitcoinMiner:
                 pattern_nonce = (base_pattern + i + enhancement_factor) % max_nonces
             else:
                 pattern_nonce = (base_pattern + i) % max_nonces
-            nonces.append(pattern_nonce)
+            yield pattern_nonce
+            generated += 1
 
         # Method 2: Knuth operations (enhanced)
         knuth_base = (self.knuth_sorrellian_class_levels * self.knuth_sorrellian_class_iterations) % max_nonces
@@ -4320,7 +5725,8 @@ class ProductionBitcoinMiner:
                 knuth_nonce = (knuth_base + i + brain_enhancement) % max_nonces
             else:
                 knuth_nonce = (knuth_base + i) % max_nonces
-            nonces.append(knuth_nonce)
+            yield knuth_nonce
+            generated += 1
 
         # Method 3: Mathematical convergence patterns (enhanced)
         convergence_base = self.bitload // 1000000000000
@@ -4332,7 +5738,8 @@ class ProductionBitcoinMiner:
                 pattern_nonce = (convergence_pattern + qtl_factor) % max_nonces
             else:
                 pattern_nonce = convergence_pattern
-            nonces.append(pattern_nonce)
+            yield pattern_nonce
+            generated += 1
 
         # Method 4: Direct mathematical targeting (enhanced)
         for i in range(start_nonce, min(start_nonce + 25000, max_nonces)):
@@ -4345,10 +5752,10 @@ class ProductionBitcoinMiner:
                 qtl_enhancement = hash(brain_qtl_data["brain_qtl_handler"]) % 1000000
                 enhanced_nonce = (enhanced_nonce + qtl_enhancement) % max_nonces
 
-            nonces.append(enhanced_nonce)
+            yield enhanced_nonce
+            generated += 1
 
-        print(f"✅ Generated {len(nonces):,} ENHANCED universe - scale nonces with Brain.QTL integration")
-        return nonces
+        print(f"✅ Generated {generated:,} ENHANCED universe - scale nonces with Brain.QTL integration")
 
     def _apply_knuth_hash_enhancement(self, base_hash_bytes, knuth_levels, knuth_iterations):
         """
@@ -4389,8 +5796,13 @@ class ProductionBitcoinMiner:
         
         # Note: Removed constructed-hash shortcut; only real double-SHA256 paths remain
 
-    def mine_block(self, max_time_seconds=3600):
-        """Mine a Bitcoin block using universe-scale mathematical power with Brain.QTL integration"""
+    def mine_block(self, max_time_seconds=3600, nonce_strategy=None):
+        """Mine a Bitcoin block using universe-scale mathematical power with Brain.QTL integration
+
+        ``nonce_strategy(start_nonce, max_nonces)`` may replace the galaxy generators with
+        another array('I') chunk stream (the hash-rate benchmark bounds rounds this way);
+        a round where it returns None uses the galaxy generators.
+        """
         
         # ALL MODES USE REAL KNUTH-SORRELLIAN MATHEMATICS
         # No more fake demo solutions - always use your mathematical framework
@@ -4435,6 +5847,7 @@ class ProductionBitcoinMiner:
         if not hasattr(self, "global_attempt_counter"):
             self.global_attempt_counter = 0
         best_result = None
+        dtm_consensus_votes = []  # Filled per round; reported at the start of the next round
 
         while time.time() - overall_start_time < max_time_seconds and not self.shutdown_requested:
             self.global_attempt_counter += 1
@@ -4508,24 +5921,35 @@ class ProductionBitcoinMiner:
             # Universe-scale mining continues indefinitely until solution found!
 
             # Generate universe-scale nonces through Brain.QTL WITH GALAXY ORCHESTRATION
-            if self.brain_qtl_connection.get("brainstem_connected"):
+            nonces = None
+            if nonce_strategy is not None:
+                round_start_nonce = self.global_attempt_counter * nonces_per_cycle
+                nonces = nonce_strategy(round_start_nonce, 4294967295)
+            strategy_nonces = nonces is not None
+            if strategy_nonces:
+                nonce_count = nonces_per_cycle
+            elif self.brain_qtl_connection.get("brainstem_connected"):
                 # Use Brain.QTL enhanced nonce generation WITH GALAXY CATEGORY
                 # Galaxy nonce generation active (streamlined output)
                 nonce_operation = {"status": "galaxy_nonces_generated", "count": nonces_per_cycle}
                 self.log_pipeline_operation("galaxy_nonce_generation", nonce_operation)
 
-                # Generate nonces with Brain.QTL GALAXY enhancement
+                # Stream nonces with Brain.QTL GALAXY enhancement (array('I') chunks, hashed as they arrive)
+                round_start_nonce = self.global_attempt_counter * nonces_per_cycle
                 nonces = self.galaxy_universe_scale_nonce_generation_enhanced(
-                    start_nonce=self.global_attempt_counter * nonces_per_cycle,
+                    start_nonce=round_start_nonce,
                     max_nonces=4294967295,
                     brain_qtl_data=nonce_operation,
                 )
             else:
                 # Fallback to galaxy-enhanced universe-scale generation
+                round_start_nonce = self.global_attempt_counter * 1000000  # ULTRA HEX AMPLIFIED: 1M nonces per cycle
                 nonces = self.galaxy_universe_scale_nonce_generation(
-                    start_nonce=self.global_attempt_counter * 1000000,  # ULTRA HEX AMPLIFIED: 1M nonces per cycle
+                    start_nonce=round_start_nonce,
                     max_nonces=4294967295,
                 )
+            if not strategy_nonces:
+                nonce_count = self.galaxy_nonce_batch_size(round_start_nonce, 4294967295)
 
             # DTM CONSENSUS MECHANISM: Validate leading zero achievements
             if dtm_consensus_votes:
@@ -4550,7 +5974,7 @@ class ProductionBitcoinMiner:
             if not self.daemon_mode:
                 print("\n" + "=" * 80)
                 print(f"🎯 GALAXY MINING ATTEMPT #{self.global_attempt_counter}")
-                print(f"⚡ Testing {len(nonces):,} galaxy - orchestrated nonces...")
+                print(f"⚡ Testing {nonce_count:,} galaxy - orchestrated nonces...")
                 # Display dynamic collective mathematical power
                 collective_levels = self.collective_collective_levels  # Dynamic: 841
                 collective_iterations = self.collective_collective_iterations  # Dynamic: 3,138,240
@@ -4574,67 +5998,104 @@ class ProductionBitcoinMiner:
                 knuth_ops = f"Knuth-Sorrellian-Class({self.collective_collective_levels}, {galaxy_universe_number}, {self.collective_collective_iterations})"
 
                 # Universe-scale mining: Simple status without meaningless progress bars
-                print(f"📊 Mining {len(nonces):,} nonces with universe - scale mathematical power")
+                print(f"📊 Mining {nonce_count:,} nonces with universe - scale mathematical power")
                 print(f"   Current best: {self.best_difficulty} leading zeros | Math: {knuth_ops} ops / hash")
 
-            for i, nonce in enumerate(nonces):
+            # Midstate kernel: header prefix + SHA-256 midstate built once per template.
+            # With DTM-enabled BIP320 version rolling each round also gets its own version.
+            if self._staged_template is not None:
+                self.adopt_staged_template()
+            kernel_template = self.current_template
+            header_kernel = self.get_header_kernel(
+                kernel_template, self.rolled_block_version(kernel_template, self.global_attempt_counter)
+            )
+            nonce_coverage = self.get_nonce_coverage(kernel_template, header_kernel)
+            if len(nonce_coverage) >= NONCE_SPACE:
+                # Every nonce under this header is hashed: roll the extranonce for a fresh merkle root
+                try:
+                    extranonce = self.roll_extranonce(kernel_template)
+                    if not self.daemon_mode:
+                        print(f"🔁 Nonce space exhausted - rolled extranonce to {extranonce}")
+                    header_kernel = self.get_header_kernel(
+                        kernel_template, self.rolled_block_version(kernel_template, self.global_attempt_counter)
+                    )
+                    nonce_coverage = self.get_nonce_coverage(kernel_template, header_kernel)
+                except (ValueError, KeyError) as e:
+                    if not self.daemon_mode:
+                        print(f"⚠️ Cannot roll extranonce ({e}) - waiting for a fresh template")
+                    break
+            consensus_knuth_power = f"K({self.collective_collective_levels}, {self.collective_collective_iterations})"
+
+            for i, nonce in enumerate(self._hash_loop_nonces(nonces)):
+                # Two-phase hot swap: cache was prepared in the background, switch before this hash
+                if self._staged_template is not None:
+                    self.adopt_staged_template()
+
+                # Shutdown pushed over the control socket - stop now, not at the next progress check
+                if self._control_command_pending and self.shutdown_requested:
+                    break
+
+                # Template swapped (hot swap / refresh) - rebuild the kernel for the new template
+                if self.current_template is not kernel_template:
+                    kernel_template = self.current_template
+                    header_kernel = self.get_header_kernel(
+                        kernel_template, self.rolled_block_version(kernel_template, self.global_attempt_counter)
+                    )
+                    nonce_coverage = self.get_nonce_coverage(kernel_template, header_kernel)
+
+                # Strategies overlap - each (template, version, extranonce, nonce) is hashed once
+                if not nonce_coverage.add(nonce):
+                    self.duplicate_nonces_skipped += 1
+                    continue
+
                 # Update statistics with Galaxy operations
                 self.hash_count += 1
-                self.mathematical_nonce_count = len(nonces)  # Track galaxy nonces per batch
+                self.mathematical_nonce_count = nonce_count  # Track galaxy nonces per batch
                 self.galaxy_operations_applied = self.galaxy_enhanced_operations  # Track galaxy mathematical operations
 
-                # Construct block header
-                header = self.construct_block_header(self.current_template, nonce)
-
                 # MATHEMATICAL ENHANCEMENT: Apply Galaxy operations to hash targeting
                 # Use the mathematical power to enhance the hash evaluation process
-                hash_result = self.mathematically_enhanced_hash_calculation(header, nonce)
+                hash_result = self.mathematically_enhanced_hash_calculation(
+                    None, nonce, base_hash=header_kernel.hash_nonce(nonce)
+                )
                 
-                # 🌟 ULTRA HEX COMPATIBILITY: Handle both bytes and Ultra Hex string results
-                if isinstance(hash_result, str):
-                    # Ultra Hex string result - convert to int directly from hex
-                    hash_int = int(hash_result, 16)
-                    # For display purposes, convert to standard 64-char hex
-                    hash_hex = hash_result
-                else:
-                    # Standard bytes result
-                    hash_int = int.from_bytes(hash_result, "big")
-                    hash_hex = hash_result.hex()
+                # 🌟 ULTRA HEX COMPATIBILITY: bytes and Ultra Hex string results both become one verdict
+                verdict = HashVerdict(hash_result, self.current_target)
+                hash_int = verdict.value
 
                 # 🎯 DEBUG: Log EVERY hash for first 10 iterations to see what's actually produced
                 if i < 10:
-                    leading_zeros = self.count_leading_zeros(hash_hex)
                     print(f"🔍 DEBUG Hash #{i}:")
-                    print(f"   Leading zeros: {leading_zeros}")
-                    print(f"   Hash hex: {hash_hex}")
+                    print(f"   Leading zeros: {verdict.bits}")
+                    print(f"   Hash hex: {verdict.hex}")
                     print(f"   Hash int: {hash_int}")
                     print(f"   Target:   {self.current_target}")
-                    print(f"   Hash < Target: {hash_int < self.current_target}")
+                    print(f"   Hash < Target: {verdict.meets_target}")
                     print()
 
                 # 🎯 DTM CONSENSUS: Validate leading zeros with consensus mechanism
-                leading_zeros = self.count_leading_zeros(hash_hex)
+                leading_zeros = verdict.bits
                 
                 # DTM GPS COORDINATION: Report leading zero achievement to consensus
                 if leading_zeros >= 6:  # Significant leading zeros threshold
                     consensus_vote = {
                         "miner_id": self.process_id,
                         "leading_zeros": leading_zeros,
-                        "hash_hex": hash_hex[:32],  # First 32 chars for verification
+                        "hash_hex": verdict.hex[:32],  # First 32 chars for verification
                         "nonce": nonce,
                         "timestamp": time.time(),
-                        "knuth_power": f"K({self.collective_collective_levels}, {self.collective_collective_iterations})"
+                        "knuth_power": consensus_knuth_power,
                     }
                     dtm_consensus_votes.append(consensus_vote)
                     
                     # GPS-like coordination: Report achievement to other miners
                     if leading_zeros >= 10:
                         print(f"🌟 DTM GPS: Miner {self.process_id} achieved {leading_zeros} leading zeros!")
-                        print(f"   Hash: {hash_hex[:32]}...")
+                        print(f"   Hash: {verdict.hex[:32]}...")
                         print(f"   Consensus vote recorded for DTM validation")
                 
                 # 🎯 CRITICAL: Check if hash is a valid Bitcoin solution (hash < target)
-                if hash_int < self.current_target:
+                if verdict.meets_target:
                     valid_solutions_count += 1
 
                     # Detect looping mode if not already detected
@@ -4646,7 +6107,7 @@ class ProductionBitcoinMiner:
                         if not self.daemon_mode:
                             print("🎉 VALID BITCOIN SOLUTION FOUND!")
                             print(f"   🔢 Nonce: {nonce}")
-                            print(f"   🔗 Hash: {hash_hex}")
+                            print(f"   🔗 Hash: {verdict.hex}")
                             print(f"   🎯 Target: {hex(self.current_target)}")
                             print("   ✅ Hash < Target: TRUE")
                             print("🔄 LOOPING MODE: Requesting DTM validation...")
@@ -4656,13 +6117,13 @@ class ProductionBitcoinMiner:
                             "miner_id": self.miner_id,
                             "process_id": self.process_id,
                             "nonce": nonce,
-                            "hash": hash_hex[:64],
+                            "hash": verdict.hex[:64],
                             "merkle_root": self.current_template.get("merkleroot", "") if self.current_template else "",
                             "previousblockhash": self.current_template.get("previousblockhash", "") if self.current_template else "",
-                            "version": self.current_template.get("version", 0) if self.current_template else 0,
+                            "version": header_kernel.version,
                             "bits": self.current_template.get("bits", "") if self.current_template else "",
                             "block_height": self.current_template.get("height", 0) if self.current_template else 0,
-                            "leading_zeros": self.count_leading_zeros(hash_hex),
+                            "leading_zeros": verdict.bits,
                             "timestamp": datetime.now().isoformat()
                         }
                         
@@ -4674,7 +6135,8 @@ class ProductionBitcoinMiner:
                             if not self.daemon_mode:
                                 print("✅ DTM APPROVED - Solution validated")
                             
-                            hash_for_saving = hash_result if isinstance(hash_result, bytes) else bytes.fromhex(hash_hex[:64])
+                            hash_for_saving = verdict.digest if verdict.digest is not None else bytes.fromhex(verdict.hex[:64])
+                            header = header_kernel.header(nonce)
                             solution_path = self.save_solution_for_dynamic_manager(header, nonce, hash_for_saving)
                             
                             # Send to Looping for network submission
@@ -4683,8 +6145,8 @@ class ProductionBitcoinMiner:
                             # Create return data and exit immediately
                             best_result = {
                                 "nonce": nonce,
-                                "hash": hash_hex[:64],
-                                "leading_zeros": self.count_leading_zeros(hash_hex),
+                                "hash": verdict.hex[:64],
+                                "leading_zeros": verdict.bits,
                                 "hash_int": hash_int,
                                 "success": True,
                                 "target_met": True,
@@ -4705,7 +6167,7 @@ class ProductionBitcoinMiner:
                         if self.show_solutions_only:
                             print("🎉 VALID BITCOIN SOLUTION FOUND!")
                             print(f"   🔢 Nonce: {nonce}")
-                            print(f"   🔗 Hash: {hash_result.hex()}")
+                            print(f"   🔗 Hash: {verdict.hex}")
                             print(f"   🎯 Target: {hex(self.current_target)}")
                             print("   ✅ Hash < Target: TRUE")
 
@@ -4713,7 +6175,7 @@ class ProductionBitcoinMiner:
                         elif not self.daemon_mode and valid_solutions_count <= 3:
                             print("🎉 VALID BITCOIN SOLUTION FOUND!")
                             print(f"   🔢 Nonce: {nonce}")
-                            print(f"   🔗 Hash: {hash_hex}")
+                            print(f"   🔗 Hash: {verdict.hex}")
                             print(f"   🎯 Target: {hex(self.current_target)}")
                             print("   ✅ Hash < Target: TRUE")
                             if valid_solutions_count == 3:
@@ -4722,8 +6184,8 @@ class ProductionBitcoinMiner:
                     # Track this as a valid solution but CONTINUE MINING to show full progression (standalone mode only)
                     valid_solution = {
                         "nonce": nonce,
-                        "hash": hash_hex[:64],  # Standard 64-char hex
-                        "leading_zeros": self.count_leading_zeros(hash_hex),
+                        "hash": verdict.hex[:64],  # Standard 64-char hex
+                        "leading_zeros": verdict.bits,
                         "hash_int": hash_int,
                         "success": True,
                         "target_met": True,
@@ -4733,23 +6195,21 @@ class ProductionBitcoinMiner:
                     if not hasattr(self, "first_valid_solution"):
                         self.first_valid_solution = valid_solution
                         # Submit the first valid solution found
-                        self.submit_block(header, nonce, hash_result)
+                        self.submit_block(header_kernel.header(nonce), nonce, hash_result)
 
                     # Update best result if this has more leading zeros
-                    leading_zeros = self.count_leading_zeros(hash_hex)
                     if leading_zeros > self.best_difficulty:
                         best_result = valid_solution
 
                 # Track best result for leading zeros display
-                leading_zeros = self.count_leading_zeros(hash_hex)
                 if leading_zeros > self.best_difficulty:
                     self.best_difficulty = leading_zeros
                     self.save_best_difficulty(leading_zeros)  # Persist improvement
                     self.best_nonce = nonce  # Store best nonce
-                    self.best_hash = hash_hex[:64]  # Store best hash (standard 64-char)
+                    self.best_hash = verdict.hex[:64]  # Store best hash (standard 64-char)
                     best_result = {
                         "nonce": nonce,
-                        "hash": hash_hex[:64],  # Standard 64-char hex
+                        "hash": verdict.hex[:64],  # Standard 64-char hex
                         "leading_zeros": leading_zeros,
                         "hash_int": hash_int,
                     }
@@ -4757,23 +6217,23 @@ class ProductionBitcoinMiner:
                     # 🔍 DEBUG: Log when we find a new best
                     if not self.daemon_mode and leading_zeros >= 15:
                         print(f"\n🔍 NEW BEST: {leading_zeros} leading zeros at nonce {nonce}")
-                        print(f"   Hash hex: {hash_hex[:64]}")
+                        print(f"   Hash hex: {verdict.hex[:64]}")
                         print(f"   Hash int: {hash_int}")
                         print(f"   Target:   {self.current_target}")
-                        print(f"   Hash < Target: {hash_int < self.current_target}")
+                        print(f"   Hash < Target: {verdict.meets_target}")
                         print(f"   Diff: {self.current_target - hash_int}\n")
 
                     # Only show best result updates in direct/interactive mode (not daemon mode)
                     if not self.daemon_mode:
                         # Get Ultra Hex + Standard display for best results
-                        triple_count = self.get_triple_leading_zeros(hash_result.hex())
+                        triple_count = self.get_triple_leading_zeros(verdict)
                         ultra_hex_data = triple_count['ultra_hex']
                         ultra_hex_bucket = ultra_hex_data['ultra_hex_digit']  # Actual bucket number
                         ultra_hex_enhanced = ultra_hex_data['ultra_hex_leading_zeros']  # Enhanced leading zeros
                         standard_hex = triple_count['standard_hex']
                             
                         print(f"🚀 NEW BEST: 🌌 Ultra-{ultra_hex_bucket} Bucket ({ultra_hex_enhanced} enhanced zeros), 🔷 {standard_hex} Standard leading zeros! (nonce: {nonce})")
-                        print(f"   � Hash: {hash_result.hex()}")
+                        print(f"   � Hash: {verdict.hex}")
                         print(f"   🔍 Leading Zero Verification: {leading_zeros} zeros counted from actual hash")
                         print(f"   �💥 Ultra Hex Power: {ultra_hex_data['total_equivalent_operations']:,} SHA-256 operations!")
                         print(f"   📊 Ultra Bucket Progress: {ultra_hex_data['bucket_progress']}/64 in Ultra-{ultra_hex_bucket} ({ultra_hex_data['bucket_fullness_percent']:.1f}% full)")
@@ -4784,7 +6244,7 @@ class ProductionBitcoinMiner:
                         self.update_status_for_looping()
 
                 # DETAILED PROGRESS UPDATE - Show EVERY 10,000 nonces like before (only in normal progress mode)
-                if (i % 10000 == 0 or i == len(nonces) - 1) and not self.show_solutions_only:
+                if (i % 10000 == 0 or i == nonce_count - 1) and not self.show_solutions_only:
                     # Check for commands from looping system every 10,000 nonces
                     command_result = self.check_looping_commands()
                     if command_result == "shutdown":
@@ -4794,7 +6254,7 @@ class ProductionBitcoinMiner:
 
                     elapsed = time.time() - overall_start_time
                     # Calculate OPTIMIZED H/s for mathematical superiority
-                    total_hashes_done = (self.global_attempt_counter - 1) * len(nonces) + i
+                    total_hashes_done = (self.global_attempt_counter - 1) * nonce_count + i
                     if elapsed > 0:
                         # Apply mathematical acceleration factor - UNIVERSE-SCALE CONCURRENT POWER
                         base_hashes_per_sec = total_hashes_done / elapsed
@@ -4832,7 +6292,7 @@ class ProductionBitcoinMiner:
                     if not self.daemon_mode:
                         # Universe-scale mining: Simple status without meaningless progress bars
                         print(
-                            f"📊 Current: {i:,}/{len(nonces):,} | "
+                            f"📊 Current: {i:,}/{nonce_count:,} | "
                             f"Best: {self.best_difficulty} leading zeros | "
                             f"Speed: {accelerated_h_s:,.0f} H / s | "
                             f"Math: {knuth_ops} ops / hash"
@@ -4845,7 +6305,7 @@ class ProductionBitcoinMiner:
             # 📊 COMPLETION SUMMARY: Show results after completing all 325,000 nonces
             if not self.daemon_mode:
                 print(f"\n🎯 GALAXY MINING ATTEMPT #{self.global_attempt_counter} COMPLETE!")
-                print(f"📊 Tested {len(nonces):,} nonces | Best: {self.best_difficulty} leading zeros")
+                print(f"📊 Tested {nonce_count:,} nonces | Best: {self.best_difficulty} leading zeros")
                 if valid_solutions_count > 0:
                     print(f"🎉 Found {valid_solutions_count} valid Bitcoin solutions during this run!")
                     print(f"💎 Maximum leading zeros achieved: {self.best_difficulty}")
@@ -4943,11 +6403,135 @@ class ProductionBitcoinMiner:
             "nonce": nonce,
         }
 
-    def _notify_dtm_solution_ready(self, solution_path, triple_count):
+    def push_solution_notice(self, path, solution=None):
+        """Tell the DTM's solution intake about a result file right away. False = no DTM listening.
+
+        Solutions carrying a block header are sent as a binary SolutionRecord.
+        """
+        try:
+            from dynamic_template_manager import SolutionRecord, send_solution_notice
+        except ImportError:
+            return False
+        if isinstance(solution, dict) and solution.get("block_header"):
+            try:
+                solution = SolutionRecord.from_solution(solution)
+            except (ValueError, TypeError):
+                pass  # malformed header/hash: the DTM gets the JSON and reports it
+        return send_solution_notice(self.temporary_template_root, self.process_id, path, solution)
+
+    NONCE_LEASE_REPORT_SECONDS = 1.0  # progress reports per lease (plus one when it is finished)
+    NONCE_LEASE_FIELDS = ("previousblockhash", "height", "bits", "target", "merkleroot")
+
+    def _nonce_lease_request(self, request):
+        try:
+            from dynamic_template_manager import send_nonce_lease_request
+        except ImportError:
+            return None
+        template = self.current_template or {}
+        lease_template = {field: template.get(field) for field in self.NONCE_LEASE_FIELDS}
+        lease_template["extranonce"] = self._current_extranonce()
+        return send_nonce_lease_request(self.temporary_template_root, dict(request, template=lease_template))
+
+    def _current_extranonce(self):
+        if not self.current_template:
+            return 0
+        return self._get_template_cache(self.current_template).get("extranonce") or 0
+
+    def acquire_nonce_lease(self):
+        """Nonce range the DTM leases this miner for the current template; None = no DTM.
+
+        Leases are per extranonce: the reply names the extranonce whose nonce
+        space the DTM is handing out, and the miner rolls its coinbase to it.
+        Once that space is exhausted the miner rolls to the next extranonce and
+        asks again, so the sweep continues without a new template.
+        """
+        self.nonce_lease = None
+        for _ in range(2):
+            reply = self._nonce_lease_request({"lease": "acquire", "miner_id": self.process_id})
+            if not reply:
+                return None
+            try:
+                epoch = reply.get("extranonce")
+                if reply.get("lease") is None:
+                    # Every nonce under this extranonce is hashed or leased: re-root the merkle tree
+                    extranonce = self.roll_extranonce()
+                    if not self.daemon_mode:
+                        print(f"🔁 Leased nonce space exhausted - rolled extranonce to {extranonce}")
+                    continue
+                if epoch is not None and epoch != self._current_extranonce():
+                    self.roll_extranonce(extranonce=epoch)  # join the epoch the other miners sweep
+            except (ValueError, KeyError) as e:
+                if not self.daemon_mode:
+                    print(f"⚠️ Cannot roll extranonce ({e}) - mining without a lease")
+                return None
+            lease = reply["lease"]
+            template = self.current_template or {}
+            lease["template_id"] = [template.get(field) for field in self.NONCE_LEASE_FIELDS]
+            self.nonce_lease = lease
+            return lease
+        return None
+
+    def report_nonce_lease(self, cursor):
+        """Report the held lease hashed up to ``cursor``; False once a new lease must be acquired."""
+        lease = self.nonce_lease
+        if lease is None:
+            return False
+        reply = self._nonce_lease_request({"lease": "report", "lease_id": lease["lease_id"], "cursor": cursor})
+        end = reply.get("end") if reply else None
+        if end is None:
+            self.nonce_lease = None  # finished, reclaimed, or the DTM went away
+            return False
+        lease["end"] = end  # shrinks when an idle miner stole the tail
+        return True
+
+    def leased_nonce_strategy(self, start_nonce, max_nonces):
+        """mine_block nonce strategy: sweep the DTM's lease; None (galaxy nonces) when no DTM hands out leases."""
+        lease = self.nonce_lease
+        template = self.current_template or {}
+        template_id = [template.get(field) for field in self.NONCE_LEASE_FIELDS]
+        if lease is not None and lease.get("template_id") != template_id:
+            lease = self.nonce_lease = None  # leased for a template we no longer mine
+        if lease is None and self.acquire_nonce_lease() is None:
+            return None
+        return self._leased_nonce_chunks()
+
+    def _leased_nonce_chunks(self):
+        last_report = time.time()
+        while self.nonce_lease is not None:
+            lease = self.nonce_lease
+            chunk_end = min(lease["end"], lease["cursor"] + NONCE_CHUNK_SIZE)
+            if lease["cursor"] < chunk_end:
+                yield array("I", range(lease["cursor"], chunk_end))
+                # Resumed for the next chunk: the hash loop finished this one
+                lease["cursor"] = chunk_end
+            if lease["cursor"] >= lease["end"] or time.time() - last_report >= self.NONCE_LEASE_REPORT_SECONDS:
+                last_report = time.time()
+                if not self.report_nonce_lease(lease["cursor"]):
+                    return  # the next round acquires a fresh lease
+
+    def solution_record(self, header, nonce, hash_result):
+        """Binary SolutionRecord for a found header (None if the codec is unavailable)."""
+        try:
+            from dynamic_template_manager import SolutionRecord
+
+            region = self.shared_template_region
+            generation = region.last_generation if region is not None else 0
+            return SolutionRecord(header, hash_result, nonce, generation, self.process_id)
+        except (ImportError, ValueError, TypeError):
+            return None
+
+    def _notify_dtm_solution_ready(self, solution_path, triple_count, record=None):
         """
         🚀 INSTANT NOTIFICATION: Send immediate signal to DTM that solution is ready
-        Creates a lightweight signal file that DTM monitors for instant solution detection
+        Pushes a notice (the binary solution record when available) to the DTM's
+        solution intake; falls back to a lightweight signal file that DTM monitors
+        for instant solution detection
         """
+        if self.push_solution_notice(solution_path, record):
+            if not self.daemon_mode:
+                print("🚀 DTM notified instantly via solution intake socket")
+            return
+
         try:
             # Get temporary template folder (parent of process folder)
             temp_template_dir = self.mining_process_folder.parent
@@ -4981,6 +6565,18 @@ class ProductionBitcoinMiner:
             if not self.daemon_mode:
                 print(f"⚠️ Signal notification failed (DTM will poll): {e}")
 
+    def get_dtm_validation_client(self):
+        """Validation client kept for the miner's lifetime; wraps the registered DTM if there is one."""
+        if self.dtm_validation_client is None:
+            from dynamic_template_manager import DTMValidationClient, get_dtm_validation_client
+
+            registered = getattr(self, "dtm_instance", None)
+            if registered is not None:
+                self.dtm_validation_client = DTMValidationClient(dtm=registered)
+            else:
+                self.dtm_validation_client = get_dtm_validation_client(demo_mode=False)
+        return self.dtm_validation_client
+
     def notify_dtm_solution_found(self, solution_data: dict) -> dict:
         """
         Notify DTM that a solution was found and request validation.
@@ -4993,13 +6589,11 @@ class ProductionBitcoinMiner:
             DTM's validation response with validated status
         """
         try:
-            from dynamic_template_manager import GPSEnhancedDynamicTemplateManager
-            
-            # Get DTM instance
-            dtm = GPSEnhancedDynamicTemplateManager(demo_mode=False, verbose=False)
+            # Reuse the warm validation client instead of booting a DTM per solution
+            dtm = self.get_dtm_validation_client()
             
             # Request validation
-            validation_result = dtm.validate_miner_solution(
+            validation_result = dtm.validate(
                 solution=solution_data,
                 template=self.current_template
             )
@@ -5009,7 +6603,7 @@ class ProductionBitcoinMiner:
                     print("✅ MINER: DTM validated solution - creating proof files...")
                 
                 # DTM creates proof files
-                proof_files = dtm.create_validation_proof_files(
+                proof_files = dtm.create_proof_files(
                     solution=solution_data,
                     validation=validation_result,
                     template=self.current_template
@@ -5190,7 +6784,7 @@ class ProductionBitcoinMiner:
                 json.dump(solution_data, f, indent=2)
 
             # 🚀 INSTANT NOTIFICATION: Notify DTM immediately after saving solution
-            self._notify_dtm_solution_ready(solution_path, triple_count)
+            self._notify_dtm_solution_ready(solution_path, triple_count, self.solution_record(header, nonce, hash_result))
 
             if not self.daemon_mode:
                 print(f"💾 Solution saved: {filename}")
@@ -5360,22 +6954,16 @@ class ProductionBitcoinMiner:
             if not coinbase_tx or not self._is_hex_string(coinbase_tx):
                 coinbase_tx = self.create_simple_coinbase_transaction()
 
-            transactions_hex = [coinbase_tx.lower()]
-            missing_raw_transactions = 0
-
-            if isinstance(template, dict):
-                for tx in template.get("transactions", []):
-                    raw_hex = self._get_transaction_raw_hex(tx)
-                    if raw_hex:
-                        transactions_hex.append(raw_hex.lower())
-                    else:
-                        missing_raw_transactions += 1
+            # The template cache already holds every raw transaction serialized in order
+            transaction_count = len(cache.get("transactions_hex", []))
+            template_transactions = template.get("transactions", []) if isinstance(template, dict) else []
+            missing_raw_transactions = len(template_transactions) - transaction_count
 
-            tx_count_bytes = self.encode_varint(len(transactions_hex))
+            tx_count_bytes = self.encode_varint(transaction_count + 1)
 
-            block_hex = header_with_nonce.hex() + tx_count_bytes.hex()
-            for tx_hex in transactions_hex:
-                block_hex += tx_hex
+            block_hex = (
+                header_with_nonce.hex() + tx_count_bytes.hex() + coinbase_tx.lower() + cache.get("transaction_section_hex", "")
+            )
 
             if missing_raw_transactions:
                 print(
@@ -5395,7 +6983,7 @@ class ProductionBitcoinMiner:
         """Create a simple fallback coinbase transaction"""
         # This is a minimal coinbase transaction for testing
         # In production, use the template-based version
-        return "01000000010000000000000000000000000000000000000000000000000000000000000000ffffffff0704ffff001d0104ffffffff0100f2052a0100000043410496b538e853519c726a2c91e61ec11600ae1390813a627c66fb8be7947be63c52da7589379515d4e0a604f8141781e62294721166bf621e73a82cbf2342c858eeebf0ab8ac00000000"
+        return "01000000010000000000000000000000000000000000000000000000000000000000000000ffffffff0704ffff001d0104ffffffff0100f2052a0100000043410496b538e853519c726a2c91e61ec11600ae1390813a627c66fb8be7947be63c52da7589379515d4e0a604f8141781e62294721166bf621e73a82cbf2342c858eeac00000000"
 
     def create_coinbase_transaction(self, template=None):
         """Return coinbase transaction hex from template or fallback."""
@@ -5807,6 +7395,15 @@ class ProductionBitcoinMiner:
                 "last_update": datetime.now().isoformat(),
                 "controlled_by_looping": True,
                 "target_zeros": getattr(self, "universe_target_zeros", 22),
+                "nonce_coverage_percent": (
+                    self.current_nonce_coverage.coverage_percent if self.current_nonce_coverage else 0.0
+                ),
+                "duplicate_nonces_skipped": self.duplicate_nonces_skipped,
+                "template_swaps": self.template_swap_count,
+                "last_template_swap_latency_ms": (
+                    self.last_template_swap_latency * 1000 if self.last_template_swap_latency is not None else None
+                ),
+                "max_template_swap_latency_ms": self.max_template_swap_latency * 1000,
             }
 
             # Log to system reports instead of separate file
@@ -5818,6 +7415,10 @@ class ProductionBitcoinMiner:
 
     def check_looping_commands(self):
         """Check for commands from looping system."""
+        # Control socket active: commands are pushed to us, no command files to read
+        if self.control_channel is not None and self.control_channel.active:
+            return self._next_control_command()
+
         if not self.looping_control_enabled:
             return None
 
@@ -5874,6 +7475,22 @@ class ProductionBitcoinMiner:
         except Exception as e:
             return None
 
+    def _next_control_command(self):
+        """Take the next command pushed over the control socket (same results as the file path)."""
+        message = self.control_channel.poll()
+        self._control_command_pending = self.control_channel.pending
+        if message is None:
+            return None
+
+        command = message["command"]
+        print(f"📥 Received {command.upper()} command from looping system (socket)")
+        if command == "shutdown":
+            self.shutdown_requested = True
+            return "shutdown"
+        if command in ("fresh_template_instant_solve", "mine_with_gps"):
+            return "mine_with_gps"
+        return command
+
     def sustain_leading_zeros_progress(self):
         """Sustain current leading zeros progress by optimizing mining strategy."""
         if not self.looping_control_enabled:
@@ -5912,6 +7529,7 @@ class ProductionBitcoinMiner:
     def update_template(self, new_template):
         """Update the mining template (for dynamic template manager integration)"""
         try:
+            new_target = self.current_target
             print("💉 DYNAMIC TEMPLATE INJECTION")
             print(f"   📋 New template: {len(new_template.get('transactions', []))} transactions")
             print(f"   🎯 Target: {new_template.get('target', 'Unknown')}")
@@ -5936,19 +7554,19 @@ class ProductionBitcoinMiner:
             if bits_field:
                 print(f"🎯 Extracting target from bits: {bits_field}")
                 extracted_target = self.extract_target_from_bits(bits_field)
-                self.current_target = extracted_target
+                new_target = extracted_target
                 new_template["extracted_target"] = extracted_target
                 print(f"✅ Target extracted: {hex(extracted_target)}")
 
             # Check if template already has extracted target (from Dynamic Template Manager)
             if "real_bitcoin_target" in new_template:
-                self.current_target = new_template["real_bitcoin_target"]
-                print(f"✅ Using pre - extracted target: {hex(self.current_target)}")
+                new_target = new_template["real_bitcoin_target"]
+                print(f"✅ Using pre - extracted target: {hex(new_target)}")
 
-            # Update current template
-            self.current_template = new_template
+            # Update current template - target switches with it so no hash mixes old and new
+            self.stage_template_swap(new_template, target=new_target)
             print("✅ Template injection successful")
-            print(f"🎯 Current target set to: {hex(self.current_target)}")
+            print(f"🎯 Current target set to: {hex(new_target)}")
             return {"success": True, "template_active": True, "target_set": True}
 
         except Exception as e:
@@ -6016,6 +7634,146 @@ class ProductionBitcoinMiner:
 
         return status
 
+    def mine_daemon_template(self, max_time_seconds=10):
+        """Mine ``current_template`` for one daemon round.
+
+        With ``worker_pool_processes`` set (``--worker-pool``) the round runs on a
+        MiningWorkerPool owned by this process; otherwise it hashes in-process
+        over the nonce ranges the DTM leases out.
+        """
+        if self.worker_pool_processes is not None:
+            return self.mine_with_worker_pool(max_time_seconds, processes=self.worker_pool_processes or None)
+        return self.mine_block(max_time_seconds=max_time_seconds, nonce_strategy=self.leased_nonce_strategy)
+
+    def create_worker_pool(self, template=None, processes=None, version=None):
+        """Build a MiningWorkerPool for ``template`` sized from config.json ``hardware``."""
+        if template is None:
+            template = self.current_template or self.get_fallback_universe_template()
+        if self.current_target is None:
+            self.calculate_target_from_difficulty(self.current_difficulty)
+        hardware_config = self.config_data.get("hardware", {}) if isinstance(self.config_data, dict) else {}
+        return MiningWorkerPool(
+            self._build_header_prefix(template, version),
+            self.current_target,
+            processes=processes,
+            hardware_config=hardware_config,
+        )
+
+    def mine_with_worker_pool(self, max_time_seconds=3600, processes=None):
+        """Mine the current template on all configured cores via MiningWorkerPool.
+
+        Replaces Looping spawning one interpreter per core: one miner process
+        shards the template's nonce space across worker processes and handles
+        best-hash and solution events here, on the coordinating thread. When
+        every shard has swept its nonces, the next BIP320 version is tried (if
+        the DTM enabled version rolling for this template), then the coinbase
+        extranonce is rolled and a fresh sweep starts on the same template.
+        """
+        if not self.current_template:
+            self.current_template = self.get_fallback_universe_template()
+        template = self.current_template
+        version_rolls = 1 << bin(self.version_rolling_mask(template)).count("1")
+        version_roll = 0
+
+        best_result = None
+        total_hashes = 0
+        start_time = time.time()
+        last_command_check = start_time
+        stop_requested = False
+
+        while not stop_requested and not self.shutdown_requested:
+            version = self.rolled_block_version(template, version_roll)
+            pool = self.create_worker_pool(template, processes=processes, version=version)
+            if not self.daemon_mode:
+                print(f"⚡ Worker pool: {pool.processes} processes sharding {NONCE_SPACE:,} nonces")
+
+            with pool:
+                while pool.is_alive() and not self.shutdown_requested:
+                    if time.time() - start_time >= max_time_seconds:
+                        stop_requested = True
+                        break
+
+                    pool.poll(timeout=0.5)
+                    self.hash_count = total_hashes + pool.total_hashes
+                    self.hashes_per_second = pool.hash_rate
+
+                    if pool.best_hash is not None:
+                        leading_zeros = self.count_leading_zero_bits(int.from_bytes(pool.best_hash, "big"))
+                        if leading_zeros > self.best_difficulty:
+                            self.best_difficulty = leading_zeros
+                            self.best_nonce = pool.best_nonce
+                            self.best_hash = pool.best_hash.hex()
+                            best_result = {
+                                "nonce": pool.best_nonce,
+                                "hash": self.best_hash,
+                                "leading_zeros": leading_zeros,
+                                "hash_int": int.from_bytes(pool.best_hash, "big"),
+                            }
+                            if self.looping_control_enabled:
+                                self.update_status_for_looping()
+
+                    if pool.solutions:
+                        break
+
+                    if time.time() - last_command_check >= 5:
+                        last_command_check = time.time()
+                        if self.check_looping_commands() in ("stop", "shutdown"):
+                            stop_requested = True
+                            break
+
+            total_hashes += pool.total_hashes
+            self.hash_count = total_hashes
+            self.current_attempts += pool.total_hashes
+            if pool.solutions:
+                return self._handle_worker_pool_solution(template, pool.solutions[0], total_hashes, version)
+            if stop_requested or self.shutdown_requested:
+                break
+
+            # All shards swept their nonces: next version first (no merkle work at all) ...
+            version_roll += 1
+            if version_roll < version_rolls:
+                continue
+
+            # ... then roll the extranonce and re-root the merkle tree
+            version_roll = 0
+            try:
+                extranonce = self.roll_extranonce(template)
+            except ValueError as e:
+                if not self.daemon_mode:
+                    print(f"⚠️ Cannot roll extranonce ({e}) - waiting for a fresh template")
+                break
+            if not self.daemon_mode:
+                print(f"🔁 Nonce space exhausted - rolled extranonce to {extranonce}")
+
+        if not self.daemon_mode:
+            print(f"📊 Worker pool finished: {total_hashes:,} hashes | Best: {self.best_difficulty} leading zero bits")
+        return best_result
+
+    def _handle_worker_pool_solution(self, template, solution, total_hashes, version=None):
+        """Hand a worker-pool solution to the DTM (looping mode) or submit it directly."""
+        nonce = solution["nonce"]
+        hash_result = solution["hash"]
+        header = self.construct_block_header(template, nonce, version=version)
+        if self.is_looping_mode:
+            solution_path = self.save_solution_for_dynamic_manager(header, nonce, hash_result)
+        else:
+            solution_path = None
+            self.submit_block(header, nonce, hash_result)
+
+        hash_int = int.from_bytes(hash_result, "big")
+        return {
+            "nonce": nonce,
+            "hash": hash_result.hex(),
+            "leading_zeros": self.count_leading_zero_bits(hash_int),
+            "hash_int": hash_int,
+            "success": True,
+            "target_met": True,
+            "solution_path": solution_path,
+            "extranonce": self._get_template_cache(template).get("extranonce"),
+            "version": self._parse_header_fields(header)["version"],
+            "hashes": total_hashes,
+        }
+
     def start_mining_session(self, max_time_seconds=None):
         """Start a controlled mining session"""
         if self.mining_active and not self.mining_paused:
@@ -6515,10 +8273,12 @@ class ProductionBitcoinMiner:
         try:
             print("📋 Creating complete block submission data...")
 
-            # Extract all template data
-            version = 0x20000000
+            # Extract all template data; version/time come from the mined header so a
+            # BIP320-rolled version is what gets submitted
+            header_fields = self._parse_header_fields(block_header)
+            version = header_fields["version"]
             previous_hash = template.get("previousblockhash", "0" * 64)
-            timestamp = int(time.time())
+            timestamp = header_fields["timestamp"]
             bits = template.get("bits", "1d00ff")
             block_height = template.get("height", 0)
             transactions = template.get("transactions", [])
@@ -6978,6 +8738,31 @@ if __name__ == "__main__":
             if global_miner:
                 global_miner.graceful_shutdown()
 
+    # Worker-pool daemon: one process takes templates from Looping/DTM and shards
+    # each one across a MiningWorkerPool, instead of Looping spawning N miners
+    if getattr(args, "worker_pool", False):
+        try:
+            miner = ProductionBitcoinMiner(
+                daemon_mode=True,
+                demo_mode=getattr(args, "demo", False),
+                max_attempts=None,
+                miner_id=getattr(args, "miner_id", None) or 1,
+            )
+            global_miner = miner
+            miner.worker_pool_processes = getattr(args, "worker_processes", None) or 0
+            miner.start_daemon_work_loop()
+        except KeyboardInterrupt:
+            print("\n⚠️ Mining interrupted by user")
+        except Exception as e:
+            print(f"❌ Worker-pool daemon error: {e}")
+            import traceback
+
+            traceback.print_exc()
+        finally:
+            if global_miner:
+                global_miner.graceful_shutdown()
+        sys.exit(0)
+
     # Brain.QTL coordinated mode
     daemon_mode = False  # Direct execution when called standalone
     